@@ -291,15 +291,11 @@ def delete_project_version(project_id, version):
             )
 
             # Delete the record of the version for this project
+            project.versions_obj.remove(version_obj)
             db.session.delete(version_obj)
-            # Adjust the latest_version if needed
-            sorted_versions = project.get_sorted_version_objects()
-            if len(sorted_versions) > 1 and sorted_versions[0].version == version:
-                project.latest_version = sorted_versions[1].parse()
-                db.session.add(project)
-            elif len(sorted_versions) == 1:
-                project.latest_version = None
-                db.session.add(project)
+            # Adjust the latest versions and count of versions
+            project.update_version_summary()
+            db.session.add(project)
             db.session.commit()
 
             flask.flash(f"Version for {version} has been removed")
@@ -341,6 +337,9 @@ def delete_project_versions(project_id):
                 versions.append(str(version))
 
             project.latest_version = None
+            project.latest_stable_version = None
+            project.latest_version_created_on = None
+            project.versions_count = 0
 
             utilities.publish_message(
                 project=project.__json__(),
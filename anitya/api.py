@@ -21,6 +21,7 @@ This module provides Anitya's HTTP API.
 """
 
 import flask
+from sqlalchemy.orm import selectinload
 
 import anitya
 import anitya.lib.plugins
@@ -29,6 +30,64 @@ from anitya.lib import utilities
 
 api_blueprint = flask.Blueprint("anitya_apiv1", __name__)
 
+#: Number of projects fetched from the database and sent to the client at
+#: once by the streamed responses
+STREAM_BATCH_SIZE = 500
+
+
+def _stream_json_list(key, items):
+    """
+    Stream the JSON object with the list of items and their total count.
+
+    The output is the same as of ``flask.jsonify({key: items, "total": ...})``
+    with the keys sorted, but the items are serialized as they are iterated
+    and sent in batches, so the whole list is never kept in memory.
+
+    Args:
+        key (str): The key of the list, must be ordered before ``total``.
+        items (iterable): The JSON serializable items.
+
+    Returns:
+        flask.Response: The streamed response.
+    """
+    json = flask.current_app.json
+    compact = json.compact
+    if compact is None:
+        compact = not flask.current_app.debug
+
+    if compact:
+        dump_args = {"separators": (",", ":")}
+        head = f"{{{json.dumps(key)}:["
+        first_sep, sep, end = "", ",", "]"
+        tail = ',"total":{}}}\n'
+    else:
+        dump_args = {"indent": 2}
+        head = f"{{\n  {json.dumps(key)}: ["
+        first_sep, sep, end = "\n    ", ",\n    ", "\n  ]"
+        tail = ',\n  "total": {}\n}}\n'
+
+    def generate():
+        total = 0
+        chunk = [head]
+        for item in items:
+            dumped = json.dumps(item, **dump_args)
+            if not compact:
+                # Nest the item in the list, strings can't contain newlines
+                dumped = dumped.replace("\n", "\n    ")
+            chunk.append((sep if total else first_sep) + dumped)
+            total += 1
+            if total % STREAM_BATCH_SIZE == 0:
+                yield "".join(chunk)
+                chunk = []
+        if total:
+            chunk.append(end)
+        else:
+            chunk.append("]")
+        chunk.append(tail.format(total))
+        yield "".join(chunk)
+
+    return flask.Response(flask.stream_with_context(generate()), mimetype=json.mimetype)
+
 
 @api_blueprint.route("/api/")
 @api_blueprint.route("/api")
@@ -147,20 +206,24 @@ def api_projects():
 
     if homepage is not None:
         project_objs = models.Project.by_homepage(db.session, homepage)
-    elif pattern or distro:
-        if pattern and "*" not in pattern:
-            pattern += "*"
-        project_objs = models.Project.search(db.session, pattern=pattern, distro=distro)
+        models.Project.preload_versions(db.session, project_objs)
     else:
-        project_objs = models.Project.all(db.session)
-
-    projects = [project.__json__() for project in project_objs]
-
-    output = {"total": len(projects), "projects": projects}
+        if pattern or distro:
+            if pattern and "*" not in pattern:
+                pattern += "*"
+            project_objs = models.Project.search(
+                db.session,
+                pattern=pattern,
+                distro=distro,
+                yield_per=STREAM_BATCH_SIZE,
+            )
+        else:
+            project_objs = models.Project.all(db.session, yield_per=STREAM_BATCH_SIZE)
+        project_objs = project_objs.options(selectinload(models.Project.versions_obj))
 
-    jsonout = flask.jsonify(output)
-    jsonout.status_code = 200
-    return jsonout
+    return _stream_json_list(
+        "projects", (project.__json__() for project in project_objs)
+    )
 
 
 @api_blueprint.route("/api/packages/wiki/")
@@ -188,15 +251,30 @@ def api_packages_wiki_list():
       * 3proxy None https://www.3proxy.ru/download/
     """
 
-    project_objs = models.Project.all(db.session)
-
-    projects = []
-    for project in project_objs:
-        for package in project.packages:
-            tmp = f"* {package.package_name} {project.regex} {project.version_url}"
-            projects.append(tmp)
+    project_objs = models.Project.all(db.session, yield_per=STREAM_BATCH_SIZE).options(
+        selectinload(models.Project.packages)
+    )
+
+    def generate():
+        sep = ""
+        chunk = []
+        for project in project_objs:
+            for package in project.packages:
+                chunk.append(
+                    f"{sep}* {package.package_name} {project.regex} "
+                    f"{project.version_url}"
+                )
+                sep = "\n"
+            if len(chunk) >= STREAM_BATCH_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
 
-    return flask.Response("\n".join(projects), content_type="text/plain;charset=UTF-8")
+    return flask.Response(
+        flask.stream_with_context(generate()),
+        content_type="text/plain;charset=UTF-8",
+    )
 
 
 @api_blueprint.route("/api/projects/names/")
@@ -251,17 +329,13 @@ def api_projects_names():
         pattern += "*"
 
     if pattern:
-        project_objs = models.Project.search(db.session, pattern=pattern)
+        project_objs = models.Project.search(
+            db.session, pattern=pattern, yield_per=STREAM_BATCH_SIZE
+        )
     else:
-        project_objs = models.Project.all(db.session)
-
-    projects = [project.name for project in project_objs]
-
-    output = {"total": len(projects), "projects": projects}
+        project_objs = models.Project.all(db.session, yield_per=STREAM_BATCH_SIZE)
 
-    jsonout = flask.jsonify(output)
-    jsonout.status_code = 200
-    return jsonout
+    return _stream_json_list("projects", (project.name for project in project_objs))
 
 
 @api_blueprint.route("/api/distro/names/")
@@ -12,12 +12,14 @@ from flask import abort, jsonify, make_response, request
 from flask.views import MethodView
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.orm.exc import NoResultFound
-from webargs import ValidationError, fields
+from webargs import ValidationError, fields, validate
 from webargs.flaskparser import FlaskParser
 
 from anitya import authentication
-from anitya.db import db, models, paginate
+from anitya.db import db, models, paginate, paginate_after
+from anitya.db.meta import TOTAL_MODES, decode_cursor
 from anitya.lib import plugins, utilities
 from anitya.lib.exceptions import (
     AnityaException,
@@ -72,6 +74,108 @@ def _items_per_page_validator(arg):
     return arg
 
 
+def _after_validator(arg):
+    """
+    Validator for a pagination cursor.
+
+    Args:
+        arg (object): The cursor returned with the previous page, empty
+            string for the first page.
+
+    Returns:
+        str: The validated argument.
+
+    Raises:
+        ValidationError: If the cursor can't be decoded.
+    """
+    if arg:
+        try:
+            decode_cursor(arg, 2)
+        except ValueError as err:
+            raise ValidationError(str(err)) from err
+    return arg
+
+
+def _project_ids_validator(arg):
+    """
+    Validator for a list of project ids.
+
+    Args:
+        arg (list): The list to validate, it must contain only integers
+            and at most 250 of them.
+
+    Raises:
+        ValidationError: If the list isn't valid.
+    """
+    if len(arg) > 250:
+        raise ValidationError("Maximum of 250 items is allowed.")
+    for item in arg:
+        if not isinstance(item, int) or isinstance(item, bool):
+            raise ValidationError("Project ids must be integers.")
+
+
+def _packages_validator(arg):
+    """
+    Validator for a list of distribution packages.
+
+    Args:
+        arg (list): The list to validate, it must contain only objects with
+            ``distribution`` and ``name`` strings and at most 250 of them.
+
+    Raises:
+        ValidationError: If the list isn't valid.
+    """
+    if len(arg) > 250:
+        raise ValidationError("Maximum of 250 items is allowed.")
+    for item in arg:
+        if not (
+            isinstance(item, dict)
+            and isinstance(item.get("distribution"), str)
+            and isinstance(item.get("name"), str)
+        ):
+            raise ValidationError(
+                "Packages must be objects with distribution and name."
+            )
+
+
+#: Arguments of paginated list resources
+_pagination_args = {
+    "page": fields.Int(validate=_page_validator, load_default=1),
+    "items_per_page": fields.Int(validate=_items_per_page_validator, load_default=25),
+    "after": fields.Str(validate=_after_validator),
+    "total": fields.Str(validate=validate.OneOf(TOTAL_MODES), load_default="exact"),
+}
+
+
+def _paginate(query, columns, args):
+    """
+    Retrieve the page of items by the page number or by the cursor.
+
+    Args:
+        query (sqlalchemy.sql.Select): The query of the items, without ordering.
+        columns (list): The columns to order by, unique together.
+        args (dict): Parsed pagination arguments.
+
+    Returns:
+        dict: The page, with ``page`` number in page number mode or with
+        ``next_after`` cursor when the ``after`` argument was provided.
+    """
+    if "after" in args:
+        return paginate_after(
+            query,
+            columns,
+            after=args["after"],
+            items_per_page=args["items_per_page"],
+            total=args["total"],
+        )
+    return paginate(
+        query.order_by(*columns),
+        page=args["page"],
+        items_per_page=args["items_per_page"],
+        total=args["total"],
+    )
+
+
 class Parser(FlaskParser):
     """
     Override default validation HTTP error.
@@ -142,6 +246,14 @@ class PackagesResource(MethodView):
         :query int page: The package page number to retrieve (defaults to 1).
         :query int items_per_page: The number of items per page (defaults to
                                    25, maximum of 250).
+        :query str after: The ``next_after`` cursor returned with the previous
+            page. When provided, even empty, the items are paged by the cursor,
+            the response contains ``next_after`` cursor of the next page
+            instead of the ``page`` number and ``next_after`` is null on
+            the last page. This is recommended for iterating over all items.
+        :query str total: How to compute ``total_items``: ``exact`` (default),
+            ``estimate`` which is faster, but approximate, or ``none`` to skip
+            it, ``total_items`` is null then.
         :query str distribution: Filter packages by distribution.
         :query str name: The name of the package.
         :statuscode 200: If all arguments are valid. Note that even if there
@@ -149,38 +261,31 @@ class PackagesResource(MethodView):
         :statuscode 400: If one or more of the query arguments is invalid.
         """
         user_args = {
-            "page": fields.Int(validate=_page_validator, load_default=1),
-            "items_per_page": fields.Int(
-                validate=_items_per_page_validator, load_default=25
-            ),
+            **_pagination_args,
             "distribution": fields.Str(),
             "name": fields.Str(),
         }
         args = parser.parse(user_args, request, location="query")
-        q = select(models.Packages).order_by(models.Packages.package_name)
+        q = select(models.Packages).options(joinedload(models.Packages.project))
         distro = args.pop("distribution", "")
         name = args.pop("name", "")
         if distro:
             q = q.filter(func.lower(models.Packages.distro_name) == func.lower(distro))
         if name:
             q = q.filter(func.lower(models.Packages.package_name) == func.lower(name))
-        page = paginate(q, page=args["page"], items_per_page=args["items_per_page"])
-        return {
-            "items": [
-                {
-                    "distribution": package.distro_name,
-                    "name": package.package_name,
-                    "project": package.project.name,
-                    "ecosystem": package.project.ecosystem_name,
-                    "version": package.project.latest_version,
-                    "stable_version": package.project.latest_stable_version,
-                }
-                for package in page["items"]
-            ],
-            "page": page["page"],
-            "items_per_page": page["items_per_page"],
-            "total_items": page["total_items"],
-        }
+        page = _paginate(q, [models.Packages.package_name, models.Packages.id], args)
+        page["items"] = [
+            {
+                "distribution": package.distro_name,
+                "name": package.package_name,
+                "project": package.project.name,
+                "ecosystem": package.project.ecosystem_name,
+                "version": package.project.latest_version,
+                "stable_version": package.project.latest_stable_version,
+            }
+            for package in page["items"]
+        ]
+        return page
 
     @authentication.require_token
     def post(self):
@@ -375,6 +480,14 @@ class ProjectsResource(MethodView):
         :query int page: The project page number to retrieve (defaults to 1).
         :query int items_per_page: The number of items per page (defaults to
                                    25, maximum of 250).
+        :query str after: The ``next_after`` cursor returned with the previous
+            page. When provided, even empty, the items are paged by the cursor,
+            the response contains ``next_after`` cursor of the next page
+            instead of the ``page`` number and ``next_after`` is null on
+            the last page. This is recommended for iterating over all items.
+        :query str total: How to compute ``total_items``: ``exact`` (default),
+            ``estimate`` which is faster, but approximate, or ``none`` to skip
+            it, ``total_items`` is null then.
         :query string ecosystem: The project ecosystem (e.g. pypi, rubygems).
             If the project is not part of a language package index, use its homepage.
         :query string name: The project name to filter the query by.
@@ -383,27 +496,22 @@ class ProjectsResource(MethodView):
         :statuscode 400: If one or more of the query arguments is invalid.
         """
         user_args = {
-            "page": fields.Int(validate=_page_validator, load_default=1),
-            "items_per_page": fields.Int(
-                validate=_items_per_page_validator, load_default=25
-            ),
+            **_pagination_args,
             "ecosystem": fields.Str(),
             "name": fields.Str(),
         }
         args = parser.parse(user_args, request, location="query")
         ecosystem = args.pop("ecosystem", "")
         name = args.pop("name", "")
-        q = select(models.Project)
+        q = select(models.Project).options(selectinload(models.Project.versions_obj))
         if ecosystem:
             q = q.filter(
                 func.lower(models.Project.ecosystem_name) == func.lower(ecosystem)
             )
         if name:
             q = q.filter(func.lower(models.Project.name) == func.lower(name))
-        projects_page = paginate(
-            q.order_by(models.Project.name, models.Project.ecosystem_name),
-            page=args["page"],
-            items_per_page=args["items_per_page"],
+        projects_page = _paginate(
+            q, [models.Project.name, models.Project.ecosystem_name], args
         )
         serialized_projects = [item.__json__() for item in projects_page["items"]]
         projects_page["items"] = serialized_projects
@@ -901,3 +1009,191 @@ class VersionsResource(MethodView):
             }
 
             return response
+
+
+class VersionsLookupResource(MethodView):
+    """
+    The ``api/v2/versions/lookup/`` API endpoint.
+    """
+
+    def post(self):
+        """
+        Retrieve versions of many projects at once, by project ids or by
+        distribution packages. The projects are retrieved by a few queries
+        regardless of the number of requested items, so this should be used
+        instead of retrieving the versions of each project separately.
+
+        **Example request**:
+
+        .. sourcecode:: http
+
+            POST /api/v2/versions/lookup/ HTTP/1.1
+            Accept: application/json
+            Accept-Encoding: gzip, deflate
+            Connection: keep-alive
+            Content-Length: 105
+            Content-Type: application/json
+            Host: localhost:5000
+            User-Agent: HTTPie/1.0.3
+
+            {
+                "project_ids": [55612, 1],
+                "packages": [
+                    {"distribution": "Fedora", "name": "python-requests"}
+                ]
+            }
+
+        **Example response**:
+
+        .. sourcecode:: http
+
+            HTTP/1.0 200 OK
+            Content-Length: 702
+            Content-Type: application/json
+            Date: Sat, 17 Oct 2026 19:12:43 GMT
+            Server: Werkzeug/3.0.1 Python/3.12.1
+
+            {
+                "projects": [
+                    {
+                        "id": 55612,
+                        "name": "anitya",
+                        "ecosystem": "pypi",
+                        "latest_version": "1.0.0",
+                        "stable_version": "1.0.0",
+                        "latest_version_created_on": "2026-03-31T14:30:00"
+                    }
+                ],
+                "packages": [
+                    {
+                        "distribution": "Fedora",
+                        "name": "python-requests",
+                        "project": {
+                            "id": 4047,
+                            "name": "requests",
+                            "ecosystem": "pypi",
+                            "latest_version": "2.32.3",
+                            "stable_version": "2.32.3",
+                            "latest_version_created_on": null
+                        }
+                    }
+                ],
+                "not_found": {
+                    "project_ids": [1],
+                    "packages": []
+                }
+            }
+
+        :reqjson list project_ids: Ids of the projects, at most 250.
+        :reqjson list packages: Objects with ``distribution`` and ``name``
+            of the package, at most 250. Both the distribution and the package
+            name are case insensitive.
+        :reqjson bool versions: Include all ``versions`` and ``stable_versions``
+            of every project, only the latest and stable version are returned
+            by default.
+        :statuscode 200: If all arguments are valid. Items which weren't
+            found are listed in ``not_found``.
+        :statuscode 400: If one or more of the arguments is invalid.
+        """
+        user_args = {
+            "project_ids": fields.List(
+                fields.Raw(), validate=_project_ids_validator, load_default=list
+            ),
+            "packages": fields.List(
+                fields.Raw(), validate=_packages_validator, load_default=list
+            ),
+            "versions": fields.Bool(load_default=False),
+        }
+        args = parser.parse(user_args, request, location="json")
+        project_ids = list(dict.fromkeys(args["project_ids"]))
+        # Keep the first spelling of the same package
+        requested_packages = {}
+        for package in args["packages"]:
+            distro, name = package["distribution"], package["name"]
+            requested_packages.setdefault(
+                (distro.lower(), name.lower()), (distro, name)
+            )
+
+        packages = {}
+        if requested_packages:
+            # Both columns are searched in the index, the result could contain
+            # packages of other requested distributions, which are skipped
+            query = select(models.Packages).filter(
+                func.lower(models.Packages.distro_name).in_(
+                    {distro for distro, _name in requested_packages}
+                ),
+                func.lower(models.Packages.package_name).in_(
+                    {name for _distro, name in requested_packages}
+                ),
+            )
+            for package in db.session.execute(query).scalars():
+                key = (package.distro_name.lower(), package.package_name.lower())
+                if key in requested_packages:
+                    packages[key] = package
+
+        projects = {}
+        wanted_ids = set(project_ids)
+        wanted_ids.update(package.project_id for package in packages.values())
+        if wanted_ids:
+            query = select(models.Project).filter(models.Project.id.in_(wanted_ids))
+            if args["versions"]:
+                query = query.options(selectinload(models.Project.versions_obj))
+            projects = {
+                project.id: self._serialize(project, args["versions"])
+                for project in db.session.execute(query).scalars()
+            }
+
+        response = {
+            "projects": [],
+            "packages": [],
+            "not_found": {"project_ids": [], "packages": []},
+        }
+        for project_id in project_ids:
+            if project_id in projects:
+                response["projects"].append(projects[project_id])
+            else:
+                response["not_found"]["project_ids"].append(project_id)
+        for key, (distro, name) in requested_packages.items():
+            package = packages.get(key)
+            if package:
+                response["packages"].append(
+                    {
+                        "distribution": package.distro_name,
+                        "name": package.package_name,
+                        "project": projects[package.project_id],
+                    }
+                )
+            else:
+                response["not_found"]["packages"].append(
+                    {"distribution": distro, "name": name}
+                )
+
+        return response
+
+    @staticmethod
+    def _serialize(project, versions=False):
+        """
+        Serialize the versions of the project.
+
+        Args:
+            project (anitya.db.models.Project): The project.
+            versions (bool): Include all versions of the project.
+
+        Returns:
+            dict: The project identification and its versions.
+        """
+        created_on = project.latest_version_created_on
+        result = {
+            "id": project.id,
+            "name": project.name,
+            "ecosystem": project.ecosystem_name,
+            "latest_version": project.latest_version,
+            "stable_version": project.latest_stable_version,
+            "latest_version_created_on": (
+                created_on.isoformat() if created_on else None
+            ),
+        }
+        if versions:
+            result["versions"] = project.versions
+            result["stable_versions"] = [str(v) for v in project.stable_versions]
+        return result
@@ -70,6 +70,12 @@ def create(config=None):
     app.add_url_rule(
         "/api/v2/versions/", view_func=versions_view, methods=["GET", "POST"]
     )
+    versions_lookup_view = api_v2.VersionsLookupResource.as_view(
+        "apiv2.versions_lookup"
+    )
+    app.add_url_rule(
+        "/api/v2/versions/lookup/", view_func=versions_lookup_view, methods=["POST"]
+    )
 
     # Register all the view blueprints
     app.register_blueprint(ui.ui_blueprint)
@@ -21,27 +21,48 @@
 This is a service that is checking for new releases in projects added to Anitya.
 """
 
+import asyncio
 import logging
+import os
+import socket
+from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime
-from threading import Lock
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta
+from itertools import islice
+from threading import Event, Lock, Thread
 from time import sleep
-from typing import List
+from typing import Iterable, Iterator, List
+from urllib.parse import urlparse
 
 import arrow
 import sqlalchemy as sa
-from ordered_set import OrderedSet
 
 from anitya import app
 from anitya.db import db, models
 from anitya.config import config
-from anitya.lib import utilities
-from anitya.lib.exceptions import AnityaException, RateLimitException
+from anitya.lib import plugins, utilities
+from anitya.lib.backends.github import GithubBackend, token_pool
+from anitya.lib.exceptions import (
+    AnityaException,
+    HostUnavailableException,
+    RateLimitException,
+)
+from anitya.lib.host_limiter import host_limiter
+from anitya.lib.response_cache import response_cache
+from anitya.lib.versions.parse_cache import parse_cache
 
 _log = logging.getLogger("anitya")
 
 # Wait time used between runs
 WAIT_TIME = 300
+# Number of projects fetched at once when constructing the queue
+QUEUE_PAGE_SIZE = 1000
+# Number of seconds after which the index of project names used for feeds
+# is built again
+FEED_INDEX_TTL = 3600
+# Number of seconds between polls of the feeds
+FEED_POLL_INTERVAL = 300
 
 
 class Checker:
@@ -64,6 +85,22 @@ class Checker:
             the ratelimited backend and value is `datetime` object containing time when
             ratelimit will be reset
         blacklist_dict_lock (`Lock`): Lock for `blacklist_dict`
+        node_id (str): Identifier of this check service node used when leasing
+            projects in distributed mode
+        sink (`utilities.ResultSink`): Sink writing results of successful checks
+            in batches, None if `CHECK_WRITE_BATCH` is not set
+        feed_index (dict): Index of projects used to resolve feed entries. Key is
+            the name of backend and value is dictionary where key is lower case
+            project name and value is list of tuples (project id, latest version)
+        feed_index_time (dict): Time when the feed index of backend was built
+        feed_seen (dict): Feed entries (name, version) already added to queue,
+            key is the name of backend
+        feed_unsupported (set): Names of backends that don't support feeds
+        feed_pending (list): Ids of projects with new release announced in feeds,
+            which weren't taken to the queue yet
+        feed_pending_lock (`Lock`): Lock for `feed_pending`
+        feed_thread (`Thread`): Thread polling the feeds, None if not started
+        feed_stop (`Event`): Event stopping the `feed_thread`
     """
 
     def __init__(self):
@@ -80,6 +117,24 @@ class Checker:
         self.ratelimit_queue = {}
         self.blacklist_dict_lock = Lock()
         self.blacklist_dict = {}
+        self.node_id = (
+            config.get("CHECK_NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.feed_index = {}
+        self.feed_index_time = {}
+        self.feed_seen = {}
+        self.feed_unsupported = set()
+        self.feed_pending_lock = Lock()
+        self.feed_pending = []
+        self.feed_thread = None
+        self.feed_stop = Event()
+        self.sink = None
+        if config.get("CHECK_WRITE_BATCH"):
+            self.sink = utilities.ResultSink(
+                db.session,
+                config.get("CHECK_WRITE_BATCH"),
+                config.get("CHECK_WRITE_INTERVAL"),
+            )
         _log.debug("Checker class initialized")
         self.flask_app = app.create(config)
 
@@ -112,8 +167,21 @@ class Checker:
                         self.blacklist_dict.pop(project.backend)
             try:
                 _log.debug("Checking project %s", project.name)
-                utilities.check_project_release(project, db.session)
+                if config.get("CHECK_PIPELINE"):
+                    spec = models.ProjectSpec.from_project(project)
+                    # Return the connection to pool while versions are retrieved
+                    db.session.commit()
+                    utilities.check_project_spec(spec, db.session, sink=self.sink)
+                else:
+                    utilities.check_project_release(project, db.session, sink=self.sink)
                 _log.debug("Project check complete %s", project.name)
+            except HostUnavailableException as err:
+                # Project is already rescheduled, other projects of the backend
+                # are not affected
+                _log.info("%s : %s", project.name, str(err))
+                with self.ratelimit_counter_lock:
+                    self.ratelimit_counter += 1
+                return
             except RateLimitException as err:
                 self.blacklist_project(project, err.reset_time)
                 return
@@ -177,11 +245,18 @@ class Checker:
                     project.backend,
                 )
                 self.blacklist_dict[project.backend] = reset_time.to("utc").datetime
-        with self.ratelimit_queue_lock:
-            if project.backend not in self.ratelimit_queue:
-                self.ratelimit_queue[project.backend] = []
+        if config.get("CHECK_DISTRIBUTED"):
+            # Share the rate limit with other nodes, the project itself
+            # is already rescheduled to reset time
+            models.BackendRateLimit.set(
+                db.session, project.backend, reset_time.to("utc").datetime
+            )
+        else:
+            with self.ratelimit_queue_lock:
+                if project.backend not in self.ratelimit_queue:
+                    self.ratelimit_queue[project.backend] = []
 
-            self.ratelimit_queue[project.backend].append(project.id)
+                self.ratelimit_queue[project.backend].append(project.id)
 
         with self.ratelimit_counter_lock:
             self.ratelimit_counter += 1
@@ -199,53 +274,17 @@ class Checker:
             # We must convert it to datetime for comparison with sqlalchemy TIMESTAMP column
             time = arrow.utcnow().datetime
             self.clear_counters()
-            queue = self.construct_queue(time)
-            total_count = len(queue)
-            projects_left = len(queue)
-            projects_iter = iter(queue)
-
-            if not queue:
-                return
+            self.start_feed_poller()
 
             # 2. Execution
-            _log.info(
-                "Starting check on %s for total of %s projects", time, total_count
-            )
+            if config.get("CHECK_DISTRIBUTED"):
+                total_count = self.run_distributed(time)
+            else:
+                _log.info("Starting check on %s", time)
+                total_count = self.check_queue(self.stream_queue(time))
 
-            futures = {}
-            pool_size = config.get("CRON_POOL")
-            timeout = config.get("CHECK_TIMEOUT")
-            with ThreadPoolExecutor(pool_size) as pool:
-                # Wait till every project in queue is checked
-                while projects_left:
-                    for project in projects_iter:
-                        future = pool.submit(self.update_project, project)
-                        futures[future] = project
-                        if len(futures) > pool_size:
-                            break  # limit job submissions
-
-                    # Wait for jobs that aren't completed yet
-                    try:
-                        for future in as_completed(futures, timeout=timeout):
-                            projects_left -= 1  # one project down
-
-                            # log any exception
-                            if future.exception():
-                                try:
-                                    future.result()
-                                except Exception as e:
-                                    _log.exception(e)
-
-                            del futures[future]
-
-                            break  # give a chance to add more jobs
-                    except TimeoutError:
-                        projects_left -= 1
-                        _log.info(
-                            "Thread was killed because the execution took too long."
-                        )
-                        with self.error_counter_lock:
-                            self.error_counter += 1
+            if not total_count:
+                return
 
             # 3. Finalize
             _log.info(
@@ -266,6 +305,396 @@ class Checker:
             db.session.add(run)
             db.session.commit()
 
+    def check_queue(self, queue: Iterable[int]) -> int:
+        """
+        Check every project in the queue using the engine set by `CHECK_ENGINE`
+        configuration.
+
+        Args:
+            queue: Queue of project's ids to check
+
+        Returns:
+            Number of projects checked.
+        """
+        if config.get("CHECK_GITHUB_BATCH"):
+            queue = self.batch_github(queue, config.get("CHECK_GITHUB_BATCH"))
+
+        if config.get("CHECK_RESPONSE_CACHE_SIZE"):
+            response_cache.start(config.get("CHECK_RESPONSE_CACHE_SIZE"))
+        try:
+            if config.get("CHECK_ENGINE") == "asyncio":
+                count = asyncio.run(self.run_asyncio(queue))
+            else:
+                count = self.run_threads(queue)
+        finally:
+            if response_cache.enabled():
+                _log.info("Response cache: %s", response_cache.metrics())
+                # Don't serve responses of this run to the next one
+                response_cache.stop()
+
+        if self.sink is not None:
+            # Write the rest of the results
+            self.sink.flush()
+        if config.get("CHECK_GITHUB_BATCH"):
+            # Don't keep batches of projects that weren't checked
+            GithubBackend.clear_batches()
+
+        for budget in token_pool.metrics():
+            if budget["requests"]:
+                _log.info("GitHub API budget: %s", budget)
+        for host, state in host_limiter.metrics().items():
+            if state["circuit"] != "closed" or state["throttled"]:
+                _log.info("Host %s: %s", host, state)
+        if config.get("VERSION_PARSE_CACHE_SIZE"):
+            _log.info("Version parse cache: %s", parse_cache.metrics())
+
+        return count
+
+    def run_distributed(self, time: datetime) -> int:
+        """
+        Check projects that are ready for check by leasing them in batches.
+        This allows multiple check service nodes to work on the same database,
+        every project is checked only by the node that leased it.
+
+        Args:
+            time: Start of the current run
+
+        Returns:
+            Number of projects checked by this node.
+        """
+        total_count = 0
+        while True:
+            batch = self.lease_projects(time)
+            if not batch:
+                break
+            _log.info("Node %s leased %s projects for check", self.node_id, len(batch))
+            total_count += len(batch)
+            try:
+                self.check_queue(batch)
+            finally:
+                self.release_projects(batch, time)
+
+        return total_count
+
+    def lease_projects(self, time: datetime) -> List[int]:
+        """
+        Lease batch of projects that are ready for check. Projects leased by
+        other nodes or belonging to rate limited backends are skipped.
+        The size of the batch is set by `CHECK_LEASE_BATCH` and the lease will
+        expire after `CHECK_LEASE_TIME` seconds.
+
+        Args:
+            time: Start of the current run
+
+        Returns:
+            Ids of the leased projects.
+        """
+        now = arrow.utcnow().datetime
+        with self.blacklist_dict_lock:
+            self.blacklist_dict = {
+                backend: reset_time
+                for backend, reset_time in self.blacklist_dict.items()
+                if reset_time > now
+            }
+            self.blacklist_dict.update(models.BackendRateLimit.active(db.session, now))
+
+        stmt = (
+            sa.select(models.Project.id)
+            .filter(
+                models.Project.next_check < time,
+                models.Project.archived.is_(False),
+                sa.or_(
+                    models.Project.lease_expiry.is_(None),
+                    models.Project.lease_expiry < now,
+                ),
+            )
+            .order_by(models.Project.next_check)
+            .limit(config.get("CHECK_LEASE_BATCH"))
+            .with_for_update(skip_locked=True)
+        )
+        if self.blacklist_dict:
+            stmt = stmt.filter(
+                models.Project.backend.not_in(list(self.blacklist_dict.keys()))
+            )
+        project_ids = db.session.scalars(stmt).all()
+
+        if project_ids:
+            db.session.execute(
+                sa.update(models.Project)
+                .where(models.Project.id.in_(project_ids))
+                .values(
+                    lease_owner=self.node_id,
+                    lease_expiry=now
+                    + timedelta(seconds=config.get("CHECK_LEASE_TIME")),
+                )
+            )
+        db.session.commit()
+
+        return list(project_ids)
+
+    def release_projects(self, project_ids: List[int], time: datetime):
+        """
+        Release the lease on projects that were checked. Projects that weren't
+        rescheduled by the check will keep the lease till it expires, so they are
+        not leased again in the current run.
+
+        Args:
+            project_ids: Ids of projects leased by this node
+            time: Start of the current run
+        """
+        db.session.execute(
+            sa.update(models.Project)
+            .where(
+                models.Project.id.in_(project_ids),
+                models.Project.lease_owner == self.node_id,
+                models.Project.next_check >= time,
+            )
+            .values(lease_owner=None, lease_expiry=None)
+            .execution_options(synchronize_session="fetch")
+        )
+        db.session.commit()
+
+    def batch_github(self, queue: Iterable[int], batch_size: int) -> Iterator[int]:
+        """
+        Group GitHub projects in queue to batches, versions of all projects
+        in batch are retrieved by a single query. Projects in batch are
+        placed in queue one after another, so they are checked at the same time.
+
+        Args:
+            queue: Queue of project's ids to check
+            batch_size: Number of projects in batch
+
+        Returns:
+            Iterator over project's ids to check.
+        """
+        projects_iter = iter(queue)
+        batch = []
+        while True:
+            chunk = list(islice(projects_iter, QUEUE_PAGE_SIZE))
+            if not chunk:
+                break
+
+            stmt = sa.select(
+                models.Project.id,
+                models.Project.backend,
+                models.Project.name,
+                models.Project.homepage,
+                models.Project.version_url,
+                models.Project.releases_only,
+                models.Project.version_filter,
+            ).filter(models.Project.id.in_(chunk))
+            rows = {row.id: row for row in db.session.execute(stmt)}
+            db.session.commit()
+
+            for project_id in chunk:
+                row = rows.get(project_id)
+                if not row or row.backend != GithubBackend.name:
+                    yield project_id
+                    continue
+                batch.append(models.ProjectSpec(**row._asdict()))
+                if len(batch) >= batch_size:
+                    GithubBackend.register_batch(batch)
+                    yield from (project.id for project in batch)
+                    batch = []
+
+        if batch:
+            GithubBackend.register_batch(batch)
+            yield from (project.id for project in batch)
+
+    def run_threads(self, queue: Iterable[int]) -> int:
+        """
+        Check every project in the queue using pool of threads.
+        The size of the pool is set by `CRON_POOL` configuration.
+
+        Args:
+            queue: Queue of project's ids to check, the queue is consumed
+                lazily, so it could be still streamed from database
+
+        Returns:
+            Number of projects checked.
+        """
+        total_count = 0
+        projects_left = 0
+        projects_iter = iter(queue)
+
+        futures = {}
+        pool_size = config.get("CRON_POOL")
+        timeout = config.get("CHECK_TIMEOUT")
+        with ThreadPoolExecutor(pool_size) as pool:
+            # Wait till every project in queue is checked
+            while True:
+                for project in projects_iter:
+                    future = pool.submit(self.update_project, project)
+                    futures[future] = project
+                    total_count += 1
+                    projects_left += 1
+                    if len(futures) > pool_size:
+                        break  # limit job submissions
+
+                if not projects_left:
+                    break
+
+                # Wait for jobs that aren't completed yet
+                try:
+                    for future in as_completed(futures, timeout=timeout):
+                        projects_left -= 1  # one project down
+
+                        # log any exception
+                        if future.exception():
+                            try:
+                                future.result()
+                            except Exception as e:
+                                _log.exception(e)
+
+                        del futures[future]
+
+                        break  # give a chance to add more jobs
+                except TimeoutError:
+                    projects_left -= 1
+                    _log.info("Thread was killed because the execution took too long.")
+                    with self.error_counter_lock:
+                        self.error_counter += 1
+
+        return total_count
+
+    async def run_asyncio(self, queue: Iterable[int]) -> int:
+        """
+        Check every project in the queue using asyncio event loop.
+
+        The checks are scheduled on the event loop, each check is limited by
+        semaphore of the host the project is hosted on (`CHECK_HOST_CONCURRENCY`)
+        and by semaphore of the backend (`CHECK_BACKEND_CONCURRENCY`). Total number
+        of running checks is limited by `CHECK_ASYNC_CONCURRENCY`.
+
+        Backends are using blocking HTTP calls, so the checks themselves aren't
+        asynchronous, the event loop only schedules `update_project` calls
+        to the pool of `CHECK_ASYNC_CONCURRENCY` threads. Thread can't be
+        cancelled, so the check keeps its slots till the thread finishes,
+        which keeps the work queued in the pool bounded. The `CHECK_TIMEOUT`
+        is counted from the start of the check in the thread, checks running
+        longer are counted as errors. The queue is streamed from database
+        and the hosts are resolved in separate thread, so the event loop
+        is never blocked by database.
+
+        Args:
+            queue: Queue of project's ids to check, the queue is consumed
+                lazily, so it could be still streamed from database
+
+        Returns:
+            Number of projects checked.
+        """
+        concurrency = config.get("CHECK_ASYNC_CONCURRENCY")
+        host_limit = config.get("CHECK_HOST_CONCURRENCY")
+        backend_limits = config.get("CHECK_BACKEND_CONCURRENCY")
+        timeout = config.get("CHECK_TIMEOUT")
+
+        running = asyncio.Semaphore(concurrency)
+        host_semaphores = defaultdict(lambda: asyncio.Semaphore(host_limit))
+        backend_semaphores = {
+            backend: asyncio.Semaphore(limit)
+            for backend, limit in backend_limits.items()
+        }
+        loop = asyncio.get_running_loop()
+
+        async def check(project_id, backend, host):
+            async with AsyncExitStack() as stack:
+                if backend in backend_semaphores:
+                    await stack.enter_async_context(backend_semaphores[backend])
+                if host:
+                    await stack.enter_async_context(host_semaphores[host])
+                await stack.enter_async_context(running)
+
+                started = asyncio.Event()
+
+                def update_project():
+                    loop.call_soon_threadsafe(started.set)
+                    self.update_project(project_id)
+
+                future = loop.run_in_executor(pool, update_project)
+                waiter = asyncio.create_task(started.wait())
+                await asyncio.wait(
+                    {future, waiter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                waiter.cancel()
+                done, _ = await asyncio.wait({future}, timeout=timeout)
+                if not done:
+                    _log.info(
+                        "Check of project %s took too long, waiting for the thread.",
+                        project_id,
+                    )
+                    with self.error_counter_lock:
+                        self.error_counter += 1
+                try:
+                    await future
+                except Exception as e:
+                    _log.exception(e)
+
+        projects_iter = iter(queue)
+
+        def next_chunk():
+            with self.flask_app.app_context():
+                chunk = list(islice(projects_iter, concurrency))
+                if not chunk:
+                    return 0, []
+                return len(chunk), self.get_project_hosts(chunk)
+
+        # Single thread reads the queue, so it's never advanced concurrently
+        queue_pool = ThreadPoolExecutor(1)
+        with queue_pool, ThreadPoolExecutor(concurrency) as pool:
+            # Don't create all the tasks at once, resolve hosts and schedule
+            # the checks in chunks
+            tasks = set()
+            total_count = 0
+            while True:
+                count, hosts = await loop.run_in_executor(queue_pool, next_chunk)
+                if not count:
+                    break
+                total_count += count
+                for project_id, backend, host in hosts:
+                    tasks.add(asyncio.create_task(check(project_id, backend, host)))
+                while len(tasks) >= 2 * concurrency:
+                    _, tasks = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+            if tasks:
+                await asyncio.wait(tasks)
+
+        return total_count
+
+    def get_project_hosts(self, project_ids: List[int]) -> List[tuple]:
+        """
+        Get the backend and the host the projects are checked against.
+        The host is obtained from version URL or homepage of the project.
+
+        Args:
+            project_ids: Ids of projects
+
+        Returns:
+            List of tuples (project id, backend, host) in the same order as
+            provided ids. Host is None if it can't be determined.
+        """
+        stmt = sa.select(
+            models.Project.id,
+            models.Project.backend,
+            models.Project.version_url,
+            models.Project.homepage,
+        ).filter(models.Project.id.in_(project_ids))
+        rows = {row.id: row for row in db.session.execute(stmt)}
+
+        result = []
+        for project_id in project_ids:
+            row = rows.get(project_id)
+            if not row:
+                continue
+            host = None
+            for url in (row.version_url, row.homepage):
+                if url and "://" in url:
+                    host = urlparse(url).hostname
+                    break
+            result.append((project_id, row.backend, host))
+
+        return result
+
     def clear_counters(self):
         """
         Clear all counters.
@@ -290,45 +719,254 @@ class Checker:
             Queue of project's ids to check. Blacklisted projects will be on start of
             the queue
         """
+        return list(self.stream_queue(time))
+
+    def stream_queue(self, time: datetime) -> Iterator[int]:
+        """
+        Same as `construct_queue`, but the projects that are ready to check
+        are fetched lazily from database in pages of `QUEUE_PAGE_SIZE`,
+        so the checks could start before the whole queue is loaded.
+
+        Args:
+            time: Start of the current run
+
+        Returns:
+            Iterator over project's ids to check. Blacklisted projects will be
+            on start of the queue
+        """
         queue = []
         # Add blacklisted items first
         backends = []
         for backend, reset_time in self.blacklist_dict.items():
             if reset_time < time:
                 with self.ratelimit_queue_lock:
-                    queue += self.ratelimit_queue[backend]
-                    # Erase project list after adding it to queue
-                    del self.ratelimit_queue[backend]
+                    queue += self.ratelimit_queue.pop(backend, [])
 
                 backends.append(backend)
 
         # Erase backends that were processed from blacklist dictionary
-        for backend in backends:
-            del self.blacklist_dict[backend]
+        with self.blacklist_dict_lock:
+            for backend in backends:
+                del self.blacklist_dict[backend]
+
+        # Projects belonging to these backends will be checked when the ratelimit
+        # is reset
+        blacklisted_backends = frozenset(self.blacklist_dict)
+
+        # Projects with new releases announced in feeds go next
+        return self._stream_queue(time, queue, blacklisted_backends)
+
+    def start_feed_poller(self):
+        """
+        Start the thread polling the feeds every `FEED_POLL_INTERVAL` seconds,
+        if `CHECK_FEEDS` is set. The thread keeps polling between the runs,
+        projects with new release are kept in `feed_pending` till the queue
+        takes them. Feeds are not polled in distributed mode.
+        """
+        if not config.get("CHECK_FEEDS") or config.get("CHECK_DISTRIBUTED"):
+            return
+        if self.feed_thread is not None and self.feed_thread.is_alive():
+            return
+        self.feed_stop.clear()
+        self.feed_thread = Thread(
+            target=self.run_feed_poller, name="feed-poller", daemon=True
+        )
+        self.feed_thread.start()
+
+    def stop_feed_poller(self):
+        """
+        Stop the thread polling the feeds and wait till it finishes.
+        """
+        self.feed_stop.set()
+        if self.feed_thread is not None:
+            self.feed_thread.join()
+            self.feed_thread = None
+
+    def run_feed_poller(self):
+        """
+        Poll the feeds till `stop_feed_poller` is called.
+        """
+        while not self.feed_stop.is_set():
+            self.add_feed_projects()
+            self.feed_stop.wait(FEED_POLL_INTERVAL)
+
+    def add_feed_projects(self):
+        """
+        Poll the feeds of backends that aren't rate limited and add
+        the projects with new release to `feed_pending`.
+        """
+        with self.blacklist_dict_lock:
+            blacklisted_backends = frozenset(self.blacklist_dict)
+        with self.flask_app.app_context():
+            try:
+                project_ids = self.poll_feeds(blacklisted_backends)
+            except Exception as e:
+                _log.exception(e)
+                return
+            finally:
+                db.session.close()
+
+        with self.feed_pending_lock:
+            self.feed_pending.extend(project_ids)
+
+    def take_feed_projects(self) -> List[int]:
+        """
+        Take the projects with new release announced in feeds that were polled
+        since the last call.
+
+        Returns:
+            Ids of projects that have new release announced in feed.
+        """
+        if not self.feed_pending:
+            return []
+        with self.feed_pending_lock:
+            project_ids = self.feed_pending
+            self.feed_pending = []
+        return project_ids
+
+    def poll_feeds(self, blacklisted_backends: frozenset = frozenset()) -> List[int]:
+        """
+        Retrieve the latest releases from feeds of every backend supporting
+        them and resolve them to existing projects.
+
+        Args:
+            blacklisted_backends: Backends which feeds are skipped
+
+        Returns:
+            Ids of projects that have new release announced in feed.
+        """
+        project_ids = []
+        for backend in plugins.BACKEND_PLUGINS.get_plugins():
+            if (
+                backend.name in self.feed_unsupported
+                or backend.name in blacklisted_backends
+            ):
+                continue
+            try:
+                entries = list(backend.check_feed())
+            except NotImplementedError:
+                self.feed_unsupported.add(backend.name)
+                continue
+            except AnityaException as err:
+                _log.info("Feed of %s failed: %s", backend.name, str(err))
+                continue
+            except (KeyError, ValueError) as err:
+                _log.info("Feed of %s is malformed: %s", backend.name, str(err))
+                continue
+
+            index = self.get_feed_index(backend.name)
+            seen = self.feed_seen.setdefault(backend.name, set())
+            for entry in entries:
+                try:
+                    name, _homepage, _backend, version = entry
+                except ValueError:
+                    _log.info("Malformed entry in feed of %s: %s", backend.name, entry)
+                    continue
+                if (name, version) in seen:
+                    continue
+                seen.add((name, version))
+                for project_id, latest_version in index.get(name.lower(), []):
+                    if latest_version != version:
+                        project_ids.append(project_id)
+
+        if project_ids:
+            _log.info("Found %s projects with new release in feeds", len(project_ids))
+
+        return project_ids
+
+    def get_feed_index(self, backend: str) -> dict:
+        """
+        Get the index of project names for backend, the index is built again
+        after `FEED_INDEX_TTL` seconds.
+
+        Args:
+            backend: Name of the backend
+
+        Returns:
+            Dictionary where key is lower case project name and value is list
+            of tuples (project id, latest version).
+        """
+        now = arrow.utcnow()
+        built = self.feed_index_time.get(backend)
+        if built and (now - built).total_seconds() < FEED_INDEX_TTL:
+            return self.feed_index[backend]
 
-        # Get all projects, that are ready for check
         stmt = (
-            sa.select(models.Project)
+            sa.select(
+                models.Project.id, models.Project.name, models.Project.latest_version
+            )
             .filter(
-                models.Project.next_check < time, models.Project.archived.is_(False)
+                models.Project.backend == backend,
+                models.Project.archived.is_(False),
             )
-            .order_by(models.Project.name)
+            .execution_options(yield_per=QUEUE_PAGE_SIZE)
         )
-        projects = db.session.scalars(stmt).all()
-        # Create list of projects that should be checked but belong to blacklisted backend
-        blacklisted_projects = []
-        for project in projects:
-            if project.backend in self.blacklist_dict:
-                blacklisted_projects.append(project)
+        index = defaultdict(list)
+        for project_id, name, latest_version in db.session.execute(stmt):
+            index[name.lower()].append((project_id, latest_version))
 
-        queue += [
-            project.id for project in projects if project not in blacklisted_projects
-        ]
+        self.feed_index[backend] = dict(index)
+        self.feed_index_time[backend] = now
+        # Entries resolved with the old index could be resolved differently now
+        self.feed_seen.pop(backend, None)
 
-        # Use ordered set to have the order of the elements, but still have uniqueness
-        ord_set = OrderedSet(queue)
+        return self.feed_index[backend]
+
+    def _stream_queue(
+        self, time: datetime, queue: List[int], blacklisted_backends: frozenset
+    ) -> Iterator[int]:
+        """
+        Yield the projects from ratelimit queue followed by every project ready
+        to check, without duplicates. Projects with new release announced in
+        feeds are yielded first after the ratelimit queue and then as soon as
+        the feed poller finds them during the run.
+
+        Args:
+            time: Start of the current run
+            queue: Ids of projects that were blacklisted in previous run
+            blacklisted_backends: Backends which projects are skipped
 
-        return list(ord_set)
+        Returns:
+            Iterator over project's ids to check.
+        """
+        seen = set()
+        for project_id in queue + self.take_feed_projects():
+            if project_id not in seen:
+                seen.add(project_id)
+                yield project_id
+
+        # Get ids of all projects that are ready for check. Use keyset pagination,
+        # checked projects are rescheduled while the queue is still streamed.
+        stmt = (
+            sa.select(models.Project.name, models.Project.id, models.Project.backend)
+            .filter(
+                models.Project.next_check < time, models.Project.archived.is_(False)
+            )
+            .order_by(models.Project.name, models.Project.id)
+            .limit(QUEUE_PAGE_SIZE)
+        )
+        page_stmt = stmt
+        while True:
+            rows = db.session.execute(page_stmt).all()
+            for _name, project_id, backend in rows:
+                for feed_project_id in self.take_feed_projects():
+                    if feed_project_id not in seen:
+                        seen.add(feed_project_id)
+                        yield feed_project_id
+                if backend in blacklisted_backends or project_id in seen:
+                    continue
+                seen.add(project_id)
+                yield project_id
+
+            if len(rows) < QUEUE_PAGE_SIZE:
+                break
+            last_name, last_id, _ = rows[-1]
+            page_stmt = stmt.filter(
+                sa.tuple_(models.Project.name, models.Project.id)
+                > sa.tuple_(last_name, last_id)
+            )
+            # Don't keep the transaction open while waiting for the checks
+            db.session.commit()
 
 
 def main():  # pragma: no cover
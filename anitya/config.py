@@ -74,11 +74,72 @@ DEFAULTS = dict(
     r"\.(?:tar|t[bglx]z|tbz2|zip)",
     # Token for GitHub API
     GITHUB_ACCESS_TOKEN=None,
+    # Pool of tokens for GitHub API used instead of GITHUB_ACCESS_TOKEN,
+    # every request is sent with the token having the most budget left
+    GITHUB_ACCESS_TOKENS=[],
+    # Spread GitHub API requests evenly till the reset of rate limit window
+    GITHUB_PACING=False,
+    # Maximum number of seconds a GitHub request could be delayed by pacing,
+    # the check is rescheduled as rate limited when exceeded
+    GITHUB_PACING_MAX_WAIT=60,
     CRON_POOL=10,  # Number of workers for check service
     CHECK_TIMEOUT=600,  # Timeout for check service
+    # Engine used by check service to run the checks, "threads" or "asyncio"
+    CHECK_ENGINE="threads",
+    # Number of checks running at once when the asyncio engine is used
+    CHECK_ASYNC_CONCURRENCY=100,
+    # Number of checks running at once against single host (asyncio engine)
+    CHECK_HOST_CONCURRENCY=4,
+    # Number of checks running at once per backend (asyncio engine),
+    # backends missing in this dictionary are limited only by the concurrency above
+    CHECK_BACKEND_CONCURRENCY={},
+    # Number of GitHub projects checked by a single GraphQL query,
+    # every project is checked separately when set to 0
+    CHECK_GITHUB_BATCH=0,
+    # Check projects with new releases announced in backend feeds first
+    CHECK_FEEDS=False,
+    # Lease projects in batches, so multiple check service nodes
+    # can share the same database
+    CHECK_DISTRIBUTED=False,
+    # Number of projects leased at once in distributed mode
+    CHECK_LEASE_BATCH=100,
+    # Lease expiration in seconds, expired leases are taken by other nodes
+    CHECK_LEASE_TIME=900,
+    # Identifier of the node, hostname and pid are used when empty
+    CHECK_NODE_ID="",
+    # Retrieve versions from snapshot of the project without holding
+    # database connection, the results are stored in short transaction
+    CHECK_PIPELINE=False,
+    # Number of successful checks written to database at once,
+    # every check is committed separately when set to 0
+    CHECK_WRITE_BATCH=0,
+    # Seconds after which the collected results are written, even if the batch
+    # is not full
+    CHECK_WRITE_INTERVAL=10,
     # When this number of failed checks is reached,
     # project will be automatically removed, if no version was retrieved yet
     CHECK_ERROR_THRESHOLD=100,
+    # Number of responses cached during a check run and shared by projects
+    # using the same URL, the cache is disabled when set to 0
+    CHECK_RESPONSE_CACHE_SIZE=0,
+    # Maximum number of requests in flight per upstream host,
+    # the host limiter and circuit breaker are disabled when set to 0
+    HOST_MAX_IN_FLIGHT=0,
+    # Maximum backoff in seconds when the host is throttling the requests
+    # without Retry-After header
+    HOST_BACKOFF_MAX=300,
+    # Number of consecutive failed requests which opens the circuit of the host
+    HOST_FAILURE_THRESHOLD=5,
+    # Seconds after which the open circuit lets a probe request through
+    HOST_CIRCUIT_TIMEOUT=300,
+    # Number of parsed version strings cached and shared by every project,
+    # the cache is disabled when set to 0
+    VERSION_PARSE_CACHE_SIZE=50000,
+    # Seconds the count of items estimated for API v2 listing is cached
+    # on databases without the query planner estimate
+    API_COUNT_CACHE_TIMEOUT=300,
+    # Number of counts cached for API v2 listing, the oldest are dropped first
+    API_COUNT_CACHE_SIZE=1000,
     DISTRO_MAPPING_LINKS={},
     # Enabled authentication backends
     AUTHLIB_ENABLED_BACKENDS=["Fedora", "GitHub", "Google"],
@@ -18,10 +18,12 @@
 import logging
 
 from sqlalchemy import event
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.util import identity_key
 
 from anitya.lib import plugins
 
-from .models import Project
+from .models import Project, ProjectVersion
 
 _log = logging.getLogger(__name__)
 
@@ -85,3 +87,130 @@ def set_ecosystem_homepage(target, value, old, initiator):
     if value != old:
         project = target.object
         _set_ecosystem(project, project.backend, value)
+
+
+#: Project columns which change the version objects of the project
+VERSION_VIEW_COLUMNS = (
+    "backend",
+    "ecosystem_name",
+    "version_scheme",
+    "version_pattern",
+    "version_prefix",
+    "pre_release_filter",
+    "version_filter",
+)
+
+
+def invalidate_version_view_column(target, value, old, initiator):
+    """
+    An SQLAlchemy event listener that drops the version view of a project
+    if column used by the version objects is changed.
+
+    Args:
+        target (models.Project): Instance of project.
+        value (str): The new value of the column.
+        old (str): The old value of the column.
+        initiator (sqlalchemy.orm.attributes.Event): The event object that is initiating this
+                transition.
+    """
+    if value != old:
+        target.invalidate_version_view()
+
+
+for _column in VERSION_VIEW_COLUMNS:
+    event.listen(getattr(Project, _column), "set", invalidate_version_view_column)
+
+
+@event.listens_for(Project, "expire")
+def invalidate_version_view_expire(target, attrs):
+    """
+    An SQLAlchemy event listener that drops the version view of a project
+    when the project is expired, so the versions are loaded again.
+
+    Args:
+        target (models.Project): Instance of project.
+        attrs (list): Expired attributes, None if every attribute is expired.
+    """
+    target.invalidate_version_view()
+
+
+@event.listens_for(Project, "refresh")
+def invalidate_version_view_refresh(target, context, attrs):
+    """
+    An SQLAlchemy event listener that drops the version view of a project
+    when the project is refreshed from database.
+
+    Args:
+        target (models.Project): Instance of project.
+        context (sqlalchemy.orm.QueryContext): Context of the query.
+        attrs (list): Refreshed attributes, None if every attribute is refreshed.
+    """
+    target.invalidate_version_view()
+
+
+@event.listens_for(ProjectVersion.project, "set")
+def invalidate_version_view_versions(target, value, old, initiator):
+    """
+    An SQLAlchemy event listener that drops the version view of projects
+    when a version is added to or removed from the project.
+
+    Args:
+        target (models.ProjectVersion): Instance of version.
+        value (models.Project): The new project of the version.
+        old (models.Project): The old project of the version.
+        initiator (sqlalchemy.orm.attributes.Event): The event object that is initiating this
+                transition.
+    """
+    for project in (value, old):
+        if isinstance(project, Project):
+            project.invalidate_version_view()
+
+
+def invalidate_version_view_version(target, value, old, initiator):
+    """
+    An SQLAlchemy event listener that drops the version view of the project
+    if the stored version is changed.
+
+    Args:
+        target (models.ProjectVersion): Instance of version.
+        value (object): The new value of the column.
+        old (object): The old value of the column.
+        initiator (sqlalchemy.orm.attributes.Event): The event object that is initiating this
+                transition.
+    """
+    # Don't load the project, only the loaded project could have the view
+    project = target.__dict__.get("project")
+    session = object_session(target)
+    if project is None and session is not None:
+        project = session.identity_map.get(identity_key(Project, target.project_id))
+    if isinstance(project, Project):
+        project.invalidate_version_view()
+
+
+for _column in ("version", "created_on", "commit_url"):
+    event.listen(
+        getattr(ProjectVersion, _column), "set", invalidate_version_view_version
+    )
+
+
+@event.listens_for(ProjectVersion, "before_insert")
+def set_version_sort_key(mapper, connection, target):
+    """
+    An SQLAlchemy event listener that computes the stored sort key of
+    a new version, if it wasn't set when the version was created.
+
+    Args:
+        mapper (sqlalchemy.orm.Mapper): Mapper of the version.
+        connection (sqlalchemy.engine.Connection): Connection used by the flush.
+        target (models.ProjectVersion): Instance of version.
+    """
+    if target.sort_key is not None:
+        return
+    # Don't load the project during flush, the project of the new version
+    # is almost always in the session already
+    project = target.__dict__.get("project")
+    session = object_session(target)
+    if project is None and session is not None:
+        project = session.identity_map.get(identity_key(Project, target.project_id))
+    if isinstance(project, Project):
+        target.sort_key = target.get_stored_sort_key(project)
@@ -21,14 +21,89 @@ This module sets up the basic database objects that all our other modules will
 rely on. This includes the declarative base class and global scoped session.
 """
 
-from sqlalchemy import func, select
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func, select, tuple_
 from sqlalchemy_helpers.flask_ext import DatabaseExtension
 
+from anitya.config import config
+
 # Integrate sqlalchemy_helpers
 db = DatabaseExtension()
 
+#: Modes of counting the total number of items
+TOTAL_MODES = ("exact", "estimate", "none")
+
+_count_cache = OrderedDict()
+_count_cache_lock = threading.Lock()
+
+
+def count_items(query, total="exact"):
+    """
+    Count the items returned by the query.
+
+    Args:
+        query (sqlalchemy.sql.Select): The query of the items.
+        total (str): ``exact`` counts the items, ``estimate`` returns
+            the estimate of the query planner on PostgreSQL and the exact
+            count cached for ``API_COUNT_CACHE_TIMEOUT`` seconds on other
+            databases (at most ``API_COUNT_CACHE_SIZE`` queries), ``none``
+            doesn't count the items at all.
+
+    Returns:
+        int: Number of items, None if not counted.
+
+    Raises:
+        ValueError: If the mode isn't known.
+    """
+    if total not in TOTAL_MODES:
+        raise ValueError(f"total must be one of {', '.join(TOTAL_MODES)}.")
+    if total == "none":
+        return None
+    count_query = select(func.count()).select_from(query.subquery())
+    if total == "exact":
+        return db.session.scalar(count_query)
+
+    connection = db.session.connection()
+    if connection.dialect.name == "postgresql":
+        # Values from the request are sent as bound parameters
+        compiled = query.compile(
+            dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        plan = connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
-def paginate(query, page=1, items_per_page=25) -> dict:
+    compiled = count_query.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    count = db.session.scalar(count_query)
+    with _count_cache_lock:
+        # The key contains the filters from the request, so drop the expired
+        # counts and keep only the most recent ones
+        for cached_key, (expires, _count) in list(_count_cache.items()):
+            if expires <= now:
+                del _count_cache[cached_key]
+        _count_cache[key] = (now + config.get("API_COUNT_CACHE_TIMEOUT", 0), count)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > config.get("API_COUNT_CACHE_SIZE", 0):
+            _count_cache.popitem(last=False)
+    return count
+
+
+def paginate(query, page=1, items_per_page=25, total="exact") -> dict:
     """
     Retrieve a page of items.
 
@@ -37,6 +112,8 @@ def paginate(query, page=1, items_per_page=25) -> dict:
                     defaults to 1.
         items_per_page (int): The number of items per page. This defaults
                               to 25.
+        total (str): How to count the total number of items,
+                     see :func:`count_items`.
 
     Returns:
         Page: A dict with result.
@@ -50,7 +127,7 @@ def paginate(query, page=1, items_per_page=25) -> dict:
     if items_per_page < 1:
         raise ValueError("items_per_page must be 1 or greater.")
 
-    total_items = db.session.scalar(select(func.count()).select_from(query.subquery()))
+    total_items = count_items(query, total)
     paginated_query = query.limit(items_per_page).offset(items_per_page * (page - 1))
     items = db.session.execute(paginated_query).scalars().all()
     return {
@@ -59,3 +136,90 @@ def paginate(query, page=1, items_per_page=25) -> dict:
         "total_items": total_items,
         "items_per_page": items_per_page,
     }
+
+
+def encode_cursor(values):
+    """
+    Encode the values of the sort columns to an opaque cursor.
+
+    Args:
+        values (list): Values of the sort columns of the last item.
+
+    Returns:
+        str: The cursor.
+    """
+    encoded = base64.urlsafe_b64encode(json.dumps(values).encode("utf-8"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, length):
+    """
+    Decode the values of the sort columns from the cursor.
+
+    Args:
+        cursor (str): The cursor returned by :func:`encode_cursor`.
+        length (int): Number of the sort columns.
+
+    Returns:
+        list: Values of the sort columns.
+
+    Raises:
+        ValueError: If the cursor isn't valid.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as err:
+        raise ValueError("Cursor is not valid.") from err
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Cursor is not valid.")
+    return values
+
+
+def paginate_after(query, columns, after=None, items_per_page=25, total="exact"):
+    """
+    Retrieve the items following the cursor.
+
+    The items are ordered by the columns, which must be unique together.
+    Instead of skipping the previous items with ``OFFSET``, the items are
+    filtered by the values of the last item of previous page, so every page
+    is retrieved with the same cost.
+
+    Args:
+        query (sqlalchemy.sql.Select): The query of the items, without ordering.
+        columns (list): The columns to order by.
+        after (str): The cursor returned with the previous page, the first page
+                     is retrieved when empty.
+        items_per_page (int): The number of items per page. This defaults
+                              to 25.
+        total (str): How to count the total number of items,
+                     see :func:`count_items`.
+
+    Returns:
+        dict: The items, cursor of the next page, which is None on the last
+        page, and total number of items.
+
+    Raises:
+        ValueError: If the cursor or items_per_page values are not valid.
+    """
+    if items_per_page < 1:
+        raise ValueError("items_per_page must be 1 or greater.")
+
+    total_items = count_items(query, total)
+    if after:
+        values = decode_cursor(after, len(columns))
+        query = query.filter(tuple_(*columns) > tuple_(*values))
+    paginated_query = query.order_by(*columns).limit(items_per_page + 1)
+    items = db.session.execute(paginated_query).scalars().all()
+    next_after = None
+    if len(items) > items_per_page:
+        items = items[:items_per_page]
+        next_after = encode_cursor(
+            [getattr(items[-1], column.key) for column in columns]
+        )
+    return {
+        "items": items,
+        "next_after": next_after,
+        "total_items": total_items,
+        "items_per_page": items_per_page,
+    }
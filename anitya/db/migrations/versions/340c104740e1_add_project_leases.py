@@ -0,0 +1,44 @@
+"""Add project leases and backend rate limits
+
+Revision ID: 340c104740e1
+Revises: ebc827e80373
+Create Date: 2026-10-17 09:12:44.318207
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "340c104740e1"
+down_revision = "ebc827e80373"
+
+
+def upgrade():
+    """
+    Add lease_owner and lease_expiry columns to projects table.
+    Create backend_rate_limits table.
+    """
+    op.add_column("projects", sa.Column("lease_owner", sa.String(200), nullable=True))
+    op.add_column(
+        "projects",
+        sa.Column("lease_expiry", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_projects_lease_expiry"), "projects", ["lease_expiry"], unique=False
+    )
+    op.create_table(
+        "backend_rate_limits",
+        sa.Column("backend", sa.String(200), primary_key=True),
+        sa.Column("reset_time", sa.TIMESTAMP(timezone=True), nullable=False),
+    )
+
+
+def downgrade():
+    """
+    Remove lease_owner and lease_expiry columns from projects table.
+    Drop backend_rate_limits table.
+    """
+    op.drop_table("backend_rate_limits")
+    op.drop_index(op.f("ix_projects_lease_expiry"), table_name="projects")
+    op.drop_column("projects", "lease_expiry")
+    op.drop_column("projects", "lease_owner")
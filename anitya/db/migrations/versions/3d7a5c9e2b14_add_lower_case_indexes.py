@@ -0,0 +1,52 @@
+"""Add lower case indexes
+
+Revision ID: 3d7a5c9e2b14
+Revises: 9b4e2f7a1c63
+Create Date: 2026-10-17 20:11:47.902615
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3d7a5c9e2b14"
+down_revision = "9b4e2f7a1c63"
+
+# Expression indexes of the case insensitive lookups
+INDEXES = {
+    "ix_distros_lower_name": ("distros", ["lower(name)"]),
+    "ix_packages_lower_distro_name_package_name": (
+        "packages",
+        ["lower(distro_name)", "package_name"],
+    ),
+    "ix_packages_lower_package_name": ("packages", ["lower(package_name)"]),
+    "ix_packages_project_id": ("packages", ["project_id"]),
+    "ix_projects_lower_name_ecosystem_name": (
+        "projects",
+        ["lower(name)", "lower(ecosystem_name)"],
+    ),
+    "ix_projects_lower_ecosystem_name": ("projects", ["lower(ecosystem_name)"]),
+    "ix_projects_lower_homepage": ("projects", ["lower(homepage)"]),
+}
+
+
+def upgrade():
+    """
+    Add indexes of lower cased columns used by case insensitive lookups
+    and of the project of packages, used when loading the project packages.
+    """
+    for name, (table, expressions) in INDEXES.items():
+        op.create_index(
+            name,
+            table,
+            [sa.text(expression) for expression in expressions],
+            unique=False,
+        )
+
+
+def downgrade():
+    """
+    Remove indexes of lower cased columns and of the project of packages.
+    """
+    for name, (table, _expressions) in INDEXES.items():
+        op.drop_index(name, table_name=table)
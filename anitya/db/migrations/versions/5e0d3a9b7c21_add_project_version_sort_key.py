@@ -0,0 +1,39 @@
+"""Add sort key to project versions
+
+Revision ID: 5e0d3a9b7c21
+Revises: c41e7b2d9f08
+Create Date: 2026-10-17 16:20:31.604117
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e0d3a9b7c21"
+down_revision = "c41e7b2d9f08"
+
+
+def upgrade():
+    """
+    Add sort_key column to projects_versions table.
+
+    The keys are computed by the version schemes, so existing versions are
+    filled by the ``rebuild_sort_keys`` script.
+    """
+    op.add_column(
+        "projects_versions", sa.Column("sort_key", sa.LargeBinary, nullable=True)
+    )
+    op.create_index(
+        "ix_projects_versions_sort_key",
+        "projects_versions",
+        ["project_id", "sort_key"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """
+    Remove sort_key column from projects_versions table.
+    """
+    op.drop_index("ix_projects_versions_sort_key", table_name="projects_versions")
+    op.drop_column("projects_versions", "sort_key")
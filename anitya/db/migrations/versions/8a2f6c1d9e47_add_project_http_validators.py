@@ -0,0 +1,27 @@
+"""Add HTTP validators to projects
+
+Revision ID: 8a2f6c1d9e47
+Revises: 340c104740e1
+Create Date: 2026-10-17 13:41:07.512934
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8a2f6c1d9e47"
+down_revision = "340c104740e1"
+
+
+def upgrade():
+    """
+    Add http_validators column to projects table.
+    """
+    op.add_column("projects", sa.Column("http_validators", sa.JSON, nullable=True))
+
+
+def downgrade():
+    """
+    Remove http_validators column from projects table.
+    """
+    op.drop_column("projects", "http_validators")
@@ -0,0 +1,91 @@
+"""Add search indexes
+
+Revision ID: 9b4e2f7a1c63
+Revises: 5e0d3a9b7c21
+Create Date: 2026-10-17 18:42:05.318274
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b4e2f7a1c63"
+down_revision = "5e0d3a9b7c21"
+
+# Searched columns of the tables
+COLUMNS = {
+    "projects": ("name", "logs"),
+    "packages": ("package_name",),
+}
+
+# PostgreSQL trigram indexes
+INDEXES = {
+    "ix_distros_name_trgm": ("distros", "name"),
+    "ix_packages_package_name_trgm": ("packages", "package_name"),
+    "ix_projects_name_trgm": ("projects", "name"),
+    "ix_projects_logs_trgm": ("projects", "logs"),
+}
+
+
+def _create_shadow_table(table, columns):
+    """Create the SQLite FTS5 shadow table of the table and fill it."""
+    shadow = f"{table}_search"
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    delete = (
+        f"INSERT INTO {shadow}({shadow}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f"INSERT INTO {shadow}(rowid, {names}) VALUES (new.id, {new});"
+    op.execute(
+        f"CREATE VIRTUAL TABLE {shadow} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        f"CREATE TRIGGER {shadow}_insert AFTER INSERT ON {table} BEGIN {insert} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {shadow}_delete AFTER DELETE ON {table} BEGIN {delete} END"
+    )
+    op.execute(
+        f"CREATE TRIGGER {shadow}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete} {insert} END"
+    )
+    op.execute(f"INSERT INTO {shadow}({shadow}) VALUES ('rebuild')")
+
+
+def upgrade():
+    """
+    Add trigram indexes of the searched columns on PostgreSQL and FTS5
+    shadow tables on SQLite.
+    """
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, (table, column) in INDEXES.items():
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+    elif dialect == "sqlite":
+        for table, columns in COLUMNS.items():
+            _create_shadow_table(table, columns)
+
+
+def downgrade():
+    """
+    Remove the search indexes.
+    """
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for name, (table, _column) in INDEXES.items():
+            op.drop_index(name, table_name=table)
+    elif dialect == "sqlite":
+        for table in COLUMNS:
+            for trigger in ("insert", "delete", "update"):
+                op.execute(f"DROP TRIGGER {table}_search_{trigger}")
+            op.execute(f"DROP TABLE {table}_search")
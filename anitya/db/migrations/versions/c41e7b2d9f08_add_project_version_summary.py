@@ -0,0 +1,165 @@
+"""Add version summary columns to projects
+
+Revision ID: c41e7b2d9f08
+Revises: 8a2f6c1d9e47
+Create Date: 2026-10-17 15:02:44.118205
+"""
+
+from operator import attrgetter
+
+import sqlalchemy as sa
+from alembic import op
+
+from anitya.lib import plugins
+from anitya.lib.versions import GLOBAL_DEFAULT, get_version_context
+
+# revision identifiers, used by Alembic.
+revision = "c41e7b2d9f08"
+down_revision = "8a2f6c1d9e47"
+
+# Number of projects backfilled in one batch
+BATCH_SIZE = 1000
+
+projects_table = sa.table(
+    "projects",
+    sa.column("id", sa.Integer),
+    sa.column("backend", sa.String),
+    sa.column("ecosystem_name", sa.String),
+    sa.column("version_scheme", sa.String),
+    sa.column("version_prefix", sa.String),
+    sa.column("version_pattern", sa.String),
+    sa.column("version_filter", sa.String),
+    sa.column("pre_release_filter", sa.String),
+    sa.column("latest_stable_version", sa.String),
+    sa.column("latest_version_created_on", sa.DateTime),
+    sa.column("versions_count", sa.Integer),
+)
+
+versions_table = sa.table(
+    "projects_versions",
+    sa.column("project_id", sa.Integer),
+    sa.column("version", sa.String),
+    sa.column("created_on", sa.DateTime),
+)
+
+
+def _version_class(row):
+    """Version class of the project, resolved the same way as by the project."""
+    version_scheme = row.version_scheme
+    if not version_scheme and row.ecosystem_name:
+        ecosystem = plugins.ECOSYSTEM_PLUGINS.get_plugin(row.ecosystem_name)
+        version_scheme = (
+            ecosystem.default_version_scheme if ecosystem else GLOBAL_DEFAULT
+        )
+    if not version_scheme and row.backend:
+        backend = plugins.BACKEND_PLUGINS.get_plugin(row.backend)
+        version_scheme = backend.default_version_scheme if backend else None
+    return plugins.VERSION_PLUGINS.get_plugin(version_scheme or GLOBAL_DEFAULT)
+
+
+def _is_filtered(row, version):
+    """Check if the version matches the version filter of the project."""
+    if not row.version_filter:
+        return False
+    prefixed = f"{row.version_prefix}{version}" if row.version_prefix else version
+    return any(
+        item.strip() and (item.strip() in version or item.strip() in prefixed)
+        for item in row.version_filter.split(";")
+    )
+
+
+def _summarize(row, versions):
+    """Compute the summary of the stored versions of the project."""
+    version_class = _version_class(row)
+    context = get_version_context(
+        row.version_prefix, row.version_pattern, row.pre_release_filter
+    )
+    sorted_versions = list(
+        reversed(
+            sorted(
+                (
+                    version_class(
+                        version=version.version,
+                        created_on=version.created_on,
+                        context=context,
+                    )
+                    for version in versions
+                    if not _is_filtered(row, version.version)
+                ),
+                key=attrgetter("sort_key"),
+            )
+        )
+    )
+    stable_versions = [
+        version for version in sorted_versions if not version.prerelease()
+    ]
+    return {
+        "_id": row.id,
+        "latest_stable_version": (str(stable_versions[0]) if stable_versions else None),
+        "latest_version_created_on": (
+            sorted_versions[0].created_on if sorted_versions else None
+        ),
+        "versions_count": len(versions),
+    }
+
+
+def upgrade():
+    """
+    Add latest_stable_version, latest_version_created_on and versions_count
+    columns to projects table and backfill them in batches of projects.
+    """
+    op.add_column(
+        "projects", sa.Column("latest_stable_version", sa.String(50), nullable=True)
+    )
+    op.add_column(
+        "projects", sa.Column("latest_version_created_on", sa.DateTime, nullable=True)
+    )
+    op.add_column(
+        "projects",
+        sa.Column("versions_count", sa.Integer, nullable=False, server_default="0"),
+    )
+
+    connection = op.get_bind()
+    update = (
+        projects_table.update()
+        .where(projects_table.c.id == sa.bindparam("_id"))
+        .values(
+            latest_stable_version=sa.bindparam("latest_stable_version"),
+            latest_version_created_on=sa.bindparam("latest_version_created_on"),
+            versions_count=sa.bindparam("versions_count"),
+        )
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(projects_table)
+            .where(projects_table.c.id > last_id)
+            .order_by(projects_table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        versions = {}
+        for version in connection.execute(
+            sa.select(versions_table).where(
+                versions_table.c.project_id.in_([row.id for row in rows])
+            )
+        ):
+            versions.setdefault(version.project_id, []).append(version)
+
+        summaries = [
+            _summarize(row, versions[row.id]) for row in rows if row.id in versions
+        ]
+        if summaries:
+            connection.execute(update, summaries)
+
+
+def downgrade():
+    """
+    Remove version summary columns from projects table.
+    """
+    op.drop_column("projects", "versions_count")
+    op.drop_column("projects", "latest_version_created_on")
+    op.drop_column("projects", "latest_stable_version")
@@ -24,13 +24,16 @@ import logging
 import string
 import time
 import uuid
+from operator import attrgetter
 from secrets import choice as random_choice
 
 import arrow
 import six
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import validates
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.types import CHAR, TypeDecorator
 from sqlalchemy_helpers import Base
@@ -38,6 +41,9 @@ from sqlalchemy_helpers import Base
 from anitya.config import config as anitya_config
 from anitya.lib.plugins import BACKEND_PLUGINS, ECOSYSTEM_PLUGINS, VERSION_PLUGINS
 from anitya.lib.versions import GLOBAL_DEFAULT as DEFAULT_VERSION_SCHEME
+from anitya.lib.versions import get_version_context
+
+from . import search
 
 _log = logging.getLogger(__name__)
 
@@ -60,6 +66,38 @@ def _paginate_query(query, page):
     return query
 
 
+def _paginate_query_with_count(query, page):
+    """
+    Retrieve the page of the query together with the count of all its items.
+
+    The count is computed by a window function in the same query, the count
+    query is only needed when the page is past the last item.
+
+    Returns:
+        tuple: The list of items on the page and the count of all items.
+    """
+    total = sa.func.count().over().label("total")
+    rows = _paginate_query(query.add_columns(total), page).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    return [], query.order_by(None).count()
+
+
+def _trigram_index(name, column):
+    """
+    GIN trigram index of the column, used by ``ILIKE`` on PostgreSQL.
+
+    The indexes on SQLite are replaced by shadow tables, see
+    :mod:`anitya.db.search`.
+    """
+    return sa.Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
 class Distro(Base):
     """Class Distro"""
 
@@ -67,6 +105,11 @@ class Distro(Base):
 
     name = sa.Column(sa.String(200), primary_key=True)
 
+    __table_args__ = (
+        sa.Index("ix_distros_lower_name", sa.func.lower(name)),
+        _trigram_index("ix_distros_name_trgm", "name"),
+    )
+
     def __init__(self, name):
         """Constructor."""
         self.name = name
@@ -104,12 +147,7 @@ class Distro(Base):
         if "*" in pattern:
             pattern = pattern.replace("*", "%")
 
-        query = (
-            session.query(cls)
-            .filter(sa.or_(sa.func.lower(cls.name).like(sa.func.lower(pattern))))
-            .order_by(cls.name)
-            .distinct()
-        )
+        query = session.query(cls).filter(cls.name.ilike(pattern)).order_by(cls.name)
 
         query = _paginate_query(query, page)
 
@@ -140,12 +178,23 @@ class Packages(Base):
         sa.ForeignKey("distros.name", ondelete="cascade", onupdate="cascade"),
     )
     project_id = sa.Column(
-        sa.Integer, sa.ForeignKey("projects.id", ondelete="cascade", onupdate="cascade")
+        sa.Integer,
+        sa.ForeignKey("projects.id", ondelete="cascade", onupdate="cascade"),
+        index=True,
     )
 
     package_name = sa.Column(sa.String(200))
 
-    __table_args__ = (sa.UniqueConstraint("distro_name", "package_name"),)
+    __table_args__ = (
+        sa.UniqueConstraint("distro_name", "package_name"),
+        sa.Index(
+            "ix_packages_lower_distro_name_package_name",
+            sa.func.lower(distro_name),
+            package_name,
+        ),
+        sa.Index("ix_packages_lower_package_name", sa.func.lower(package_name)),
+        _trigram_index("ix_packages_package_name_trgm", "package_name"),
+    )
 
     project = sa.orm.relationship(
         "Project", backref=sa.orm.backref("package", cascade="all, delete-orphan")
@@ -235,6 +284,13 @@ class Project(Base):
             by normal users and are no longer checked for new versions.
         version_filter (sa.String): A string containing filters delimited by ';'.
             Filtered versions will be skipped when retrieving versions.
+        lease_owner (sa.String): Identifier of the check service node that leased
+            the project for check. Only used by distributed check service.
+        lease_expiry (sa.DateTime): Time when the lease of the project expires and
+            it could be leased by another check service node.
+        http_validators (sa.JSON): ``ETag``, ``Last-Modified`` and digest of body
+            of the responses received during the last successful check, keyed
+            by URL. These are used for conditional requests in the next check.
     """
 
     __tablename__ = "projects"
@@ -258,6 +314,11 @@ class Project(Base):
     version_filter = sa.Column(sa.String(200), nullable=True)
 
     latest_version = sa.Column(sa.String(50))
+    latest_stable_version = sa.Column(sa.String(50), nullable=True)
+    latest_version_created_on = sa.Column(sa.DateTime, nullable=True)
+    versions_count = sa.Column(
+        sa.Integer, nullable=False, default=0, server_default="0"
+    )
     logs = sa.Column(sa.Text)
     check_successful = sa.Column(sa.Boolean, default=None, index=True)
 
@@ -267,6 +328,9 @@ class Project(Base):
     next_check = sa.Column(
         sa.TIMESTAMP(timezone=True), default=lambda: arrow.utcnow().datetime, index=True
     )
+    lease_owner = sa.Column(sa.String(200), nullable=True)
+    lease_expiry = sa.Column(sa.TIMESTAMP(timezone=True), nullable=True, index=True)
+    http_validators = sa.Column(sa.JSON, nullable=True)
 
     updated_on = sa.Column(
         sa.DateTime,
@@ -282,6 +346,15 @@ class Project(Base):
         sa.UniqueConstraint(
             "name", "ecosystem_name", name="UNIQ_PROJECT_NAME_PER_ECOSYSTEM"
         ),
+        sa.Index(
+            "ix_projects_lower_name_ecosystem_name",
+            sa.func.lower(name),
+            sa.func.lower(ecosystem_name),
+        ),
+        sa.Index("ix_projects_lower_ecosystem_name", sa.func.lower(ecosystem_name)),
+        sa.Index("ix_projects_lower_homepage", sa.func.lower(homepage)),
+        _trigram_index("ix_projects_name_trgm", "name"),
+        _trigram_index("ix_projects_logs_trgm", "logs"),
     )
 
     @validates("backend")
@@ -298,8 +371,12 @@ class Project(Base):
         Returns:
            :obj:`list` of :obj:`str`: List of versions
         """
-        sorted_versions = self.get_sorted_version_objects()
-        return [str(v) for v in sorted_versions]
+        return list(
+            self._get_version_view(
+                "versions",
+                lambda: [str(v) for v in self._get_sorted_versions()],
+            )
+        )
 
     @property
     def stable_versions(self):
@@ -309,21 +386,16 @@ class Project(Base):
         Returns:
            list(`anitya.lib.versions.Base`): List of stable version objects
         """
-        sorted_versions = self.get_sorted_version_objects()
-        return [version for version in sorted_versions if not version.prerelease()]
-
-    @property
-    def latest_stable_version(self):
-        """
-        Return latest stable version.
-
-        Returns:
-           `string`: Latest stable version if exists, otherwise None.
-        """
-        stable_versions = self.stable_versions
-        if stable_versions:
-            return str(stable_versions[0])
-        return None
+        return list(
+            self._get_version_view(
+                "stable_versions",
+                lambda: [
+                    version
+                    for version in self._get_sorted_versions()
+                    if not version.prerelease()
+                ],
+            )
+        )
 
     def get_last_created_version(self):
         """
@@ -372,14 +444,13 @@ class Project(Base):
                 `self.version_class`.
         """
         version_class = self.get_version_class()
+        context = self.get_version_context()
         versions = sorted(
             [
                 version_class(
                     version=version if isinstance(version, str) else version["version"],
-                    prefix=self.version_prefix,
-                    pre_release_filter=self.pre_release_filter,
                     created_on=datetime.datetime.utcnow(),
-                    pattern=self.version_pattern,
+                    context=context,
                     commit_url=(
                         version["commit_url"]
                         if isinstance(version, dict) and "commit_url" in version
@@ -387,7 +458,8 @@ class Project(Base):
                     ),
                 )
                 for version in versions
-            ]
+            ],
+            key=attrgetter("sort_key"),
         )
 
         return versions
@@ -434,8 +506,8 @@ class Project(Base):
 
         return False
 
-    def get_sorted_version_objects(self, ignore_filter=False):
-        """Return list of all version objects stored, sorted from newest to oldest.
+    def get_version_objects(self, ignore_filter=False):
+        """Return list of all version objects stored, in the order they are stored.
 
         Args:
            ignore_filter (bool, optional): If True, do not apply version filters. Defaults to False.
@@ -444,29 +516,145 @@ class Project(Base):
            :obj:`list` of :obj:`anitya.lib.versions.Base`: List of version objects
         """
         version_class = self.get_version_class()
-        versions = [
+        context = self.get_version_context()
+        return [
             version_class(
                 version=v_obj.version,
-                prefix=self.version_prefix,
-                pre_release_filter=self.pre_release_filter,
                 created_on=v_obj.created_on,
-                pattern=self.version_pattern,
+                context=context,
                 commit_url=v_obj.commit_url,
             )
             for v_obj in self.versions_obj
             if ignore_filter or not self.is_version_filtered(v_obj.version)
         ]
-        sorted_versions = list(reversed(sorted(versions)))
-        return sorted_versions
+
+    def get_sorted_version_objects(self, ignore_filter=False):
+        """Return list of all version objects stored, sorted from newest to oldest.
+
+        Args:
+           ignore_filter (bool, optional): If True, do not apply version filters. Defaults to False.
+
+        Returns:
+           :obj:`list` of :obj:`anitya.lib.versions.Base`: List of version objects
+        """
+        return list(self._get_sorted_versions(ignore_filter))
+
+    def _get_sorted_versions(self, ignore_filter=False):
+        """Return the cached list of sorted version objects, which must not be changed."""
+        return self._get_version_view(
+            ("sorted", ignore_filter),
+            lambda: list(
+                reversed(
+                    sorted(
+                        self.get_version_objects(ignore_filter),
+                        key=attrgetter("sort_key"),
+                    )
+                )
+            ),
+        )
+
+    def get_version_object(self, version):
+        """Return the version object of the stored version.
+
+        Args:
+           version (str): The raw version string.
+
+        Returns:
+           :obj:`anitya.lib.versions.Base`: The version object or None, if the
+           version is not stored.
+        """
+        by_version = self._get_version_view(
+            "by_version",
+            lambda: {
+                v_obj.version: v_obj
+                for v_obj in self._get_sorted_versions(ignore_filter=True)
+            },
+        )
+        return by_version.get(version)
+
+    def _get_version_view(self, name, compute):
+        """Return part of the version view of this project.
+
+        The view is computed once and shared by every property using the
+        versions, till :meth:`invalidate_version_view` is called. This is done
+        by the listeners in :mod:`anitya.db.events`, whenever the versions or
+        the columns changing the version objects are modified.
+
+        Args:
+           name (str): Name of the part of the view.
+           compute (callable): Function computing the part of the view.
+
+        Returns:
+           The cached result of `compute`, which must not be changed.
+        """
+        view = self.__dict__.get("_version_view")
+        if view is not None and name in view:
+            return view[name]
+        # Computing could load the expired project and drop the view
+        result = compute()
+        self.__dict__.setdefault("_version_view", {})[name] = result
+        return result
+
+    def invalidate_version_view(self):
+        """Drop the cached version view of this project."""
+        self.__dict__.pop("_version_view", None)
 
     @property
     def latest_version_object(self):
         """Latest version object"""
-        sorted_versions = self.get_sorted_version_objects()
+        sorted_versions = self._get_sorted_versions()
         if sorted_versions:
             return sorted_versions[0]
         return None
 
+    def update_version_summary(self):
+        """Recompute the columns summarizing the versions of the project.
+
+        The latest version, latest stable version, creation time of the latest
+        version and number of stored versions are kept on the project, so
+        listings don't need to load and sort the versions. The check of the
+        project updates them incrementally, this recomputes them from
+        all the versions and is used when the versions or version settings
+        are changed in other way.
+        """
+        latest = self.latest_version_object
+        stable_versions = self.stable_versions
+        self.latest_version = latest.parse() if latest else None
+        self.latest_stable_version = (
+            str(stable_versions[0]) if stable_versions else None
+        )
+        self.latest_version_created_on = latest.created_on if latest else None
+        self.versions_count = len(self.versions_obj)
+
+    def update_version_sort_keys(self):
+        """Recompute the stored sort keys of every version of the project.
+
+        The keys depend on the version scheme, prefixes and pattern of
+        the project, so this should be called when any of them changes.
+
+        Returns:
+            int: Number of versions with changed key.
+        """
+        updated = 0
+        for version in self.versions_obj:
+            sort_key = version.get_stored_sort_key(self)
+            if version.sort_key != sort_key:
+                version.sort_key = sort_key
+                updated += 1
+        return updated
+
+    def get_version_context(self):
+        """
+        Get the context shared by every version object of this project.
+
+        Returns:
+            anitya.lib.versions.VersionContext: The context with prefixes,
+            pattern and pre-release filters of the project.
+        """
+        return get_version_context(
+            self.version_prefix, self.version_pattern, self.pre_release_filter
+        )
+
     def get_version_class(self):
         """
         Get the class for the version scheme used by this project.
@@ -541,6 +729,35 @@ class Project(Base):
         """By name"""
         return session.query(cls).filter_by(name=name).all()
 
+    @classmethod
+    def preload_versions(cls, session, projects, batch_size=500):
+        """
+        Load the versions of already loaded projects with one query per batch.
+
+        This is used when the projects weren't loaded with ``selectinload``,
+        so serializing them doesn't load the versions of each project
+        separately.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): The database session.
+            projects (list): Projects to load the versions for.
+            batch_size (int): Maximum number of projects loaded by one query.
+        """
+        projects = [
+            project
+            for project in projects
+            if "versions_obj" not in sa.inspect(project).dict
+        ]
+        for start in range(0, len(projects), batch_size):
+            batch = {project.id: [] for project in projects[start : start + batch_size]}
+            query = session.query(ProjectVersion).filter(
+                ProjectVersion.project_id.in_(batch)
+            )
+            for version in query:
+                batch[version.project_id].append(version)
+            for project in projects[start : start + batch_size]:
+                set_committed_value(project, "versions_obj", batch[project.id])
+
     @classmethod
     def by_id(cls, session, project_id):
         """By id"""
@@ -575,14 +792,22 @@ class Project(Base):
             return None
 
     @classmethod
-    def all(cls, session, page=None, count=False, sort=None):
-        """all"""
+    def all(cls, session, page=None, count=False, sort=None, yield_per=None):
+        """
+        All projects, sorted by their name or by the given sort spec.
+
+        When ``yield_per`` is set, the query is returned instead of the list,
+        it fetches the projects in batches of this size from the server-side
+        cursor when iterated.
+        """
         query = cls.sort_projects(session.query(Project), sort)
 
         query = _paginate_query(query, page)
 
         if count:
             return query.count()
+        elif yield_per:
+            return query.yield_per(yield_per)
         else:
             return query.all()
 
@@ -605,7 +830,14 @@ class Project(Base):
 
     @classmethod
     def updated(
-        cls, session, status="updated", name=None, log=None, page=None, count=False
+        cls,
+        session,
+        status="updated",
+        name=None,
+        log=None,
+        page=None,
+        count=False,
+        with_count=False,
     ):
         """Method used to retrieve projects according to their logs and
         how they performed at the last cron job.
@@ -619,6 +851,8 @@ class Project(Base):
         :kwarg page: The page number of returned, pages contain 50 entries
         :kwarg count: A boolean used to return either the list of entries
             matching the criterias or just the COUNT of entries
+        :kwarg with_count: A boolean used to return both the page of entries
+            and the COUNT of entries, retrieved by single query
 
         """
 
@@ -651,7 +885,7 @@ class Project(Base):
             else:
                 name = "%" + name + "%"
 
-            query = query.filter(Project.name.ilike(name))
+            query = query.filter(search.ilike(session, Project.name, name))
 
         if log:
             if "*" in log:
@@ -659,7 +893,10 @@ class Project(Base):
             else:
                 log = "%" + log + "%"
 
-            query = query.filter(Project.logs.ilike(log))
+            query = query.filter(search.ilike(session, Project.logs, log))
+
+        if with_count:
+            return _paginate_query_with_count(query, page)
 
         query = _paginate_query(query, page)
 
@@ -669,46 +906,86 @@ class Project(Base):
             return query.all()
 
     @classmethod
-    def search(cls, session, pattern, distro=None, page=None, count=False, sort=None):
-        """Search the projects by their name or package name"""
-
-        query1 = session.query(cls)
-
-        if pattern:
-            pattern = pattern.replace("_", r"\_")
-            if "*" in pattern:
-                pattern = pattern.replace("*", "%")
-            if "%" in pattern:
-                query1 = query1.filter(Project.name.ilike(pattern))
-            else:
-                query1 = query1.filter(Project.name == pattern)
-
-        query2 = session.query(cls).filter(Project.id == Packages.project_id)
+    def search(
+        cls,
+        session,
+        pattern,
+        distro=None,
+        page=None,
+        count=False,
+        sort=None,
+        yield_per=None,
+        with_count=False,
+        extended_pattern=None,
+    ):
+        """
+        Search the projects by their name or package name.
 
-        if pattern:
-            if "%" in pattern:
-                query2 = query2.filter(Packages.package_name.ilike(pattern))
-            else:
-                query2 = query2.filter(Packages.package_name == pattern)
+        When ``yield_per`` is set, the query is returned instead of the list,
+        see :meth:`all`. When ``with_count`` is set, the page of projects and
+        the count of all matching projects are returned, retrieved by single
+        query.
 
-        if distro is not None:
-            query1 = query1.filter(Project.id == Packages.project_id).filter(
-                sa.func.lower(Packages.distro_name) == sa.func.lower(distro)
-            )
-            query2 = query2.filter(
-                sa.func.lower(Packages.distro_name) == sa.func.lower(distro)
+        When ``extended_pattern`` is set, the projects matching it are
+        returned too, but they are ranked after the projects matching
+        the ``pattern``.
+        """
+        query = session.query(cls).filter(
+            cls._search_condition(session, extended_pattern or pattern, distro)
+        )
+        if extended_pattern:
+            query = query.order_by(
+                sa.case((cls._search_condition(session, pattern, distro), 0), else_=1)
             )
-
-        query = query1.distinct().union(query2.distinct())
         query = cls.sort_projects(query, sort)
 
+        if with_count:
+            return _paginate_query_with_count(query, page)
+
         query = _paginate_query(query, page)
 
         if count:
             return query.count()
+        elif yield_per:
+            return query.yield_per(yield_per)
         else:
             return query.all()
 
+    @classmethod
+    def _search_condition(cls, session, pattern, distro=None):
+        """
+        Condition matching the projects by their name or package name.
+
+        Projects matching by name must have a package in the distribution,
+        projects matching by package name must have the matching package
+        in the distribution.
+        """
+        packages = sa.select(Packages.project_id)
+        in_distro = sa.true()
+        if distro is not None:
+            distro_packages = packages.where(
+                sa.func.lower(Packages.distro_name) == sa.func.lower(distro)
+            )
+            packages = distro_packages
+            in_distro = cls.id.in_(distro_packages)
+
+        if not pattern:
+            return sa.or_(in_distro, cls.id.in_(packages))
+
+        pattern = pattern.replace("_", r"\_")
+        if "*" in pattern:
+            pattern = pattern.replace("*", "%")
+        if "%" in pattern:
+            name_match = search.ilike(session, cls.name, pattern)
+            packages = packages.where(
+                search.ilike(session, Packages.package_name, pattern)
+            )
+        else:
+            name_match = cls.name == pattern
+            packages = packages.where(Packages.package_name == pattern)
+
+        return sa.or_(sa.and_(name_match, in_distro), cls.id.in_(packages))
+
     @classmethod
     def sort_projects(cls, items, sort):
         """Sort a query or list of projects by the given sort spec."""
@@ -735,6 +1012,105 @@ class Project(Base):
         return items
 
 
+class ProjectSpec:
+    """
+    Immutable snapshot of the project fields used by backends to retrieve versions.
+
+    The snapshot is detached from the database session, so backends could
+    retrieve versions without holding a database connection. It could be
+    passed to backends instead of the :class:`Project`.
+
+    Attributes:
+        id (int): The project id.
+        name (str): The project name.
+        homepage (str): The project homepage.
+        backend (str): Name of the backend used to check the project.
+        ecosystem_name (str): Name of the ecosystem the project is part of.
+        version_url (str): URL used by backend to retrieve versions.
+        regex (str): Regular expression used by some backends.
+        version_prefix (str): Prefixes removed from versions.
+        version_pattern (str): Pattern used by calendar version scheme.
+        version_scheme (str): Version scheme set on the project.
+        pre_release_filter (str): Filter for pre-releases.
+        version_filter (str): Filter for versions that should be ignored.
+        insecure (bool): Whether to skip SSL certificate validation.
+        releases_only (bool): Whether to retrieve only releases (GitHub backend).
+        archived (bool): Whether the project is archived.
+        http_validators (dict): Validators used for conditional requests.
+        last_version_time (arrow.Arrow): Creation time of the latest version
+            or None, if project doesn't have any version yet.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "homepage",
+        "backend",
+        "ecosystem_name",
+        "version_url",
+        "regex",
+        "version_prefix",
+        "version_pattern",
+        "version_scheme",
+        "pre_release_filter",
+        "version_filter",
+        "insecure",
+        "releases_only",
+        "archived",
+        "http_validators",
+        "last_version_time",
+    )
+
+    def __init__(self, **kwargs):
+        for attr in self.__slots__:
+            object.__setattr__(self, attr, kwargs.get(attr))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __repr__(self):
+        return f"<ProjectSpec({self.name}, {self.homepage})>"
+
+    @classmethod
+    def from_project(cls, project):
+        """
+        Create snapshot of the project.
+
+        Args:
+            project (Project): The project to create snapshot of.
+
+        Returns:
+            ProjectSpec: Snapshot of the project.
+        """
+        kwargs = {
+            attr: getattr(project, attr)
+            for attr in cls.__slots__
+            if attr != "last_version_time"
+        }
+        kwargs["last_version_time"] = project.get_time_last_created_version()
+        return cls(**kwargs)
+
+    def get_time_last_created_version(self):
+        """
+        Returns creation time of latest version sorted by time of creation.
+
+        Returns:
+            (`arrow.Arrow`): Time of the latest created version or None,
+                if project doesn't have any version yet.
+        """
+        return self.last_version_time
+
+    # These don't need database, so share the implementation with project
+    create_version_objects = Project.create_version_objects
+    get_version_url = Project.get_version_url
+    is_version_filtered = Project.is_version_filtered
+    get_version_class = Project.get_version_class
+    get_version_context = Project.get_version_context
+
+
 class ProjectVersion(Base):
     """
     Models of version table representing version on project.
@@ -744,6 +1120,9 @@ class ProjectVersion(Base):
         version (sa.String): Raw version string as obtained from upstream.
         created_on (sa.DateTime): When the version was created in Anitya.
         commit_url (sa.String): URL to commit. Currently only used by GitHub backend.
+        sort_key (sa.LargeBinary): Key ordering the versions of the project
+            by the version scheme, see
+            :attr:`anitya.lib.versions.Version.stored_sort_key`.
         project (sa.orm.relationship): Back reference to project.
     """
 
@@ -757,11 +1136,59 @@ class ProjectVersion(Base):
     version = sa.Column(sa.String(50), primary_key=True)
     created_on = sa.Column(sa.DateTime, default=datetime.datetime.utcnow)
     commit_url = sa.Column(sa.String(200), nullable=True)
+    sort_key = sa.Column(sa.LargeBinary, nullable=True)
 
     project = sa.orm.relationship(
         "Project", backref=sa.orm.backref("versions_obj", cascade="all, delete-orphan")
     )
 
+    __table_args__ = (
+        sa.Index("ix_projects_versions_sort_key", "project_id", "sort_key"),
+    )
+
+    @classmethod
+    def newest(cls, session, project_id, limit=None):
+        """
+        Return the versions of the project ordered by the stored sort key.
+
+        The key is stored only for versions added or rebuilt by Anitya with
+        the sort keys, the existing versions must be rebuilt by
+        ``anitya/rebuild_sort_keys.py`` first. Versions without the key are
+        returned last.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): The database session.
+            project_id (int): Id of the project.
+            limit (int): Maximum number of versions returned.
+
+        Returns:
+            list: The versions sorted from newest to oldest.
+        """
+        query = (
+            session.query(cls)
+            .filter(cls.project_id == project_id)
+            .order_by(cls.sort_key.desc().nulls_last(), cls.version.desc())
+        )
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    def get_stored_sort_key(self, project=None):
+        """
+        Compute the stored sort key of the version.
+
+        Args:
+            project (Project): Project of the version, if it's not loaded.
+
+        Returns:
+            bytes: The key of the version.
+        """
+        project = project or self.project
+        version = project.get_version_class()(
+            version=self.version, context=project.get_version_context()
+        )
+        return version.stored_sort_key
+
     @property
     def pre_release(self):
         """
@@ -771,13 +1198,15 @@ class ProjectVersion(Base):
             (Boolean): Pre-release flag.
         """
 
+        version = self.project.get_version_object(self.version)
+        if version is not None:
+            return version.prerelease()
+
         version_class = self.project.get_version_class()
         version = version_class(
             version=self.version,
-            prefix=self.project.version_prefix,
-            pre_release_filter=self.project.pre_release_filter,
             created_on=self.created_on,
-            pattern=self.project.version_pattern,
+            context=self.project.get_version_context(),
             commit_url=self.commit_url,
         )
         return version.prerelease()
@@ -914,6 +1343,75 @@ class Run(Base):
         return query.first()
 
 
+class BackendRateLimit(Base):
+    """
+    Rate limit reached on backend. This is shared by every check service node.
+
+    Attributes:
+        backend (sa.String): Name of the rate limited backend.
+        reset_time (sa.DateTime): Time when the rate limit will be reset.
+    """
+
+    __tablename__ = "backend_rate_limits"
+
+    backend = sa.Column(sa.String(200), primary_key=True)
+    reset_time = sa.Column(sa.TIMESTAMP(timezone=True), nullable=False)
+
+    @classmethod
+    def active(cls, session, time):
+        """
+        Return backends that are rate limited at given time.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): The database session.
+            time (datetime.datetime): Time to compare reset time with.
+
+        Returns:
+            dict of str:`datetime.datetime`: Key is name of the rate limited backend
+            and value is time when the rate limit will be reset.
+        """
+        query = session.query(cls).filter(cls.reset_time > time)
+        return {
+            rate_limit.backend: arrow.get(rate_limit.reset_time).datetime
+            for rate_limit in query.all()
+        }
+
+    @classmethod
+    def set(cls, session, backend, reset_time):
+        """
+        Mark the backend as rate limited till reset time. If the backend is already
+        rate limited the later reset time is kept.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): The database session.
+            backend (str): Name of the rate limited backend.
+            reset_time (datetime.datetime): Time when the rate limit will be reset.
+        """
+        # Upsert is atomic, so the nodes can't race on inserting the same backend
+        if session.get_bind().dialect.name == "postgresql":
+            insert = postgresql.insert
+        else:
+            insert = sqlite.insert
+        table = cls.__table__
+        stmt = insert(table).values(
+            backend=backend, reset_time=arrow.get(reset_time).to("utc").datetime
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.backend],
+            set_={
+                "reset_time": sa.case(
+                    (
+                        stmt.excluded.reset_time > table.c.reset_time,
+                        stmt.excluded.reset_time,
+                    ),
+                    else_=table.c.reset_time,
+                )
+            },
+        )
+        session.execute(stmt)
+        session.commit()
+
+
 class GUID(TypeDecorator):
     """
     Platform-independent GUID type.
@@ -1149,3 +1647,11 @@ class ApiToken(Base):
         backref=sa.orm.backref("api_tokens", cascade="all, delete-orphan"),
     )
     description = sa.Column(sa.Text, nullable=True)
+
+
+sa.event.listen(
+    Base.metadata,
+    "before_create",
+    sa.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+search.install_shadow_tables(Base.metadata)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Indexed substring search of the text columns.
+
+On PostgreSQL the searched columns have ``pg_trgm`` GIN indexes declared on
+the models, which are used by the ``ILIKE`` conditions directly.
+
+SQLite doesn't have such indexes, so the searched columns are copied to FTS5
+shadow tables with the trigram tokenizer, which are kept in sync with the
+original table by triggers. The ``LIKE`` conditions are evaluated on the
+shadow table, which uses its index for patterns with at least three
+characters between the wildcards.
+"""
+
+import sqlalchemy as sa
+
+#: Searched columns of the tables, which have the FTS5 shadow table on SQLite
+SHADOW_COLUMNS = {
+    "projects": ("name", "logs"),
+    "packages": ("package_name",),
+}
+
+
+def shadow_table_name(table_name):
+    """
+    Name of the FTS5 shadow table of the table.
+
+    Args:
+        table_name (str): The name of the searched table.
+
+    Returns:
+        str: The name of the shadow table.
+    """
+    return f"{table_name}_search"
+
+
+def shadow_table_ddl(table_name, columns):
+    """
+    SQLite statements creating the FTS5 shadow table of the table.
+
+    The shadow table is an external content table, it stores only the index
+    and reads the values from the original table. The triggers keep the
+    index in sync and the last statement fills it with the existing rows.
+
+    Args:
+        table_name (str): The name of the searched table, it must have
+            an integer ``id`` primary key.
+        columns (tuple): The names of the searched columns.
+
+    Returns:
+        list: The SQL statements.
+    """
+    shadow = shadow_table_name(table_name)
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    delete = (
+        f"INSERT INTO {shadow}({shadow}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f"INSERT INTO {shadow}(rowid, {names}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE {shadow} USING fts5({names}, "
+        f"content='{table_name}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER {shadow}_insert AFTER INSERT ON {table_name} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER {shadow}_delete AFTER DELETE ON {table_name} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER {shadow}_update AFTER UPDATE OF {names} ON {table_name} "
+        f"BEGIN {delete} {insert} END",
+        f"INSERT INTO {shadow}({shadow}) VALUES ('rebuild')",
+    ]
+
+
+def install_shadow_tables(metadata):
+    """
+    Create and drop the shadow tables on SQLite together with the searched
+    tables.
+
+    Args:
+        metadata (sqlalchemy.MetaData): The metadata containing the tables.
+    """
+    for table_name, columns in SHADOW_COLUMNS.items():
+        table = metadata.tables[table_name]
+        for statement in shadow_table_ddl(table_name, columns):
+            sa.event.listen(
+                table, "after_create", sa.DDL(statement).execute_if(dialect="sqlite")
+            )
+        # The triggers are dropped together with the table
+        sa.event.listen(
+            table,
+            "before_drop",
+            sa.DDL(f"DROP TABLE IF EXISTS {shadow_table_name(table_name)}").execute_if(
+                dialect="sqlite"
+            ),
+        )
+
+
+def ilike(session, column, pattern):
+    """
+    Case insensitive ``LIKE`` condition on the column, which uses the index.
+
+    Args:
+        session (sqlalchemy.orm.Session): The session the condition is used in.
+        column (sqlalchemy.orm.InstrumentedAttribute): The searched column.
+        pattern (str): The ``LIKE`` pattern.
+
+    Returns:
+        sqlalchemy.sql.ColumnElement: The condition.
+    """
+    expression = column.expression
+    table_name = expression.table.name
+    if session.get_bind().dialect.name == "sqlite" and expression.name in (
+        SHADOW_COLUMNS.get(table_name, ())
+    ):
+        shadow = sa.table(
+            shadow_table_name(table_name),
+            sa.column("rowid"),
+            sa.column(expression.name),
+        )
+        # Trigram index is case insensitive, as is LIKE on SQLite
+        return expression.table.c.id.in_(
+            sa.select(shadow.c.rowid).where(shadow.c[expression.name].like(pattern))
+        )
+    return column.ilike(pattern)
@@ -27,8 +27,10 @@ import socket
 import sre_constants  # pylint: disable=W4901
 import urllib.request as urllib
 from datetime import timedelta
+from operator import attrgetter
 from typing import List
 from urllib.error import URLError
+from urllib.parse import urlparse
 
 import arrow
 from importlib import metadata
@@ -36,7 +38,10 @@ import requests
 import six
 
 from anitya.config import config as anitya_config
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib import http_validators
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
+from anitya.lib.host_limiter import host_limiter
+from anitya.lib.response_cache import response_cache
 from anitya.lib.versions import GLOBAL_DEFAULT, RpmVersion
 
 REGEX = anitya_config["DEFAULT_REGEX"]
@@ -118,7 +123,9 @@ class BaseBackend(object):
         text_regex = re.compile(r"^d.+\s(\S+)\s*$", re.I | re.M)
 
         if url_prefix != "":
-            resp = cls.call_url(url_prefix, last_change=last_change)
+            # Not modified listing can't be expanded, so validators are not used
+            with http_validators.suspended():
+                resp = cls.call_url(url_prefix, last_change=last_change)
             # When FTP server is called, Response object is not created
             # and we get binary string instead
             try:
@@ -135,7 +142,9 @@ class BaseBackend(object):
                     subdirs.append(subdir)
             if not subdirs:
                 return url
-            sorted_subdirs = sorted([RpmVersion(s) for s in subdirs])
+            sorted_subdirs = sorted(
+                [RpmVersion(s) for s in subdirs], key=attrgetter("sort_key")
+            )
             latest = sorted_subdirs[-1].version
 
             url = f"{url_prefix}{latest}/{url_suffix}"
@@ -297,7 +306,10 @@ class BaseBackend(object):
         querying what our intentions are.
 
         To prevent downloading the whole content of the page each time the url is called.
-        We are using If-modified-since header field.
+        We are using If-modified-since header field. When the project check is
+        tracked by :func:`anitya.lib.http_validators.track` and `last_change`
+        is provided, the ``ETag`` and ``Last-Modified`` of the previous response
+        are sent instead.
 
         Attributes:
             url (str): The url to request (get).
@@ -320,15 +332,57 @@ class BaseBackend(object):
         if "*" in url:
             url = cls.expand_subdirs(url, last_change)  # pragma: no cover
 
+        # Only callers asking for conditional request handle not modified response
+        conditional = last_change is not None and not (
+            url.startswith("ftp://") or url.startswith("ftps://")
+        )
+        if conditional:
+            # Replay ETag and Last-Modified of the previous response
+            http_validators.apply(url, headers)
+
+        if response_cache.enabled():
+            # Share the response with every project using the same URL in this run
+            resp = response_cache.fetch(
+                url, insecure, headers, lambda: cls._fetch_url(url, headers, insecure)
+            )
+        else:
+            resp = cls._fetch_url(url, headers, insecure)
+
+        if conditional:
+            # Response with the same body as in the last check is not modified
+            resp = http_validators.record(url, resp)
+
+        return resp
+
+    @classmethod
+    def _fetch_url(cls, url, headers, insecure):
+        """Send the request prepared by :meth:`call_url` to the upstream host.
+
+        Attributes:
+            url (str): The url to request (get).
+            headers (dict): Headers of the request.
+            insecure (bool): Flag for secure/insecure connection.
+
+        Returns:
+            In case of FTP url it returns binary encoded string
+            otherwise :obj:`requests.Response` object.
+        """
+        host = urlparse(url).hostname
+        # Raises HostUnavailableException without calling the host, if the host
+        # is failing or throttling the requests
+        host_limiter.acquire(host)
+
         if url.startswith("ftp://") or url.startswith("ftps://"):
             socket.setdefaulttimeout(30)
 
             req = urllib.Request(url)
             req.add_header("User-Agent", headers["User-Agent"])
             req.add_header("From", headers["From"])
+            failed = True
             try:
                 # Ignore this bandit issue, the url is checked above
                 resp = urllib.urlopen(req)  # nosec # pylint: disable=R1732
+                failed = False
                 content = resp.read().decode()
             except URLError as e:
                 raise AnityaPluginException(
@@ -338,6 +392,9 @@ class BaseBackend(object):
                 raise AnityaPluginException(
                     f"FTP response cannot be decoded with UTF-8: {url}"
                 ) from e
+            finally:
+                # The slot is released on any error
+                host_limiter.release(host, failed=failed)
 
             return content
 
@@ -353,11 +410,24 @@ class BaseBackend(object):
             # request is insecure. We don't get to pool connections for these
             # requests, but it stops us from making insecure requests by
             # accident. This can be removed in requests-3.0.
-            if insecure:
-                with requests.Session() as r_session:
-                    resp = r_session.get(url, headers=headers, timeout=60, verify=False)
-            else:
-                resp = http_session.get(url, headers=headers, timeout=60, verify=True)
+            try:
+                if insecure:
+                    with requests.Session() as r_session:
+                        resp = r_session.get(
+                            url, headers=headers, timeout=60, verify=False
+                        )
+                else:
+                    resp = http_session.get(
+                        url, headers=headers, timeout=60, verify=True
+                    )
+            except Exception:
+                host_limiter.release(host, failed=True)
+                raise
+            host_limiter.release(
+                host,
+                status_code=resp.status_code,
+                retry_after=resp.headers.get("Retry-After"),
+            )
 
             return resp
 
@@ -371,6 +441,8 @@ def get_versions_by_regex(url, regex, project, insecure=False):
     last_change = project.get_time_last_created_version()
     try:
         req = BaseBackend.call_url(url, last_change=last_change, insecure=insecure)
+    except HostUnavailableException:
+        raise
     except Exception as err:
         _log.debug("%s ERROR: %s", project.name, str(err))
         raise AnityaPluginException(
@@ -14,7 +14,7 @@ import logging
 from defusedxml import ElementTree as ET
 
 from anitya.lib.backends import REGEX, BaseBackend, get_versions_by_regex
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 _log = logging.getLogger(__name__)
 
@@ -80,6 +80,8 @@ class CpanBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as exc:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from exc
 
@@ -11,7 +11,7 @@ Authors:
 import six
 
 from anitya.lib.backends import REGEX, BaseBackend, get_versions_by_regex_for_text
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 DEFAULT_REGEX = 'href="(?:/files/)?([0-9][0-9.]+.*)/"'
 
@@ -64,6 +64,8 @@ class FolderBackend(BaseBackend):
 
         try:
             req = cls.call_url(url, last_change=last_change, insecure=project.insecure)
+        except HostUnavailableException:
+            raise
         except Exception as err:
             raise AnityaPluginException(
                 f'Could not call : "{url}" of "{project.name}", with error: {str(err)}'
@@ -10,6 +10,8 @@ Authors:
 """
 
 import logging
+import threading
+import time
 
 import arrow
 
@@ -36,6 +38,9 @@ class GithubBackend(BaseBackend):
         "https://github.com/fedora-infra/fedocal",
         "https://github.com/fedora-infra/pkgdb2",
     ]
+    # Batches registered by project id, see `register_batch`
+    _batches = {}
+    _batches_lock = threading.Lock()
 
     @classmethod
     def get_version_url(cls, project):
@@ -68,12 +73,47 @@ class GithubBackend(BaseBackend):
     @classmethod
     def _retrieve_versions(cls, owner, repo, project):
         query = prepare_query(owner, repo, project.releases_only)
+        json = cls._post_query(query, project.name)
 
+        versions = parse_json(json, project)
+        _log.debug("Retrieved versions: %s", versions)
+        return versions
+
+    @classmethod
+    def _post_query(cls, query, name):
+        """Send the GraphQL query to GitHub API using a token from pool.
+
+        Args:
+            query (str): GraphQL query.
+            name (str): Name used in error messages, usually name of the project.
+
+        Returns:
+            dict: Json response.
+
+        Raises:
+            AnityaPluginException: When the request failed.
+            RateLimitException: When the rate limit was reached.
+        """
+        # Token could be rate limited, try the next one from pool in such case
+        for _ in range(len(token_pool.get_tokens()) - 1):
+            token = token_pool.acquire()
+            try:
+                return cls._post_query_with_token(query, name, token)
+            except RateLimitException as err:
+                token_pool.exhaust(token, err.reset_time)
+
+        token = token_pool.acquire()
+        try:
+            return cls._post_query_with_token(query, name, token)
+        except RateLimitException as err:
+            token_pool.exhaust(token, err.reset_time)
+            raise
+
+    @classmethod
+    def _post_query_with_token(cls, query, name, token):
+        """Send the GraphQL query to GitHub API using the provided token."""
         try:
             headers = REQUEST_HEADERS.copy()
-            token = config["GITHUB_ACCESS_TOKEN"]
-            if not token:
-                raise AnityaPluginException("github_access_token not configured")
             headers["Authorization"] = f"bearer {token}"
             resp = http_session.post(
                 API_URL,
@@ -83,10 +123,9 @@ class GithubBackend(BaseBackend):
                 verify=True,
             )
         except Exception as err:
-            _log.debug("%s ERROR: %s", project.name, str(err))
+            _log.debug("%s ERROR: %s", name, str(err))
             raise AnityaPluginException(
-                f'Could not call : "{API_URL}" of "{project.name}", '
-                f"with error: {str(err)}"
+                f'Could not call : "{API_URL}" of "{name}", with error: {err}'
             ) from err
 
         if resp.ok:
@@ -97,41 +136,31 @@ class GithubBackend(BaseBackend):
                 )
                 raise RateLimitException(reset_time.isoformat())
             json = resp.json()
-        elif resp.status_code == 403:
+            token_pool.update(token, (json.get("data") or {}).get("rateLimit"))
+            return json
+        if resp.status_code == 403:
             _log.info("Github API ratelimit reached.")
             reset_time = arrow.Arrow.utcfromtimestamp(resp.headers["X-RateLimit-Reset"])
             raise RateLimitException(reset_time.isoformat())
-        else:
-            raise AnityaPluginException(
-                f"{project.name}: Server responded with status "
-                f'"{resp.status_code}": "{resp.reason}"'
-            )
-
-        versions = parse_json(json, project)
-        _log.debug("Retrieved versions: %s", versions)
-        return versions
+        raise AnityaPluginException(
+            f"{name}: Server responded with status "
+            f'"{resp.status_code}": "{resp.reason}"'
+        )
 
     @classmethod
-    def get_versions(cls, project):
-        """Method called to retrieve all the versions (that can be found)
-        of the projects provided, project that relies on the backend of
-        this plugin.
+    def _get_owner_repo(cls, project):
+        """Get owner and name of the repository of the project.
 
         Args:
             project (:obj:`anitya.db.models.Project`): Project object whose backend
                 corresponds to the current plugin.
 
         Returns:
-            :obj:`list`: A list of all the possible releases found
+            tuple: Owner and name of the repository.
 
         Raises:
-            AnityaPluginException: A
-                :obj:`anitya.lib.exceptions.AnityaPluginException` exception
-                when the versions cannot be retrieved correctly
-
+            AnityaPluginException: When the project is incorrectly set up.
         """
-        owner = None
-        repo = None
         url = cls.get_version_url(project)
         if url:
             url = url.replace("https://github.com/", "")
@@ -150,12 +179,18 @@ class GithubBackend(BaseBackend):
                 Can't parse owner and repo."""
             ) from err
 
-        versions = cls._retrieve_versions(owner, repo, project)
+        return owner, repo
 
+    @classmethod
+    def _filter_retrieved_versions(cls, versions, project):
+        """Filter versions retrieved for the project.
+
+        Raises:
+            AnityaPluginException: When no version was retrieved.
+        """
         if len(versions) == 0:
             raise AnityaPluginException(f"{project.name}: No upstream version found.")
 
-        # Filter retrieved versions
         filtered_versions = cls.filter_versions(
             [version["version"] for version in versions], project.version_filter
         )
@@ -163,6 +198,111 @@ class GithubBackend(BaseBackend):
             version for version in versions if version["version"] in filtered_versions
         ]
 
+    @classmethod
+    def get_versions(cls, project):
+        """Method called to retrieve all the versions (that can be found)
+        of the projects provided, project that relies on the backend of
+        this plugin.
+
+        Args:
+            project (:obj:`anitya.db.models.Project`): Project object whose backend
+                corresponds to the current plugin.
+
+        Returns:
+            :obj:`list`: A list of all the possible releases found
+
+        Raises:
+            AnityaPluginException: A
+                :obj:`anitya.lib.exceptions.AnityaPluginException` exception
+                when the versions cannot be retrieved correctly
+
+        """
+        # Project could be part of batch retrieved by single query
+        with cls._batches_lock:
+            batch = cls._batches.pop(project.id, None)
+        if batch:
+            return batch.get_versions(project)
+
+        owner, repo = cls._get_owner_repo(project)
+        versions = cls._retrieve_versions(owner, repo, project)
+
+        return cls._filter_retrieved_versions(versions, project)
+
+    @classmethod
+    def get_versions_batch(cls, projects):
+        """Retrieve versions of multiple projects using a single GraphQL query.
+
+        Args:
+            projects (list): Projects or project snapshots whose backend
+                corresponds to the current plugin.
+
+        Returns:
+            dict: Key is id of the project and value is either list of versions
+            (the same as returned by :meth:`get_versions`) or exception raised when
+            retrieving versions of the project.
+        """
+        results = {}
+        repositories = []
+        for project in projects:
+            try:
+                owner, repo = cls._get_owner_repo(project)
+            except AnityaPluginException as err:
+                results[project.id] = err
+                continue
+            repositories.append((f"repo{len(repositories)}", owner, repo, project))
+
+        if not repositories:
+            return results
+
+        query = prepare_batch_query(
+            [
+                (alias, owner, repo, project.releases_only)
+                for alias, owner, repo, project in repositories
+            ]
+        )
+        try:
+            json = cls._post_query(
+                query, ", ".join(project.name for *_, project in repositories)
+            )
+        except (AnityaPluginException, RateLimitException) as err:
+            for *_, project in repositories:
+                results[project.id] = err
+            return results
+
+        for alias, _owner, _repo, project in repositories:
+            try:
+                versions = parse_json(get_alias_json(json, alias), project)
+                _log.debug("Retrieved versions: %s", versions)
+                results[project.id] = cls._filter_retrieved_versions(versions, project)
+            except AnityaPluginException as err:
+                results[project.id] = err
+
+        return results
+
+    @classmethod
+    def register_batch(cls, projects):
+        """Register batch of projects, so the versions of all of them are retrieved
+        by a single query, when :meth:`get_versions` is called for any of them.
+
+        Args:
+            projects (list): Projects or project snapshots whose backend
+                corresponds to the current plugin.
+
+        Returns:
+            GithubBatch: The registered batch.
+        """
+        batch = GithubBatch(cls, projects)
+        with cls._batches_lock:
+            for project in projects:
+                cls._batches[project.id] = batch
+        return batch
+
+    @classmethod
+    def clear_batches(cls):
+        """Forget every registered batch."""
+        with cls._batches_lock:
+            cls._batches.clear()
+
     @classmethod
     def check_feed(cls):  # pragma: no cover
         """Method called to retrieve the latest uploads to a given backend,
@@ -182,6 +322,262 @@ class GithubBackend(BaseBackend):
         raise NotImplementedError()
 
 
+class TokenBudget:
+    """Rate limit budget of a single GitHub access token.
+
+    Attributes:
+        token (str): The access token.
+        limit (int): Number of points available in rate limit window.
+        remaining (int): Number of points remaining in current window,
+            None if not known yet.
+        reset_at (float): Timestamp when the window will be reset.
+        cost (int): Cost of the last query.
+        requests (int): Number of requests sent with this token.
+        waited (float): Total number of seconds requests were delayed by pacing.
+        next_request (float): Timestamp when the next request could be sent.
+    """
+
+    __slots__ = (
+        "token",
+        "limit",
+        "remaining",
+        "reset_at",
+        "cost",
+        "requests",
+        "waited",
+        "next_request",
+    )
+
+    def __init__(self, token):
+        self.token = token
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.cost = 1
+        self.requests = 0
+        self.waited = 0.0
+        self.next_request = 0.0
+
+    def interval(self, now):
+        """Return number of seconds between requests needed to spread the
+        remaining budget evenly till the reset of the window."""
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        window = max(self.reset_at - now, 0.0)
+        return window * self.cost / max(self.remaining, 1)
+
+
+class TokenPool:
+    """Pool of GitHub access tokens shared by every check.
+
+    Tokens are taken from `GITHUB_ACCESS_TOKENS` configuration, or from
+    `GITHUB_ACCESS_TOKEN` if the list is empty. Every request is sent with
+    the token that could be used soonest. If `GITHUB_PACING` is enabled
+    the requests are delayed, so the remaining budget of each token is spread
+    evenly till the reset of its rate limit window.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._budgets = {}
+
+    def get_tokens(self):
+        """Return configured tokens."""
+        tokens = config.get("GITHUB_ACCESS_TOKENS") or [
+            config.get("GITHUB_ACCESS_TOKEN")
+        ]
+        return [token for token in tokens if token]
+
+    def _get_budget(self, token):
+        if token not in self._budgets:
+            self._budgets[token] = TokenBudget(token)
+        return self._budgets[token]
+
+    def acquire(self):
+        """Get token for the next request, waits if the request needs to be paced.
+
+        Returns:
+            str: The access token.
+
+        Raises:
+            AnityaPluginException: When no token is configured.
+            RateLimitException: When every token is exhausted or the request
+                would need to wait longer than `GITHUB_PACING_MAX_WAIT` seconds.
+        """
+        tokens = self.get_tokens()
+        if not tokens:
+            raise AnityaPluginException("github_access_token not configured")
+        pacing = config.get("GITHUB_PACING")
+
+        with self._lock:
+            now = time.time()
+            budgets = [self._get_budget(token) for token in tokens]
+            for budget in budgets:
+                if budget.reset_at is not None and budget.reset_at <= now:
+                    # New window started
+                    budget.remaining = budget.limit
+                    budget.reset_at = None
+            available = [
+                budget
+                for budget in budgets
+                if budget.remaining is None or budget.remaining > 0
+            ]
+            if not available:
+                reset_at = min(budget.reset_at for budget in budgets)
+                raise RateLimitException(arrow.get(reset_at).isoformat())
+
+            budget = min(
+                available,
+                key=lambda budget: (
+                    budget.next_request if pacing else 0,
+                    -(budget.remaining if budget.remaining is not None else 1e9),
+                ),
+            )
+            delay = 0.0
+            if pacing:
+                delay = max(budget.next_request - now, 0.0)
+                if delay > config.get("GITHUB_PACING_MAX_WAIT"):
+                    raise RateLimitException(arrow.get(now + delay).isoformat())
+                budget.next_request = max(budget.next_request, now) + budget.interval(
+                    now
+                )
+            budget.requests += 1
+            budget.waited += delay
+
+        if delay:
+            _log.debug("Pacing GitHub request for %.2f seconds", delay)
+            time.sleep(delay)
+
+        return budget.token
+
+    def update(self, token, rate_limit):
+        """Update budget of the token from `rateLimit` block of the response.
+
+        Args:
+            token (str): The token used for the request.
+            rate_limit (dict): The `rateLimit` block, could be None.
+        """
+        if not rate_limit:
+            return
+        with self._lock:
+            budget = self._get_budget(token)
+            budget.limit = rate_limit.get("limit", budget.limit)
+            budget.remaining = rate_limit.get("remaining", budget.remaining)
+            budget.cost = rate_limit.get("cost") or budget.cost
+            if rate_limit.get("resetAt"):
+                budget.reset_at = arrow.get(rate_limit["resetAt"]).timestamp()
+
+    def exhaust(self, token, reset_time):
+        """Mark token as exhausted till reset time.
+
+        Args:
+            token (str): The exhausted token.
+            reset_time (arrow.Arrow): Time when the rate limit will be reset.
+        """
+        with self._lock:
+            budget = self._get_budget(token)
+            budget.remaining = 0
+            budget.reset_at = reset_time.timestamp()
+
+    def metrics(self):
+        """Return rate limit budget of every configured token.
+
+        Returns:
+            list of dict: Budget of every token, only the last four characters
+            of the token are included.
+        """
+        with self._lock:
+            return [
+                {
+                    "token": f"...{budget.token[-4:]}",
+                    "limit": budget.limit,
+                    "remaining": budget.remaining,
+                    "reset_at": (
+                        arrow.get(budget.reset_at).isoformat()
+                        if budget.reset_at is not None
+                        else None
+                    ),
+                    "cost": budget.cost,
+                    "requests": budget.requests,
+                    "waited": round(budget.waited, 2),
+                }
+                for budget in (self._get_budget(token) for token in self.get_tokens())
+            ]
+
+    def clear(self):
+        """Forget budgets of every token."""
+        with self._lock:
+            self._budgets.clear()
+
+
+#: Token pool shared by every GitHub check
+token_pool = TokenPool()
+
+
+class GithubBatch:
+    """Batch of projects whose versions are retrieved by a single GraphQL query.
+
+    The query is sent when the versions of any project in batch are requested
+    for the first time, the other projects are using the stored result.
+
+    Attributes:
+        backend (GithubBackend): The backend class.
+        projects (list): Projects in the batch.
+    """
+
+    def __init__(self, backend, projects):
+        self.backend = backend
+        self.projects = projects
+        self._lock = threading.Lock()
+        self._results = None
+
+    def get_versions(self, project):
+        """Return the versions retrieved for the project.
+
+        Args:
+            project (:obj:`anitya.db.models.Project`): Project in the batch.
+
+        Returns:
+            :obj:`list`: A list of all the possible releases found
+
+        Raises:
+            AnityaPluginException: When the versions couldn't be retrieved.
+            RateLimitException: When the rate limit was reached.
+        """
+        with self._lock:
+            if self._results is None:
+                self._results = self.backend.get_versions_batch(self.projects)
+
+        result = self._results[project.id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def get_alias_json(json, alias):
+    """Extract response for single aliased repository from batch response.
+
+    Args:
+        json (dict): Json response to batch query.
+        alias (str): Alias of the repository.
+
+    Returns:
+        dict: Json in the same format as response to query for single repository,
+        which could be parsed by :func:`parse_json`.
+    """
+    errors = [
+        error
+        for error in json.get("errors", [])
+        if not error.get("path") or error["path"][0] == alias
+    ]
+    data = json.get("data") or {}
+    if errors:
+        return {"errors": errors}
+    if not data.get(alias):
+        return {"errors": [{"type": "NOT_FOUND", "message": "No data returned"}]}
+    return {"data": {"repository": data[alias], "rateLimit": data.get("rateLimit")}}
+
+
 def parse_json(json, project):
     """Function for parsing json response
 
@@ -244,18 +640,8 @@ def parse_json(json, project):
     return versions
 
 
-def prepare_query(owner, repo, releases_only):
-    """Function for preparing GraphQL query for specified repository
-
-    Args:
-        owner (str): Owner of the repository.
-        repo (str): Repository name.
-        releases_only (bool): Fetch releases instead of tags.
-
-    Returns:
-        str: GraphQL query.
-
-    """
+def _prepare_repository_fragment(owner, repo, releases_only, alias=None):
+    """Prepare GraphQL fragment querying tags or releases of the repository."""
     tag_fragment = "name target { commitUrl }"
 
     fetch_args = {}
@@ -278,9 +664,10 @@ def prepare_query(owner, repo, releases_only):
         f"{fetch_obj} ({', '.join(f'{k}: {v}' for k, v in fetch_args.items())})"
     )
 
-    query = f"""
-{{
-    repository(owner: "{owner}", name: "{repo}") {{
+    field = f"{alias}: repository" if alias else "repository"
+
+    return f"""
+    {field}(owner: "{owner}", name: "{repo}") {{
         {fetch_fragment} {{
             totalCount
             edges {{
@@ -289,9 +676,50 @@ def prepare_query(owner, repo, releases_only):
                 }}
             }}
         }}
-    }}
+    }}"""  # noqa: E202
+
+
+def prepare_query(owner, repo, releases_only):
+    """Function for preparing GraphQL query for specified repository
+
+    Args:
+        owner (str): Owner of the repository.
+        repo (str): Repository name.
+        releases_only (bool): Fetch releases instead of tags.
+
+    Returns:
+        str: GraphQL query.
+
+    """
+    return _wrap_query(_prepare_repository_fragment(owner, repo, releases_only))
+
+
+def prepare_batch_query(repositories):
+    """Function for preparing GraphQL query for multiple repositories
+
+    Args:
+        repositories (list): List of tuples (alias, owner, repository name,
+            releases_only). Response for each repository is returned under alias.
+
+    Returns:
+        str: GraphQL query.
+
+    """
+    return _wrap_query(
+        "".join(
+            _prepare_repository_fragment(owner, repo, releases_only, alias)
+            for alias, owner, repo, releases_only in repositories
+        )
+    )
+
+
+def _wrap_query(fragments):
+    """Add rate limit information to repository fragments."""
+    query = f"""
+{{{fragments}
     rateLimit {{
         limit
+        cost
         remaining
         resetAt
     }}
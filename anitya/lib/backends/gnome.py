@@ -12,6 +12,7 @@ Authors:
 import logging
 
 from anitya.lib.backends import BaseBackend, get_versions_by_regex
+from anitya.lib.exceptions import HostUnavailableException
 
 REGEX = 'href="([0-9][0-9.]*)/"'
 
@@ -97,6 +98,10 @@ class GnomeBackend(BaseBackend):
         try:
             # First try to get the version by using the cache.json file
             output = use_gnome_cache_json(project)
+        except HostUnavailableException as err:
+            # The regex fallback calls the same host
+            _log.info("%s: %s", project.name, err)
+            raise
         except Exception as err:
             _log.exception(err)
             output = use_gnome_regex(project)
@@ -11,7 +11,7 @@ Authors:
 import six
 
 from anitya.lib.backends import REGEX, BaseBackend, get_versions_by_regex_for_text
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 DEFAULT_REGEX = 'href="([0-9][0-9.]*)/"'
 
@@ -62,6 +62,8 @@ class GnuBackend(BaseBackend):
 
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(
                 f'Could not call : "{url}" of "{project.name}"'
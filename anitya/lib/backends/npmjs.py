@@ -10,7 +10,7 @@ Authors:
 """
 
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 class NpmjsBackend(BaseBackend):
@@ -45,6 +45,8 @@ class NpmjsBackend(BaseBackend):
 
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -100,6 +102,8 @@ class NpmjsBackend(BaseBackend):
 
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -139,6 +143,8 @@ class NpmjsBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
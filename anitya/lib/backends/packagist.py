@@ -10,7 +10,7 @@ Authors:
 """
 
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 class PackagistBackend(BaseBackend):
@@ -71,6 +71,8 @@ class PackagistBackend(BaseBackend):
         last_change = project.get_time_last_created_version()
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as exc:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from exc
 
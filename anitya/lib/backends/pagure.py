@@ -12,7 +12,7 @@ Authors:
 from __future__ import print_function
 
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 class PagureBackend(BaseBackend):
@@ -74,6 +74,8 @@ class PagureBackend(BaseBackend):
         last_change = project.get_time_last_created_version()
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}: {str(err)}") from err
 
@@ -12,13 +12,15 @@ Authors:
 
 from anitya.lib import xml2dict
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 def _get_versions(url):
     """Retrieve the versions for the provided url."""
     try:
         req = PearBackend.call_url(url)
+    except HostUnavailableException:
+        raise
     except Exception as err:  # pragma: no cover
         raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -120,6 +122,8 @@ class PearBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -11,13 +11,15 @@ Authors:
 
 from anitya.lib import xml2dict
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 def _get_versions(url):
     """Retrieve the versions for the provided url."""
     try:
         req = PeclBackend.call_url(url)
+    except HostUnavailableException:
+        raise
     except Exception as exc:  # pragma: no cover
         raise AnityaPluginException(f"Could not contact {url}") from exc
 
@@ -120,6 +122,8 @@ class PeclBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as exc:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from exc
 
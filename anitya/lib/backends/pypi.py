@@ -12,7 +12,7 @@ Authors:
 
 from anitya.lib import xml2dict
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 class PypiBackend(BaseBackend):
@@ -42,6 +42,8 @@ class PypiBackend(BaseBackend):
         last_change = project.get_time_last_created_version()
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -95,6 +97,8 @@ class PypiBackend(BaseBackend):
         last_change = project.get_time_last_created_version()
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -144,6 +148,8 @@ class PypiBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as err:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from err
 
@@ -11,7 +11,7 @@ Authors:
 """
 
 from anitya.lib.backends import BaseBackend
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 
 
 class RubygemsBackend(BaseBackend):
@@ -59,6 +59,8 @@ class RubygemsBackend(BaseBackend):
         last_change = project.get_time_last_created_version()
         try:
             req = cls.call_url(url, last_change=last_change)
+        except HostUnavailableException:
+            raise
         except Exception as exc:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from exc
 
@@ -93,6 +95,8 @@ class RubygemsBackend(BaseBackend):
 
         try:
             response = cls.call_url(url)
+        except HostUnavailableException:
+            raise
         except Exception as exc:  # pragma: no cover
             raise AnityaPluginException(f"Could not contact {url}") from exc
 
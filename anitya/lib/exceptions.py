@@ -144,3 +144,32 @@ class RateLimitException(AnityaException):
 
     def __str__(self):
         return f'Rate limit was reached. Will be reset in "{str(self.reset_time)}".'
+
+
+class HostUnavailableException(RateLimitException):
+    """
+    Raised when the requests to host are stopped, because the host is failing
+    or throttling the requests.
+
+    Attributes:
+        host (str): The unavailable host.
+        reset_time (`arrow.Arrow`): Time when the host could be called again.
+    """
+
+    def __init__(self, host, reset_time):
+        """
+        Constructor.
+
+        Arguments:
+            host (str): The unavailable host.
+            reset_time (str): Time when the host could be called again
+                (UTC time encoded in ISO-8601).
+        """
+        super().__init__(reset_time)
+        self.host = host
+
+    def __str__(self):
+        return (
+            f'Host "{self.host}" is unavailable. '
+            f'Will be called again in "{str(self.reset_time)}".'
+        )
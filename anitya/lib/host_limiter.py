@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Limiter of requests sent to upstream hosts.
+
+Every host has its own window of requests in flight, which is adjusted
+using AIMD (additive increase, multiplicative decrease). The window is halved
+when the host throttles the requests (HTTP 429 or 503) and the host is not
+called till the time provided in ``Retry-After`` header or till the end of
+exponential backoff. Every successful response increases the window again,
+up to the ``HOST_MAX_IN_FLIGHT`` configuration.
+
+Consecutive failures open the circuit of the host, no request is sent to the
+host till ``HOST_CIRCUIT_TIMEOUT`` passes. After that a single probe request
+is let through (half-open circuit), which either closes the circuit again
+or opens it for another period.
+"""
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import arrow
+
+from anitya.config import config
+from anitya.lib.exceptions import HostUnavailableException
+
+_log = logging.getLogger(__name__)
+
+#: Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+#: Status codes sent by hosts throttling the requests
+THROTTLE_STATUS_CODES = frozenset((429, 503))
+
+
+def parse_retry_after(value):
+    """Parse the value of ``Retry-After`` header.
+
+    Args:
+        value (str): Number of seconds or HTTP date.
+
+    Returns:
+        float: Number of seconds to wait, None if the value is not valid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class HostState:
+    """State of requests sent to a single host.
+
+    Attributes:
+        window (float): Number of requests allowed in flight.
+        in_flight (int): Number of requests currently in flight.
+        backoff (float): Current backoff in seconds, 0 if not throttled.
+        not_before (float): Timestamp before which the host is not called.
+        failures (int): Number of consecutive failures.
+        circuit (str): State of the circuit.
+        probing (bool): True if the probe request of half-open circuit is in flight.
+        requests (int): Number of requests sent to host.
+        throttled (int): Number of throttled requests.
+        rejected (int): Number of requests rejected without calling the host.
+    """
+
+    __slots__ = (
+        "window",
+        "in_flight",
+        "backoff",
+        "not_before",
+        "failures",
+        "circuit",
+        "probing",
+        "requests",
+        "throttled",
+        "rejected",
+    )
+
+    def __init__(self, window):
+        self.window = float(window)
+        self.in_flight = 0
+        self.backoff = 0.0
+        self.not_before = 0.0
+        self.failures = 0
+        self.circuit = CLOSED
+        self.probing = False
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+
+
+class HostLimiter:
+    """Limiter of requests shared by every backend.
+
+    The limiter is disabled when ``HOST_MAX_IN_FLIGHT`` is set to 0.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._hosts = {}
+
+    @staticmethod
+    def enabled():
+        """Return True if the limiter is enabled in configuration."""
+        return config.get("HOST_MAX_IN_FLIGHT", 0) > 0
+
+    def _get_state(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = HostState(config["HOST_MAX_IN_FLIGHT"])
+        return self._hosts[host]
+
+    def _reject(self, host, state, reset_at):
+        state.rejected += 1
+        raise HostUnavailableException(host, arrow.get(reset_at).isoformat())
+
+    def acquire(self, host):
+        """Wait for a free slot of the host.
+
+        Args:
+            host (str): The host which will be called.
+
+        Raises:
+            HostUnavailableException: When the circuit of the host is open or
+                the host is throttling the requests.
+        """
+        if not self.enabled():
+            return
+        with self._condition:
+            state = self._get_state(host)
+            while True:
+                now = time.time()
+                if state.circuit == OPEN:
+                    if now < state.not_before:
+                        self._reject(host, state, state.not_before)
+                    _log.info("Circuit of %s is half-open, probing the host", host)
+                    state.circuit = HALF_OPEN
+                if state.circuit == HALF_OPEN:
+                    if state.probing:
+                        self._reject(host, state, now + config["HOST_CIRCUIT_TIMEOUT"])
+                    state.probing = True
+                    break
+                if now < state.not_before:
+                    self._reject(host, state, state.not_before)
+                if state.in_flight < max(int(state.window), 1):
+                    break
+                self._condition.wait()
+            state.in_flight += 1
+            state.requests += 1
+
+    def release(self, host, status_code=None, retry_after=None, failed=False):
+        """Release the slot of the host and record the result of the request.
+
+        Args:
+            host (str): The host which was called.
+            status_code (int, optional): HTTP status code of the response.
+            retry_after (str, optional): Value of ``Retry-After`` header.
+            failed (bool, optional): True if the request failed without
+                a response, for example on connection error or timeout.
+        """
+        if not self.enabled():
+            return
+        with self._condition:
+            state = self._get_state(host)
+            state.in_flight = max(state.in_flight - 1, 0)
+            now = time.time()
+            if status_code in THROTTLE_STATUS_CODES:
+                self._throttle(host, state, now, parse_retry_after(retry_after))
+            elif failed or (status_code is not None and status_code >= 500):
+                self._fail(host, state, now)
+            else:
+                self._succeed(host, state)
+            self._condition.notify_all()
+
+    def _throttle(self, host, state, now, retry_after):
+        state.throttled += 1
+        state.window = max(state.window / 2, 1.0)
+        state.backoff = min(
+            max(state.backoff * 2, 1.0), float(config["HOST_BACKOFF_MAX"])
+        )
+        delay = retry_after if retry_after is not None else state.backoff
+        state.not_before = max(state.not_before, now + delay)
+        _log.info(
+            "%s is throttling requests, window %.1f, waiting %.1f seconds",
+            host,
+            state.window,
+            delay,
+        )
+        if state.circuit == HALF_OPEN:
+            self._open(host, state, now)
+
+    def _fail(self, host, state, now):
+        state.failures += 1
+        threshold = config["HOST_FAILURE_THRESHOLD"]
+        if state.circuit == HALF_OPEN or (threshold and state.failures >= threshold):
+            self._open(host, state, now)
+
+    def _succeed(self, host, state):
+        if state.circuit == HALF_OPEN:
+            _log.info("Circuit of %s is closed", host)
+        state.circuit = CLOSED
+        state.probing = False
+        state.failures = 0
+        state.backoff = 0.0
+        state.window = min(
+            state.window + 1 / state.window, float(config["HOST_MAX_IN_FLIGHT"])
+        )
+
+    def _open(self, host, state, now):
+        _log.info("Circuit of %s is open after %s failures", host, state.failures)
+        state.circuit = OPEN
+        state.probing = False
+        state.not_before = max(state.not_before, now + config["HOST_CIRCUIT_TIMEOUT"])
+
+    def metrics(self):
+        """Return state of every host, which was called.
+
+        Returns:
+            dict: State of the host as dict, keyed by host.
+        """
+        with self._condition:
+            return {
+                host: {
+                    "circuit": state.circuit,
+                    "window": round(state.window, 2),
+                    "failures": state.failures,
+                    "requests": state.requests,
+                    "throttled": state.throttled,
+                    "rejected": state.rejected,
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def clear(self):
+        """Forget state of every host."""
+        with self._condition:
+            self._hosts.clear()
+
+
+#: Limiter shared by every backend
+host_limiter = HostLimiter()
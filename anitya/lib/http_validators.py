@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+HTTP validators (``ETag`` and ``Last-Modified``) used for conditional requests.
+
+Validators are stored per project and per URL in the
+:attr:`anitya.db.models.Project.http_validators` column. The check of the
+project is tracked by :func:`track`, every request sent by
+:meth:`anitya.lib.backends.BaseBackend.call_url` during the check replays
+the validators stored for the URL and records the validators of the response.
+The recorded validators are stored only when the check is successful, so
+the project is never stuck on ``304 Not Modified`` response of a page which
+wasn't processed.
+
+Digest of the body is stored together with the validators. Many servers
+ignore the conditional headers, when such server sends the same body again,
+the response is replaced by ``304 Not Modified`` response, so the backend
+doesn't parse the page again.
+"""
+
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import requests
+
+_local = threading.local()
+
+
+class ValidatorScope:
+    """Validators of a single project check.
+
+    Attributes:
+        stored (dict): Validators stored in the project, keyed by URL.
+        received (dict): Validators received during the check, keyed by URL.
+        requested (list): URLs requested during the check.
+        unchanged (set): URLs which weren't modified since the last check.
+    """
+
+    def __init__(self, stored):
+        self.stored = dict(stored or {})
+        self.received = {}
+        self.requested = []
+        self.unchanged = set()
+
+    def is_not_modified(self):
+        """Return True if none of the URLs requested during the check was modified.
+
+        Returns:
+            bool: False if nothing was requested or some URL was modified.
+        """
+        return bool(self.requested) and all(
+            url in self.unchanged for url in self.requested
+        )
+
+    def result(self):
+        """Return validators which should be stored in the project.
+
+        Only validators of the URLs requested during this check are kept.
+
+        Returns:
+            dict: Validators keyed by URL.
+        """
+        result = {}
+        for url in self.requested:
+            validators = self.received.get(url, self.stored.get(url))
+            if validators:
+                result[url] = validators
+        return result
+
+
+@contextmanager
+def track(stored):
+    """Track validators of requests sent by the current thread.
+
+    Args:
+        stored (dict): Validators stored in the project, could be None.
+
+    Yields:
+        ValidatorScope: The validators of the check.
+    """
+    scope = ValidatorScope(stored)
+    previous = getattr(_local, "scope", None)
+    _local.scope = scope
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
+
+
+@contextmanager
+def suspended():
+    """Send requests of the current thread without validators."""
+    previous = getattr(_local, "scope", None)
+    _local.scope = None
+    try:
+        yield
+    finally:
+        _local.scope = previous
+
+
+def apply(url, headers):
+    """Add the validators stored for URL to headers of the request.
+
+    Args:
+        url (str): The requested URL.
+        headers (dict): Headers of the request, changed in place.
+    """
+    scope = getattr(_local, "scope", None)
+    if scope is None:
+        return
+    if url not in scope.requested:
+        scope.requested.append(url)
+    validators = scope.stored.get(url)
+    if not validators:
+        return
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-modified-since"] = validators["last_modified"]
+
+
+def record(url, response):
+    """Record the validators of the response.
+
+    When the body of the response is the same as the body received in the last
+    successful check, the response is replaced by not modified response.
+
+    Args:
+        url (str): The requested URL.
+        response (requests.Response): The response.
+
+    Returns:
+        requests.Response: The response, which should be used by the caller.
+    """
+    scope = getattr(_local, "scope", None)
+    if scope is None:
+        return response
+    if response.status_code == 304:
+        scope.unchanged.add(url)
+        return response
+    if response.status_code != 200:
+        return response
+
+    validators = {}
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    validators["digest"] = hashlib.sha256(response.content).hexdigest()
+    scope.received[url] = validators
+
+    if validators["digest"] != scope.stored.get(url, {}).get("digest"):
+        return response
+    scope.unchanged.add(url)
+    not_modified = requests.Response()
+    not_modified.status_code = 304
+    not_modified.url = response.url
+    not_modified.headers = response.headers
+    not_modified._content = b""  # pylint: disable=W0212
+    return not_modified
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Cache of responses shared by every project checked during a single run.
+
+The cache is enabled only for the duration of the check run. Concurrent
+requests of the same URL are coalesced, only the first request calls
+the upstream and the others wait for its response. Full responses are kept
+in a LRU cache keyed by URL and the request headers the response could vary
+on, so the response is returned only for following requests sent with
+the same conditional, content negotiation and authorization headers.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+_log = logging.getLogger(__name__)
+
+#: Request headers which could change the response of the upstream
+VARY_HEADERS = (
+    "accept",
+    "authorization",
+    "if-modified-since",
+    "if-none-match",
+)
+
+
+def _request_key(url, insecure, headers):
+    """Return the key identifying the response of the request."""
+    headers = {name.lower(): value for name, value in headers.items()}
+    return (url, insecure) + tuple(headers.get(name) for name in VARY_HEADERS)
+
+
+def _is_cacheable(response):
+    """Return True if the response could be shared with other projects."""
+    # FTP content is returned as string
+    if isinstance(response, str):
+        return True
+    return getattr(response, "status_code", None) == 200
+
+
+class ResponseCache:
+    """Run-scoped cache of responses with single-flight deduplication.
+
+    Attributes:
+        max_size (int): Maximum number of cached responses, the cache is
+            disabled when set to 0.
+        hits (int): Number of responses served from the cache.
+        misses (int): Number of requests sent upstream.
+        coalesced (int): Number of requests which waited for the same request
+            already in flight.
+        evictions (int): Number of responses evicted from the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()
+        self._flights = {}
+        self.max_size = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def enabled(self):
+        """Return True if the cache is enabled."""
+        return self.max_size > 0
+
+    def start(self, max_size):
+        """Start a new run with empty cache.
+
+        Args:
+            max_size (int): Maximum number of cached responses.
+        """
+        with self._lock:
+            self._responses.clear()
+            self.max_size = max_size
+            self.hits = 0
+            self.misses = 0
+            self.coalesced = 0
+            self.evictions = 0
+
+    def stop(self):
+        """Disable the cache and drop every cached response at the end of run."""
+        with self._lock:
+            self._responses.clear()
+            self.max_size = 0
+
+    def fetch(self, url, insecure, headers, fetch):
+        """Return the response of the URL from cache or fetch it.
+
+        Args:
+            url (str): The requested URL.
+            insecure (bool): Flag for secure/insecure connection.
+            headers (dict): Headers of the request.
+            fetch (callable): Function sending the request upstream.
+
+        Returns:
+            The response returned by `fetch`.
+        """
+        key = _request_key(url, insecure, headers)
+        with self._lock:
+            if key in self._responses:
+                self._responses.move_to_end(key)
+                self.hits += 1
+                return self._responses[key]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return flight.result()
+
+        try:
+            response = fetch()
+        except Exception as err:
+            with self._lock:
+                del self._flights[key]
+            flight.set_exception(err)
+            raise
+
+        with self._lock:
+            del self._flights[key]
+            if self.max_size and _is_cacheable(response):
+                self._responses[key] = response
+                self._responses.move_to_end(key)
+                while len(self._responses) > self.max_size:
+                    self._responses.popitem(last=False)
+                    self.evictions += 1
+        flight.set_result(response)
+        return response
+
+    def metrics(self):
+        """Return counters of the current run.
+
+        Returns:
+            dict: Number of cached responses, hits, misses, coalesced requests,
+            evictions and the hit rate.
+        """
+        with self._lock:
+            served = self.hits + self.coalesced
+            total = served + self.misses
+            return {
+                "size": len(self._responses),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": round(served / total, 3) if total else 0.0,
+            }
+
+
+#: Cache shared by every backend
+response_cache = ResponseCache()
@@ -20,16 +20,18 @@
 """A collection of utilities for the Anitya library."""
 
 import logging
+import threading
+import time
 
 import arrow
 from fedora_messaging import api
 from fedora_messaging import exceptions as fm_exceptions
 from fedora_messaging import message as fm_message
-from sqlalchemy import exc, orm, select
+from sqlalchemy import bindparam, exc, insert, orm, select, update
 
 from anitya.db import models
 
-from . import exceptions, plugins
+from . import exceptions, http_validators, plugins
 
 _log = logging.getLogger(__name__)
 
@@ -58,11 +60,244 @@ def publish_message(topic, project=None, distro=None, message=None):  # pragma:
         _log.error(str(err))
 
 
-def check_project_release(project, session, test=False):
+class ResultSink:
+    """
+    Collects results of successful checks and writes them to database in batches.
+
+    Project changes are written using a single executemany UPDATE and new
+    versions using a single bulk INSERT. Messages about new versions are
+    published after the batch is committed, in the same order the results
+    were added.
+
+    Attributes:
+        session (sqlalchemy.orm.scoping.scoped_session): The database session
+            used to write the batch.
+        batch_size (int): Number of results which triggers the write.
+        interval (int): Number of seconds after which the collected results
+            are written, even if the batch is not full.
+    """
+
+    #: Project columns written by the sink
+    PROJECT_COLUMNS = (
+        "last_check",
+        "next_check",
+        "logs",
+        "check_successful",
+        "error_counter",
+        "latest_version",
+        "latest_stable_version",
+        "latest_version_created_on",
+        "versions_count",
+        "http_validators",
+    )
+
+    def __init__(self, session, batch_size, interval):
+        self.session = session
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._results = []
+        self._last_flush = time.monotonic()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._results)
+
+    def add(self, project, versions, messages):
+        """
+        Add result of the check. The values are copied, so the caller should
+        discard the changes from its session afterwards and then call
+        :meth:`flush_if_ready`. The batch is never written from here, because
+        the session could still contain the added versions.
+
+        Args:
+            project (anitya.db.models.Project): The checked project.
+            versions (list of anitya.db.models.ProjectVersion): New versions
+                of the project.
+            messages (list of dict): Keyword arguments for :func:`publish_message`
+                calls that should be sent once the result is written.
+        """
+        row = {"_id": project.id}
+        for column in self.PROJECT_COLUMNS:
+            row[column] = getattr(project, column)
+        version_rows = [
+            {
+                "project_id": version.project_id,
+                "version": version.version,
+                "commit_url": version.commit_url,
+                "created_on": version.created_on,
+                "sort_key": version.sort_key,
+            }
+            for version in versions
+        ]
+
+        with self._lock:
+            self._results.append((row, version_rows, list(messages)))
+
+    def flush_if_ready(self):
+        """
+        Write the batch, if it is full or the interval elapsed since the last
+        write.
+        """
+        with self._lock:
+            ready = (
+                len(self._results) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.interval
+            )
+        if ready:
+            self.flush()
+
+    def flush(self):
+        """
+        Write collected results to database and publish the messages.
+
+        If the batch can't be written, the results are written one by one,
+        so only the failed ones are lost.
+        """
+        with self._flush_lock:
+            with self._lock:
+                results, self._results = self._results, []
+                self._last_flush = time.monotonic()
+
+            if not results:
+                return
+
+            _log.debug("Writing %s checked projects", len(results))
+            try:
+                self._write(results)
+            except exc.SQLAlchemyError as err:
+                _log.warning(
+                    "Writing batch of checks failed, writing one by one: %s", err
+                )
+                self.session.rollback()
+                written = []
+                for result in results:
+                    try:
+                        self._write([result])
+                    except exc.SQLAlchemyError as result_err:
+                        _log.exception(result_err)
+                        self.session.rollback()
+                    else:
+                        written.append(result)
+                results = written
+
+            # Publish only after the changes are committed
+            for _row, _versions, messages in results:
+                for message in messages:
+                    publish_message(**message)
+
+    def _write(self, results):
+        """Write the results in single transaction."""
+        self.session.execute(
+            update(models.Project.__table__)
+            .where(models.Project.__table__.c.id == bindparam("_id"))
+            .values({column: bindparam(column) for column in self.PROJECT_COLUMNS}),
+            [row for row, _versions, _messages in results],
+        )
+        versions = [
+            version for _row, versions, _messages in results for version in versions
+        ]
+        if versions:
+            self.session.execute(insert(models.ProjectVersion.__table__), versions)
+        self.session.commit()
+
+
+def check_project_release(project, session, test=False, sink=None):
     """Check if the provided project has a new release available or not.
 
     :arg package: a Package object has defined in anitya.db.modelss.Project
+    :kwarg sink: a :class:`ResultSink` used to write the result of successful
+        check in batch with other checks, if not provided the result is
+        committed right away
+
+    """
+    backend = _get_check_backend(project)
+
+    # don't change actual data during test run
+    if not test:
+        _schedule_next_check(project, backend)
+
+    try:
+        _log.debug("Retrieving versions for %s", project.name)
+        # Test run must see the whole page, not modified response could hide
+        # the versions matched by settings which aren't stored yet
+        if test:
+            scope = http_validators.suspended()
+        else:
+            scope = http_validators.track(project.http_validators)
+        with scope as validators:
+            versions_prefix = backend.get_versions(project)
+        _log.debug("Versions retrieved: '%s'", versions_prefix)
+    except (
+        exceptions.RateLimitException,
+        exceptions.AnityaPluginException,
+    ) as err:
+        _record_check_error(project, session, err, test)
+        raise
+
+    if not test:
+        _set_http_validators(project, validators)
+        if not versions_prefix and validators.is_not_modified():
+            return _store_not_modified(project, session, sink)
+    return _store_versions(project, session, versions_prefix, test, sink)
+
+
+def check_project_spec(spec, session, sink=None):
+    """Check if the project has a new release available or not.
+
+    This is the same as :func:`check_project_release`, but the versions are
+    retrieved using the snapshot of the project without any database connection
+    held. The project is loaded again only to store the result of the check.
 
+    Args:
+        spec (anitya.db.models.ProjectSpec): Snapshot of the project to check.
+        session (sqlalchemy.orm.session.Session): The database session, it
+            shouldn't be in transaction when calling this.
+        sink (ResultSink): Sink used to write the result of successful check
+            in batch with other checks. If not provided the result is committed
+            right away.
+
+    Raises:
+        AnityaException: When the check failed.
+        RateLimitException: When the rate limit was reached on the backend.
+    """
+    backend = _get_check_backend(spec)
+
+    try:
+        _log.debug("Retrieving versions for %s", spec.name)
+        with http_validators.track(spec.http_validators) as validators:
+            versions_prefix = backend.get_versions(spec)
+        _log.debug("Versions retrieved: '%s'", versions_prefix)
+    except (
+        exceptions.RateLimitException,
+        exceptions.AnityaPluginException,
+    ) as err:
+        project = session.get(models.Project, spec.id)
+        _schedule_next_check(project, backend)
+        _record_check_error(project, session, err)
+        raise
+
+    project = session.get(models.Project, spec.id)
+    _schedule_next_check(project, backend)
+    _set_http_validators(project, validators)
+    if not versions_prefix and validators.is_not_modified():
+        _store_not_modified(project, session, sink)
+    else:
+        _store_versions(project, session, versions_prefix, sink=sink)
+
+
+def _get_check_backend(project):
+    """Get backend for the project check.
+
+    Args:
+        project (anitya.db.models.Project): Project or its snapshot.
+
+    Returns:
+        anitya.lib.backends.BaseBackend: Backend plugin.
+
+    Raises:
+        AnityaException: When there is no backend or the project is archived.
     """
     backend = plugins.get_plugin(project.backend)
     if not backend:
@@ -75,37 +310,104 @@ def check_project_release(project, session, test=False):
             "Project is archived, can't check new versions"
         )
 
-    versions_prefix = []
-    max_version = ""
+    return backend
 
-    # don't change actual data during test run
-    if not test:
-        project.last_check = arrow.utcnow().datetime
-        project.next_check = project.last_check + backend.check_interval
 
-    try:
-        _log.debug("Retrieving versions for %s", project.name)
-        versions_prefix = backend.get_versions(project)
-        _log.debug("Versions retrieved: '%s'", versions_prefix)
-    except exceptions.RateLimitException as err:
-        _log.error("%s (%s): %s", project.name, project.backend, str(err))
-        if not test:
-            project.logs = str(err)
-            project.next_check = err.reset_time.to("utc").datetime
-            project.check_successful = False
-            session.add(project)
-            session.commit()
-        raise
-    except exceptions.AnityaPluginException as err:
-        _log.error("%s (%s): %s", project.name, project.backend, str(err))
-        if not test:
-            project.logs = str(err)
-            project.check_successful = False
-            project.error_counter += 1
-            session.add(project)
-            session.commit()
-        raise
+def _schedule_next_check(project, backend):
+    """Set the time of the current and the next check on the project."""
+    project.last_check = arrow.utcnow().datetime
+    project.next_check = project.last_check + backend.check_interval
+
+
+def _set_http_validators(project, validators):
+    """Store the validators received during successful check in the project."""
+    result = validators.result() or None
+    if project.http_validators != result:
+        project.http_validators = result
+
+
+def _record_check_error(project, session, err, test=False):
+    """Store the error of the failed check in the project."""
+    _log.error("%s (%s): %s", project.name, project.backend, str(err))
+    if test:
+        return
+    project.logs = str(err)
+    project.check_successful = False
+    if isinstance(err, exceptions.RateLimitException):
+        project.next_check = err.reset_time.to("utc").datetime
+    else:
+        project.error_counter += 1
+    session.add(project)
+    session.commit()
+
 
+def _store_not_modified(project, session, sink=None):
+    """Store the result of check, which didn't get any modified page.
+
+    Versions of the project are not loaded at all, as nothing could change.
+    """
+    _log.debug("Pages of %s were not modified", project.name)
+    project.logs = "No new version found"
+    project.check_successful = True
+    project.error_counter = 0
+
+    if sink is not None:
+        sink.add(project, [], [])
+        session.rollback()
+        sink.flush_if_ready()
+        return
+
+    session.add(project)
+    session.commit()
+
+
+def _get_latest_version(
+    project, current, stored_versions, added_versions, stable=False
+):
+    """Return the new latest version of the project after adding new versions.
+
+    Only the new versions are compared with the current latest version,
+    the stored versions are compared only when there is no current latest
+    version yet. New version wins over the equal one, the same way as in
+    :meth:`anitya.db.models.Project.get_sorted_version_objects`.
+
+    Args:
+        project (anitya.db.models.Project): The project.
+        current (str): The current latest version, could be None.
+        stored_versions (list): Version objects stored before the check.
+        added_versions (list): Version objects added by the check, sorted
+            from oldest to newest.
+        stable (bool): Skip the pre-release versions.
+
+    Returns:
+        anitya.lib.versions.Version: The version object which replaces
+        the current latest version, None if the current one is still the latest.
+    """
+    latest = None
+    if current:
+        latest = project.get_version_class()(
+            version=current,
+            context=project.get_version_context(),
+        )
+    else:
+        added_versions = stored_versions + added_versions
+    new_latest = None
+    for version in added_versions:
+        if project.is_version_filtered(version.version):
+            continue
+        if stable and version.prerelease():
+            continue
+        if latest is None or not version.sort_key < latest.sort_key:
+            latest = new_latest = version
+    return new_latest
+
+
+def _store_versions(project, session, versions_prefix, test=False, sink=None):
+    """Store the retrieved versions in the project and publish the messages.
+
+    If the sink is provided, the changes are handed over to it and discarded
+    from the session.
+    """
     # Remove prefix
     versions = project.create_version_objects(versions_prefix)
 
@@ -115,35 +417,57 @@ def check_project_release(project, session, test=False):
     project.check_successful = True
     project.error_counter = 0
 
-    p_versions = project.get_sorted_version_objects()
+    p_versions = project.get_version_objects()
+    # Most of the retrieved versions are already stored with the same string,
+    # look them up in set and compare by version scheme only the rest
+    stored_keys = {p_version.version for p_version in p_versions}
     old_version = project.latest_version or ""
     version_column_len = models.ProjectVersion.version.property.columns[0].type.length
     upstream_versions = []
+    new_versions = []
+    added_versions = []
     for version in versions:
-        if version not in p_versions:
+        if version.version not in stored_keys and version not in p_versions:
             if not version.version:
                 # Skip empty version
                 continue
             if len(version.version) < version_column_len:
-                project.versions_obj.append(
-                    models.ProjectVersion(
-                        project_id=project.id,
-                        version=version.version,
-                        commit_url=version.commit_url,
-                    )
+                new_version = models.ProjectVersion(
+                    project_id=project.id,
+                    version=version.version,
+                    commit_url=version.commit_url,
+                    created_on=version.created_on,
+                    sort_key=version.stored_sort_key,
                 )
+                project.versions_obj.append(new_version)
+                new_versions.append(new_version)
+                added_versions.append(version)
                 upstream_versions.append(version.parse())
             else:
                 _log.info(
                     "Version '%s' was skipped. Reason: too long.", version.version
                 )
 
-    sorted_versions = project.get_sorted_version_objects()
-    if sorted_versions:
-        max_version_obj = sorted_versions[0]
-        max_version = max_version_obj.parse()
+    max_version = project.latest_version or ""
+    latest = _get_latest_version(
+        project, project.latest_version, p_versions, added_versions
+    )
+    if latest is not None:
+        max_version = latest.parse()
+        project.latest_version_created_on = latest.created_on
     if project.latest_version != max_version:
         project.latest_version = max_version
+    if added_versions:
+        latest_stable = _get_latest_version(
+            project,
+            project.latest_stable_version,
+            p_versions,
+            added_versions,
+            stable=True,
+        )
+        if latest_stable is not None:
+            project.latest_stable_version = str(latest_stable)
+        project.versions_count = len(project.versions_obj)
     if not upstream_versions:
         project.logs = "No new version found"
 
@@ -151,39 +475,59 @@ def check_project_release(project, session, test=False):
         session.close()
         return upstream_versions[::-1]
 
+    messages = []
     if upstream_versions:
-        _log.debug("Sending message for %s", project.name)
-        publish_message(
-            project=project.__json__(),
-            topic="project.version.update",
-            message=dict(
+        messages.append(
+            dict(
                 project=project.__json__(),
-                upstream_version=max_version,
-                old_version=old_version,
-                packages=[pkg.__json__() for pkg in project.packages],
-                versions=project.versions,
-                stable_versions=[str(version) for version in project.stable_versions],
-                ecosystem=project.ecosystem_name,
-                agent="anitya",
-                odd_change=False,
-            ),
+                topic="project.version.update",
+                message=dict(
+                    project=project.__json__(),
+                    upstream_version=max_version,
+                    old_version=old_version,
+                    packages=[pkg.__json__() for pkg in project.packages],
+                    versions=project.versions,
+                    stable_versions=[
+                        str(version) for version in project.stable_versions
+                    ],
+                    ecosystem=project.ecosystem_name,
+                    agent="anitya",
+                    odd_change=False,
+                ),
+            )
         )
-
-        publish_message(
-            project=project.__json__(),
-            topic="project.version.update.v2",
-            message=dict(
+        messages.append(
+            dict(
                 project=project.__json__(),
-                upstream_versions=upstream_versions,
-                old_version=old_version,
-                packages=[pkg.__json__() for pkg in project.packages],
-                versions=project.versions,
-                stable_versions=[str(version) for version in project.stable_versions],
-                ecosystem=project.ecosystem_name,
-                agent="anitya",
-            ),
+                topic="project.version.update.v2",
+                message=dict(
+                    project=project.__json__(),
+                    upstream_versions=upstream_versions,
+                    old_version=old_version,
+                    packages=[pkg.__json__() for pkg in project.packages],
+                    versions=project.versions,
+                    stable_versions=[
+                        str(version) for version in project.stable_versions
+                    ],
+                    ecosystem=project.ecosystem_name,
+                    agent="anitya",
+                ),
+            )
         )
 
+    if sink is not None:
+        _log.debug("Adding result of check for %s to sink", project.name)
+        sink.add(project, new_versions, messages)
+        # Changes will be written by the sink
+        session.rollback()
+        sink.flush_if_ready()
+        return
+
+    if messages:
+        _log.debug("Sending message for %s", project.name)
+    for message in messages:
+        publish_message(**message)
+
     _log.debug("Commit changes to database for %s", project.name)
     session.add(project)
     session.commit()
@@ -397,6 +741,43 @@ def edit_project(
         project.archived = archived
         changes["archived"] = {"old": old, "new": project.archived}
 
+    # The check only compares new versions with the latest versions,
+    # so they need to be recomputed when the versions are compared differently
+    if changes.keys() & {
+        "backend",
+        "version_scheme",
+        "version_pattern",
+        "version_prefix",
+        "version_filter",
+        "pre_release_filter",
+    }:
+        project.update_version_summary()
+    # Stored sort keys depend on the version class, prefixes and pattern
+    if changes.keys() & {
+        "homepage",
+        "backend",
+        "version_scheme",
+        "version_pattern",
+        "version_prefix",
+    }:
+        project.update_version_sort_keys()
+    # Validators and digest of the page belong to the old settings, the same
+    # page must be fetched and parsed again with the new ones
+    if changes.keys() & {
+        "homepage",
+        "backend",
+        "regex",
+        "version_url",
+        "version_filter",
+        "version_prefix",
+        "version_scheme",
+        "version_pattern",
+        "pre_release_filter",
+        "releases_only",
+        "insecure",
+    }:
+        project.http_validators = None
+
     try:
         if not dry_run:
             if changes:
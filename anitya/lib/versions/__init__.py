@@ -41,7 +41,7 @@ The general approach is as follows:
 
 from __future__ import unicode_literals
 
-from .base import Version, v_prefix  # noqa: F401
+from .base import Version, VersionContext, get_version_context, v_prefix  # noqa: F401
 from .calver import CalendarVersion  # noqa: F401
 from .rpm import RpmVersion  # noqa: F401
 from .semver import SemanticVersion  # noqa: F401
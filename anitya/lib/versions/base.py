@@ -30,14 +30,82 @@ import packaging.version
 
 from anitya.lib.exceptions import InvalidVersion
 
+from .key_encoding import encode_key
+from .parse_cache import parse_cache
+
 #: A regular expression to determine if the version string contains a 'v' prefix.
 v_prefix = re.compile(r"v\d.*")
 
 
+class VersionContext:
+    """
+    Settings shared by every version of the project.
+
+    Attributes:
+        prefixes (tuple): Prefixes to remove, sorted from shortest to longest.
+        pattern (str): Calendar version pattern in upper case.
+        pre_release_filters (tuple): Filters used to identify pre-release versions.
+    """
+
+    __slots__ = ("prefixes", "pattern", "pre_release_filters")
+
+    def __init__(
+        self,
+        prefix: Optional[str] = None,
+        pattern: Optional[str] = None,
+        pre_release_filter: Optional[str] = None,
+    ):
+        if prefix:
+            # Sort from shorter to longest, this will prevent stripping
+            # shorter prefix instead of larger.
+            # For example:
+            # version = release_db-1.2.3
+            # prefixes = release_db-;release
+            # would return db-1.2.3 instead of 1.2.3 if the sort is not done
+            self.prefixes = tuple(sorted(prefix.split(";"), key=len))
+        else:
+            self.prefixes = ()
+        self.pattern = pattern.upper() if pattern else None
+        if pre_release_filter:
+            self.pre_release_filters = tuple(pre_release_filter.split(";"))
+        else:
+            self.pre_release_filters = ()
+
+
+@functools.lru_cache(maxsize=1024)
+def get_version_context(
+    prefix: Optional[str] = None,
+    pattern: Optional[str] = None,
+    pre_release_filter: Optional[str] = None,
+) -> VersionContext:
+    """
+    Return the context shared by every version with the same settings.
+
+    Params:
+        prefix: Prefixes to remove separated by ``;``
+        pattern: Calendar version pattern.
+        pre_release_filter: Filters used to identify pre-release versions
+            separated by ``;``
+
+    Returns:
+        The shared context, which must not be changed.
+    """
+    return VersionContext(prefix, pattern, pre_release_filter)
+
+
 @functools.total_ordering
 class Version(object):
     """The base class for versions."""
 
+    __slots__ = (
+        "version",
+        "context",
+        "created_on",
+        "cursor",
+        "commit_url",
+        "_sort_key",
+    )
+
     name = "Generic Version"
 
     def __init__(
@@ -49,6 +117,7 @@ class Version(object):
         cursor: Optional[str] = None,
         commit_url: Optional[str] = None,
         pre_release_filter: Optional[str] = None,
+        context: Optional[VersionContext] = None,
     ):
         """
         Constructor of Version class.
@@ -62,29 +131,32 @@ class Version(object):
             cursor: An opaque, backend-specific cursor pointing to the version.
             commit_url: A URL pointing to the commit tagged as the version.
             pre_release_filter: A filter used to identify pre-release versions
+            context: Context shared by versions of the project, `prefix`, `pattern`
+                and `pre_release_filter` are ignored when provided.
         """
         self.version = version
-        if prefix:
-            self.prefixes = prefix.split(";")
-            # Sort from shorter to longest, this will prevent stripping
-            # shorter prefix instead of larger.
-            # For example:
-            # version = release_db-1.2.3
-            # prefixes = release_db-;release
-            # would return db-1.2.3 instead of 1.2.3 if the sort is not done
-            self.prefixes.sort(key=len)
-        else:
-            self.prefixes = []
+        if context is None:
+            context = get_version_context(prefix, pattern, pre_release_filter)
+        self.context = context
         self.created_on = created_on
-        self.pattern = None
-        if pattern:
-            self.pattern = pattern.upper()
         self.cursor = cursor
         self.commit_url = commit_url
-        if pre_release_filter:
-            self.pre_release_filters = pre_release_filter.split(";")
-        else:
-            self.pre_release_filters = []
+        self._sort_key = None
+
+    @property
+    def prefixes(self):
+        """Prefixes to remove, sorted from shortest to longest."""
+        return self.context.prefixes
+
+    @property
+    def pattern(self):
+        """Calendar version pattern in upper case."""
+        return self.context.pattern
+
+    @property
+    def pre_release_filters(self):
+        """Filters used to identify pre-release versions."""
+        return self.context.pre_release_filters
 
     def __str__(self):
         """
@@ -124,6 +196,89 @@ class Version(object):
 
         return version
 
+    @property
+    def sort_key(self):
+        """
+        Key ordering the versions the same way as the comparison operators.
+
+        The key is computed only once for each version, so sorting the
+        versions with ``sorted(versions, key=attrgetter("sort_key"))`` doesn't
+        parse the versions again on every comparison.
+
+        Returns:
+            object: The key, which could be compared with keys of other
+            versions of the same version scheme.
+        """
+        if self._sort_key is None:
+            self._sort_key = self.cached("sort_key", self.get_sort_key)
+        return self._sort_key
+
+    def cached(self, field, compute):
+        """
+        Return the result of parsing the version from the shared parse cache.
+
+        The result must depend only on the version scheme, the version string,
+        prefixes and pattern of the version.
+
+        Params:
+            field: Name of the result.
+            compute: Function computing the result, when it's not cached.
+
+        Returns:
+            The result returned by `compute`.
+        """
+        return parse_cache.get(
+            (self.name, field, self.version, self.prefixes, self.pattern),
+            compute,
+        )
+
+    def get_sort_key(self):
+        """
+        Compute the key used by :attr:`sort_key`.
+
+        Parsable versions always sort higher than unparsable versions,
+        which are sorted by the original version string.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        try:
+            parsed = self.parse()
+        except InvalidVersion:
+            parsed = None
+        if not parsed:
+            return (0, self.version)
+        return (1, parsed)
+
+    @property
+    def stored_sort_key(self):
+        """
+        Sort key encoded to bytes, which is stored in the database.
+
+        Comparing the stored keys of versions of the same project gives
+        the same order as :attr:`sort_key`, so the database could sort
+        the versions.
+
+        Returns:
+            bytes: The encoded key.
+        """
+        return self.cached(
+            "stored_sort_key", lambda: encode_key(self.get_stored_sort_key())
+        )
+
+    def get_stored_sort_key(self):
+        """
+        Compute the key encoded by :attr:`stored_sort_key`.
+
+        The key could contain only values supported by
+        :func:`anitya.lib.versions.key_encoding.encode_key`. The key of generic
+        versions contains only strings, so it's the same as :attr:`sort_key`.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        return self.sort_key
+
     def prerelease(self) -> bool:
         """
         Check if a version is a pre-release version.
@@ -161,18 +316,24 @@ class Version(object):
                 except ValueError:
                     target_idx = 1
 
-                try:
-                    rguess = packaging.version.Version(self.version).release
-                    if 0 <= target_idx < len(rguess):
-                        if rguess[target_idx] % 2 == 1:
-                            return True
-                except packaging.version.InvalidVersion:
+                rguess = self.cached("release", self._get_release)
+                if rguess is None:
                     continue
+                if 0 <= target_idx < len(rguess):
+                    if rguess[target_idx] % 2 == 1:
+                        return True
             elif pre_release_filter in self.version:
                 return True
 
         return False
 
+    def _get_release(self):
+        """Return the release tuple of the raw version, None if it's not valid."""
+        try:
+            return packaging.version.Version(self.version).release
+        except packaging.version.InvalidVersion:
+            return None
+
     def postrelease(self):
         """
         Check if a version is a post-release version.
@@ -66,6 +66,128 @@ class SplitResult(TypedDict, total=True):
     rc_number: Optional[str]
 
 
+def _is_split_lower(
+    version_dict_self: SplitResult, version_dict_other: SplitResult
+) -> bool:
+    """
+    Compare two split versions for lower than using the calendar rules.
+
+    Params:
+        version_dict_self: Result of :meth:`CalendarVersion.split`
+        version_dict_other: Result of :meth:`CalendarVersion.split`
+
+    Returns:
+        (bool) True if lower than, False otherwise.
+    """
+    # Compare years
+    year_self = version_dict_self["year"]
+    year_other = version_dict_other["year"]
+    if year_self and year_other:
+        if int(year_self) < int(year_other):
+            return True
+        elif int(year_self) > int(year_other):
+            return False
+
+    # Compare months
+    month_self = version_dict_self["month"]
+    month_other = version_dict_other["month"]
+    if month_self and month_other:
+        if int(month_self) < int(month_other):
+            return True
+        elif int(month_self) > int(month_other):
+            return False
+
+    # Compare days
+    day_self = version_dict_self["day"]
+    day_other = version_dict_other["day"]
+    if day_self and day_other:
+        if int(day_self) < int(day_other):
+            return True
+        elif int(day_self) > int(day_other):
+            return False
+
+    # Compare minors
+    minor_self = version_dict_self["minor"]
+    minor_other = version_dict_other["minor"]
+    if minor_self and minor_other:
+        if int(minor_self) < int(minor_other):
+            return True
+        elif int(minor_self) > int(minor_other):
+            return False
+
+    # Compare micro
+    micro_self = version_dict_self["micro"]
+    micro_other = version_dict_other["micro"]
+    if micro_self and micro_other:
+        if int(micro_self) < int(micro_other):
+            return True
+        elif int(micro_self) > int(micro_other):
+            return False
+
+    rc1 = version_dict_self["modifier"]
+    rc2 = version_dict_other["modifier"]
+    rcn1 = version_dict_self["rc_number"]
+    rcn2 = version_dict_other["rc_number"]
+
+    if rc1 and rc2:
+        # both are rc, higher rc is newer
+        rc1_text = rc1.lower()
+        rc2_text = rc2.lower()
+        # rc > pre > beta > alpha
+        if rc1_text < rc2_text:
+            return True
+        if rc1_text > rc2_text:
+            return False
+        if rcn1 and rcn2:
+            # both have rc number
+            return int(rcn1) < int(rcn2)
+        if rcn1:
+            # only first has rc number, then it is newer
+            return False
+        if rcn2:
+            # only second has rc number, then it is newer
+            return True
+        # both rc numbers are missing or same
+        return False
+
+    if rc1:
+        # only first is rc, then second is newer
+        return True
+    if rc2:
+        # only second is rc, then first is newer
+        return False
+
+    # neither is a rc
+    return False
+
+
+@functools.total_ordering
+class _CalendarSortKey:
+    """
+    Key of the calendar version used by :attr:`CalendarVersion.sort_key`.
+
+    Fields missing in one of the versions are not compared, so the calendar
+    versions are compared by the same rules as :meth:`CalendarVersion.__lt__`
+    applied to the precomputed split of the versions.
+    """
+
+    __slots__ = ("split",)
+
+    def __init__(self, split: Optional[SplitResult]):
+        self.split = split
+
+    def __lt__(self, other: "_CalendarSortKey") -> bool:
+        if not self.split:
+            # The version can't be split, so we consider it lesser
+            return True
+        if not other.split:
+            return False
+        return _is_split_lower(self.split, other.split)
+
+    def __eq__(self, other) -> bool:
+        return not self < other and not other < self
+
+
 @functools.total_ordering
 class CalendarVersion(Version):
     """
@@ -81,6 +203,8 @@ class CalendarVersion(Version):
        https://calver.org/#scheme
     """
 
+    __slots__ = ()
+
     name = "Calendar"
 
     def split(self) -> SplitResult:
@@ -266,9 +390,8 @@ class CalendarVersion(Version):
         This recognizes versions containing "rc", "pre", "beta", "alpha", and
         "dev" as being pre-release versions.
         """
-        try:
-            version_dict = self.split()
-        except ValueError:
+        version_dict = self.maybe_split()
+        if version_dict is None:
             # The version can't be parsed, so it's not pre-release
             return False
 
@@ -303,12 +426,56 @@ class CalendarVersion(Version):
         return False
 
     def maybe_split(self) -> Optional[SplitResult]:
-        """maybe_split"""
+        """
+        Return the cached result of :meth:`split`, which must not be changed.
+
+        Returns:
+            The split version, None if the version can't be split.
+        """
+        return self.cached("split", self._split_or_none)
+
+    def _split_or_none(self) -> Optional[SplitResult]:
         try:
             return self.split()
         except ValueError:
             return None
 
+    def get_sort_key(self) -> _CalendarSortKey:
+        """
+        Compute the key used by :attr:`sort_key`.
+
+        Returns:
+            The key of the version.
+        """
+        return _CalendarSortKey(self.maybe_split())
+
+    def get_stored_sort_key(self) -> tuple:
+        """
+        Compute the key encoded by :attr:`stored_sort_key`.
+
+        Fields of the pattern are compared in order, field missing in
+        the version is lower than any value. Versions of the project share
+        the same pattern, so they are compared the same way as by
+        :meth:`__lt__`.
+
+        Returns:
+            The key of the version.
+        """
+        split = self.maybe_split()
+        if not split:
+            return (0,)
+        fields = tuple(
+            int(split[field]) if split[field] else None
+            for field in ("year", "month", "day", "minor", "micro")
+        )
+        modifier = split["modifier"]
+        if modifier:
+            rc_number = split["rc_number"]
+            modifier_key = (0, modifier.lower(), bool(rc_number), int(rc_number or 0))
+        else:
+            modifier_key = (1,)
+        return (1,) + fields + (modifier_key,)
+
     def __lt__(self, other: Version) -> bool:
         """
         Compare two versions for lower than using the calendar rules with pre-release
@@ -334,83 +501,4 @@ class CalendarVersion(Version):
             # The version can't be split, so we consider self greater
             return False
 
-        # Compare years
-        year_self = version_dict_self["year"]
-        year_other = version_dict_other["year"]
-        if year_self and year_other:
-            if int(year_self) < int(year_other):
-                return True
-            elif int(year_self) > int(year_other):
-                return False
-
-        # Compare months
-        month_self = version_dict_self["month"]
-        month_other = version_dict_other["month"]
-        if month_self and month_other:
-            if int(month_self) < int(month_other):
-                return True
-            elif int(month_self) > int(month_other):
-                return False
-
-        # Compare days
-        day_self = version_dict_self["day"]
-        day_other = version_dict_other["day"]
-        if day_self and day_other:
-            if int(day_self) < int(day_other):
-                return True
-            elif int(day_self) > int(day_other):
-                return False
-
-        # Compare minors
-        minor_self = version_dict_self["minor"]
-        minor_other = version_dict_other["minor"]
-        if minor_self and minor_other:
-            if int(minor_self) < int(minor_other):
-                return True
-            elif int(minor_self) > int(minor_other):
-                return False
-
-        # Compare micro
-        micro_self = version_dict_self["micro"]
-        micro_other = version_dict_other["micro"]
-        if micro_self and micro_other:
-            if int(micro_self) < int(micro_other):
-                return True
-            elif int(micro_self) > int(micro_other):
-                return False
-
-        rc1 = version_dict_self["modifier"]
-        rc2 = version_dict_other["modifier"]
-        rcn1 = version_dict_self["rc_number"]
-        rcn2 = version_dict_other["rc_number"]
-
-        if rc1 and rc2:
-            # both are rc, higher rc is newer
-            rc1_text = rc1.lower()
-            rc2_text = rc2.lower()
-            # rc > pre > beta > alpha
-            if rc1_text < rc2_text:
-                return True
-            if rc1_text > rc2_text:
-                return False
-            if rcn1 and rcn2:
-                # both have rc number
-                return int(rcn1) < int(rcn2)
-            if rcn1:
-                # only first has rc number, then it is newer
-                return False
-            if rcn2:
-                # only second has rc number, then it is newer
-                return True
-            # both rc numbers are missing or same
-            return False
-
-        if rc1:
-            # only first is rc, then second is newer
-            return True
-        if rc2:
-            # only second is rc, then first is newer
-            return False
-
-        # neither is a rc
-        return False
+        return _is_split_lower(version_dict_self, version_dict_other)
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Order preserving encoding of the version sort keys to bytes.
+
+The encoded keys are stored in the
+:attr:`anitya.db.models.ProjectVersion.sort_key` column, so the database
+could order the versions by comparing the bytes. Comparing the encoded keys
+gives the same result as comparing the keys themselves.
+
+Keys could contain only ``None``, ``bool``, non-negative ``int``, ``str``
+and tuples of them. Values at the same position of the compared keys should
+have the same type, ``None`` is ordered before any other value and shorter
+tuple is ordered before the longer tuple with the same beginning.
+"""
+
+# Type codes, the end of tuple is lower than any value
+_END = b"\x00"
+_NONE = b"\x01"
+_INT = b"\x02"
+_STR = b"\x03"
+_TUPLE = b"\x04"
+
+
+def encode_key(key):
+    """Encode the sort key to bytes.
+
+    Args:
+        key (tuple): The sort key.
+
+    Returns:
+        bytes: The encoded key.
+
+    Raises:
+        ValueError: If the key contains value which can't be encoded.
+    """
+    parts = []
+    _encode(key, parts)
+    return b"".join(parts)
+
+
+def _encode(value, parts):
+    """Append encoded value to the list of parts."""
+    if value is None:
+        parts.append(_NONE)
+    elif isinstance(value, int):
+        if value < 0:
+            raise ValueError(f"Can't encode negative number {value}")
+        length = (value.bit_length() + 7) // 8
+        if length > 255:
+            raise ValueError("Can't encode number longer than 255 bytes")
+        parts.append(_INT + bytes((length,)) + value.to_bytes(length, "big"))
+    elif isinstance(value, str):
+        # UTF-8 keeps the order of code points, the terminating zero byte
+        # inside the string is escaped, so the shorter string is lower
+        encoded = value.encode("utf-8", "surrogatepass")
+        parts.append(_STR + encoded.replace(b"\x00", b"\x00\xff") + _END)
+    elif isinstance(value, tuple):
+        parts.append(_TUPLE)
+        for item in value:
+            _encode(item, parts)
+        parts.append(_END)
+    else:
+        raise ValueError(f"Can't encode {type(value).__name__} in sort key")
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Cache of parsed versions shared by every project in the process.
+
+The same version strings are used by many projects, so the results of
+parsing the version string are kept in a LRU cache keyed by the version
+scheme, the raw version, prefixes and pattern of the version. The cache is
+limited by ``VERSION_PARSE_CACHE_SIZE`` and is disabled when set to 0.
+
+Cached results are shared between version objects, so they must not be
+changed by the caller.
+"""
+
+import threading
+from collections import OrderedDict
+
+from anitya.config import config
+
+_MISSING = object()
+
+
+class ParseCache:
+    """LRU cache of parsed versions.
+
+    Attributes:
+        hits (int): Number of results served from the cache.
+        misses (int): Number of results computed.
+        evictions (int): Number of results evicted from the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """Return the cached result or compute it.
+
+        Args:
+            key (tuple): Key of the result.
+            compute (callable): Function computing the result.
+
+        Returns:
+            The result returned by `compute`.
+        """
+        max_size = config.get("VERSION_PARSE_CACHE_SIZE", 0)
+        if not max_size:
+            return compute()
+        with self._lock:
+            result = self._results.get(key, _MISSING)
+            if result is not _MISSING:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > max_size:
+                self._results.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def metrics(self):
+        """Return counters of the cache.
+
+        Returns:
+            dict: Number of cached results, hits, misses, evictions and
+            the hit rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._results),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def clear(self):
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+#: Cache shared by every version scheme
+parse_cache = ParseCache()
@@ -44,6 +44,8 @@ from . import base
 class PythonVersion(base.Version):
     """Python (PEP 440) Version."""
 
+    __slots__ = ("version_object",)
+
     name = "Python (PEP 440)"
 
     def __init__(
@@ -55,6 +57,7 @@ class PythonVersion(base.Version):
         cursor: Optional[str] = None,
         commit_url: Optional[str] = None,
         pre_release_filter: Optional[str] = None,
+        context: Optional[base.VersionContext] = None,
     ):
         """
         Constructor of Version class.
@@ -68,12 +71,21 @@ class PythonVersion(base.Version):
             cursor: An opaque, backend-specific cursor pointing to the version.
             commit_url: A URL pointing to the commit tagged as the version.
             pre_release_filter: A filter used to identify pre-release versions
+            context: Context shared by versions of the project, `prefix`, `pattern`
+                and `pre_release_filter` are ignored when provided.
         """
         super().__init__(
-            version, prefix, created_on, pattern, cursor, commit_url, pre_release_filter
+            version,
+            prefix,
+            created_on,
+            pattern,
+            cursor,
+            commit_url,
+            pre_release_filter,
+            context,
         )
 
-        self.version_object = self.get_version_object()
+        self.version_object = self.cached("version_object", self.get_version_object)
 
     def get_version_object(self):
         """
@@ -107,6 +119,64 @@ class PythonVersion(base.Version):
         else:
             return super().parse()
 
+    def get_sort_key(self):
+        """
+        Compute the key used by :attr:`sort_key`.
+
+        Validated versions always sort higher than unvalidated versions,
+        which are sorted by the original version string.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        if not self.version_object:
+            return (0, self.version)
+        return (1, self.version_object)
+
+    def get_stored_sort_key(self):
+        """
+        Compute the key encoded by :attr:`stored_sort_key`.
+
+        The parts of the validated version are ordered by the PEP 440 rules
+        the same way as the :class:`packaging.version.Version` does it.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        version_object = self.version_object
+        if not version_object:
+            return (0, self.version)
+        release = list(version_object.release)
+        while len(release) > 1 and not release[-1]:
+            release.pop()
+        pre, post, dev = version_object.pre, version_object.post, version_object.dev
+        if pre is None and post is None and dev is not None:
+            # Development release without pre-release sorts before pre-releases
+            pre_key = (0,)
+        elif pre is None:
+            pre_key = (2,)
+        else:
+            pre_key = (1, pre[0], pre[1])
+        if version_object.local is None:
+            local_key = (0,)
+        else:
+            local_key = (
+                1,
+                tuple(
+                    (1, int(part)) if part.isdigit() else (0, part)
+                    for part in version_object.local.split(".")
+                ),
+            )
+        return (
+            1,
+            version_object.epoch,
+            tuple(release),
+            pre_key,
+            (0,) if post is None else (1, post),
+            (1,) if dev is None else (0, dev),
+            local_key,
+        )
+
     def prerelease(self) -> bool:
         """
         Check this is a pre-release version.
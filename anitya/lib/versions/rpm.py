@@ -28,21 +28,43 @@ import re
 
 from .base import Version
 
+# Emulate RPM field comparisons as described in
+# https://stackoverflow.com/a/3206477
+#
+# * Search each string for alphabetic fields [a-zA-Z]+ and
+#   numeric fields [0-9]+ separated by junk [^a-zA-Z0-9]*.
+# * Successive fields in each string are compared to each other.
+# * Alphabetic sections are compared lexicographically, and the
+#   numeric sections are compared numerically.
+# * In the case of a mismatch where one field is numeric and one is
+#   alphabetic, the numeric field is always considered greater (newer).
+# * In the case where one string runs out of fields, the other is always
+#   considered greater (newer).
+_subfield_pattern = re.compile(
+    r"(?P<junk>[^a-zA-Z0-9]*)((?P<text>[a-zA-Z]+)|(?P<num>[0-9]+))"
+)
+
+
+def _iter_rpm_subfields(field):
+    """Yield subfields as 2-tuples that sort in the desired order
+
+    Text subfields are yielded as (0, text_value)
+    Numeric subfields are yielded as (1, int_value)
+    """
+    for subfield in _subfield_pattern.finditer(field):
+        text = subfield.group("text")
+        if text is not None:
+            yield (0, text)
+        else:
+            yield (1, int(subfield.group("num")))
+
+
 try:
     from rpm import labelCompare as _compare_rpm_labels
+
+    _NATIVE_RPM = True
 except ImportError:
-    # Emulate RPM field comparisons as described in
-    # https://stackoverflow.com/a/3206477
-    #
-    # * Search each string for alphabetic fields [a-zA-Z]+ and
-    #   numeric fields [0-9]+ separated by junk [^a-zA-Z0-9]*.
-    # * Successive fields in each string are compared to each other.
-    # * Alphabetic sections are compared lexicographically, and the
-    #   numeric sections are compared numerically.
-    # * In the case of a mismatch where one field is numeric and one is
-    #   alphabetic, the numeric field is always considered greater (newer).
-    # * In the case where one string runs out of fields, the other is always
-    #   considered greater (newer).
+    _NATIVE_RPM = False
 
     import warnings
 
@@ -50,23 +72,6 @@ except ImportError:
 
     from itertools import zip_longest
 
-    _subfield_pattern = re.compile(
-        r"(?P<junk>[^a-zA-Z0-9]*)((?P<text>[a-zA-Z]+)|(?P<num>[0-9]+))"
-    )
-
-    def _iter_rpm_subfields(field):
-        """Yield subfields as 2-tuples that sort in the desired order
-
-        Text subfields are yielded as (0, text_value)
-        Numeric subfields are yielded as (1, int_value)
-        """
-        for subfield in _subfield_pattern.finditer(field):
-            text = subfield.group("text")
-            if text is not None:
-                yield (0, text)
-            else:
-                yield (1, int(subfield.group("num")))
-
     def _compare_rpm_field(lhs, rhs):
         # Short circuit for exact matches (including both being None)
         if lhs == rhs:
@@ -101,6 +106,30 @@ except ImportError:
         return _compare_rpm_field(lhs_release, rhs_release)
 
 
+@functools.total_ordering
+class _RpmLabel:
+    """Version compared by the RPM label rules, used in sort keys."""
+
+    __slots__ = ("label",)
+
+    def __init__(self, version):
+        self.label = (None, version, None)
+
+    def __eq__(self, other):
+        return _compare_rpm_labels(self.label, other.label) == 0
+
+    def __lt__(self, other):
+        return _compare_rpm_labels(self.label, other.label) == -1
+
+
+def _get_label_key(version):
+    """Return key of the version ordered by the RPM label rules."""
+    if _NATIVE_RPM:
+        return _RpmLabel(version)
+    # The emulated comparison compares the subfields in order
+    return tuple(_iter_rpm_subfields(version))
+
+
 @functools.total_ordering
 class RpmVersion(Version):
     """
@@ -110,6 +139,8 @@ class RpmVersion(Version):
     back to a pure Python implementation if they are not installed.
     """
 
+    __slots__ = ()
+
     name = "RPM"
 
     _rc_upstream_regex = re.compile(
@@ -137,6 +168,10 @@ class RpmVersion(Version):
 
         return (match.group(1), match.group(3), match.group(4))
 
+    def _split_rc(self):
+        """Return the cached result of :meth:`split_rc` for the parsed version."""
+        return self.cached("split_rc", lambda: self.split_rc(self.parse()))
+
     def prerelease(self) -> bool:
         """
         Check if a version is a pre-release version.
@@ -144,11 +179,48 @@ class RpmVersion(Version):
         This recognizes versions containing "rc", "pre", "beta", "alpha", and
         "dev" as being pre-release versions.
         """
-        if self.split_rc(self.parse())[1]:
+        if self._split_rc()[1]:
             return True
 
         return super().prerelease()
 
+    def get_sort_key(self):
+        """
+        Compute the key used by :attr:`sort_key`.
+
+        Versions are ordered by the RPM label rules first, release candidate
+        is older than the final release and higher release candidate is newer.
+        Empty versions are moved to bottom.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        version, rc, rc_number = self._split_rc()
+        if not version:
+            return (0,)
+        label = _get_label_key(version)
+        if rc:
+            rc_key = (0, rc.lower(), bool(rc_number), int(rc_number or 0))
+        else:
+            rc_key = (1,)
+        return (1, label, rc_key)
+
+    def get_stored_sort_key(self):
+        """
+        Compute the key encoded by :attr:`stored_sort_key`.
+
+        The label is always split to subfields by the emulated RPM label rules,
+        so the key is the same with or without the rpm Python binding.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        key = self.sort_key
+        if _NATIVE_RPM and len(key) > 1:
+            version, _, _ = self._split_rc()
+            key = (1, tuple(_iter_rpm_subfields(version)), key[2])
+        return key
+
     def __eq__(self, other):
         """
         Compare two versions for equality using the RPM rules with pre-release
@@ -41,6 +41,8 @@ class SemanticVersion(Version):
     It sorts versions using the semantic Python library.
     """
 
+    __slots__ = ()
+
     name = "Semantic"
 
     def prerelease(self) -> bool:
@@ -56,9 +58,8 @@ class SemanticVersion(Version):
         .. _Semantic versioning:
            https://semver.org/
         """
-        try:
-            version_info = semver.VersionInfo.parse(self.parse())
-        except ValueError:
+        version_info = self.cached("version_info", self._get_version_info)
+        if version_info is None:
             # version is not correct semantic version, so it's not a pre-release
             return False
 
@@ -67,6 +68,59 @@ class SemanticVersion(Version):
 
         return super().prerelease()
 
+    def get_sort_key(self):
+        """
+        Compute the key used by :attr:`sort_key`.
+
+        Versions which are not correct semantic versions are moved to bottom.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        version_info = self.cached("version_info", self._get_version_info)
+        if version_info is None:
+            return (0,)
+        return (1, version_info)
+
+    def get_stored_sort_key(self):
+        """
+        Compute the key encoded by :attr:`stored_sort_key`.
+
+        Release is newer than its pre-releases, numeric identifiers of
+        pre-release are lower than alphanumeric ones. Build metadata is
+        ignored the same way as in comparison.
+
+        Returns:
+            tuple: The key of the version.
+        """
+        version_info = self.cached("version_info", self._get_version_info)
+        if version_info is None:
+            return (0,)
+        if version_info.prerelease:
+            prerelease_key = (
+                0,
+                tuple(
+                    (0, int(part)) if part.isdigit() else (1, part)
+                    for part in version_info.prerelease.split(".")
+                ),
+            )
+        else:
+            prerelease_key = (1,)
+        return (
+            1,
+            version_info.major,
+            version_info.minor,
+            version_info.patch,
+            prerelease_key,
+        )
+
+    def _get_version_info(self):
+        """Return the parsed semantic version, None if it's not valid."""
+        try:
+            return semver.VersionInfo.parse(self.parse())
+        except ValueError:
+            return None
+
     def __eq__(self, other):
         """
         Compare two versions for equality using the semantic rules with pre-release
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+This script recomputes the stored sort keys of project versions and
+the summary of versions stored on the projects.
+
+Projects are processed in batches ordered by id, every batch is committed
+separately, so the script could be stopped and run again at any time.
+"""
+
+import argparse
+import logging
+
+from sqlalchemy.orm import selectinload
+
+from anitya import app
+from anitya.config import config
+from anitya.db import Project, db
+
+_log = logging.getLogger("anitya")
+
+#: Number of projects processed in one transaction
+BATCH_SIZE = 500
+
+
+def rebuild(session, batch_size=BATCH_SIZE):
+    """
+    Recompute the stored sort keys of versions and the version summary
+    of every project.
+
+    Args:
+        session (sqlalchemy.orm.session.Session): The database session.
+        batch_size (int): Number of projects processed in one transaction.
+
+    Returns:
+        int: Number of versions with changed key.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        projects = (
+            session.query(Project)
+            .options(selectinload(Project.versions_obj))
+            .filter(Project.id > last_id)
+            .order_by(Project.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not projects:
+            break
+        last_id = projects[-1].id
+        for project in projects:
+            updated += project.update_version_sort_keys()
+            project.update_version_summary()
+        session.commit()
+        # Don't keep the processed projects in memory
+        session.expunge_all()
+        _log.debug("Sort keys rebuilt up to project %s", last_id)
+    return updated
+
+
+def main():
+    """
+    Recompute the stored sort keys of versions.
+    """
+    parser = argparse.ArgumentParser(
+        description="Recompute the stored sort keys of project versions."
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=BATCH_SIZE,
+        help="Number of projects processed in one transaction.",
+    )
+    args = parser.parse_args()
+
+    app.create(config)
+    updated = rebuild(db.session, args.batch_size)
+    print(f"Sort keys of {updated} versions were updated")
+
+
+if __name__ == "__main__":
+    main()
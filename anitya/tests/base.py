@@ -30,6 +30,7 @@ from contextlib import contextmanager
 import flask_login
 import vcr
 from flask import request_started
+from sqlalchemy import event
 
 from anitya import app, config
 from anitya.db import db, models
@@ -61,6 +62,62 @@ def login_user(app, user):
         yield
 
 
+@contextmanager
+def count_queries(parameters=False):
+    """
+    A context manager counting SQL statements sent to the database.
+
+    For example:
+
+        >>> with count_queries() as queries:
+        ...     self.flask_app.test_client().get('/api/v2/projects/')
+        >>> self.assertLessEqual(len(queries), 3)
+
+    Args:
+        parameters (bool): Record tuples of the statement and its parameters
+            instead of the statements only.
+
+    Yields:
+        list: The executed statements, filled when they are executed.
+    """
+    queries = []
+
+    def handler(conn, cursor, statement, params, context, executemany):
+        # Savepoints are used by the tests themselves
+        if "SAVEPOINT" not in statement:
+            queries.append((statement, params) if parameters else statement)
+
+    event.listen(db.manager.engine, "before_cursor_execute", handler)
+    try:
+        yield queries
+    finally:
+        event.remove(db.manager.engine, "before_cursor_execute", handler)
+
+
+def create_projects_with_versions(session, count):
+    """Create projects with versions and package in Fedora, returns the projects."""
+    models.Distro.get_or_create(session, "Fedora")
+    projects = []
+    for index in range(count):
+        project = models.Project(
+            name=f"project-{index:04d}",
+            homepage=f"https://example.com/project-{index:04d}",
+            backend="custom",
+            latest_version="1.1",
+            latest_stable_version="1.1",
+            versions_count=2,
+        )
+        for version in ("1.0", "1.1"):
+            models.ProjectVersion(project=project, version=version)
+        models.Packages(
+            project=project, distro_name="Fedora", package_name=project.name
+        )
+        projects.append(project)
+    session.add_all(projects)
+    session.commit()
+    return projects
+
+
 class AnityaTestCase(unittest.TestCase):
     """This is the base test case class for Anitya tests."""
 
@@ -20,9 +20,11 @@
 # of Red Hat, Inc.
 """Tests for the :mod:`anitya.db.events` module."""
 
+import mock
 from sqlalchemy import select
 
 from anitya.db import models
+from anitya.lib.versions import RpmVersion
 from anitya.tests.base import DatabaseTestCase
 
 
@@ -139,3 +141,127 @@ class SetEcosystemHomepageTests(DatabaseTestCase):
         self.session.add(project)
         self.session.commit()
         self.assertEqual("https://pypi.org/requests", project.ecosystem_name)
+
+
+class InvalidateVersionViewTests(DatabaseTestCase):
+    """Tests for the listeners dropping the version view of the project."""
+
+    def setUp(self):
+        super().setUp()
+        self.project = models.Project(
+            name="requests",
+            homepage="https://pypi.org/requests",
+            backend="PyPI",
+            version_scheme="RPM",
+        )
+        self.session.add(self.project)
+        self.session.flush()
+        self.project.versions_obj.append(
+            models.ProjectVersion(project_id=self.project.id, version="1.0")
+        )
+        self.session.commit()
+
+    def test_view_shared(self):
+        """Assert that the versions are sorted only once."""
+        self.assertEqual(self.project.versions, ["1.0"])
+        self.assertFalse(self.project.versions_obj[0].pre_release)
+        with mock.patch.object(
+            models.Project, "get_version_objects", side_effect=AssertionError
+        ):
+            self.assertEqual(self.project.versions, ["1.0"])
+            self.assertEqual(self.project.stable_versions[0].version, "1.0")
+            self.assertEqual(self.project.latest_version_object.version, "1.0")
+            self.assertFalse(self.project.versions_obj[0].pre_release)
+
+    def test_append_version(self):
+        """Assert that the view is dropped when a version is added."""
+        self.assertEqual(self.project.versions, ["1.0"])
+
+        self.project.versions_obj.append(
+            models.ProjectVersion(project_id=self.project.id, version="1.1")
+        )
+
+        self.assertEqual(self.project.versions, ["1.1", "1.0"])
+
+    def test_remove_version(self):
+        """Assert that the view is dropped when a version is removed."""
+        self.assertEqual(self.project.versions, ["1.0"])
+
+        self.project.versions_obj.remove(self.project.versions_obj[0])
+
+        self.assertEqual(self.project.versions, [])
+
+    def test_change_version(self):
+        """Assert that the view is dropped when a stored version is changed."""
+        self.assertEqual(self.project.versions, ["1.0"])
+
+        self.project.versions_obj[0].version = "2.0"
+
+        self.assertEqual(self.project.versions, ["2.0"])
+
+    def test_change_column(self):
+        """Assert that the view is dropped when a version setting is changed."""
+        self.assertEqual(self.project.stable_versions[0].version, "1.0")
+
+        self.project.pre_release_filter = "1."
+
+        self.assertEqual(self.project.stable_versions, [])
+
+    def test_expire(self):
+        """Assert that the view is dropped when the project is expired."""
+        self.assertEqual(self.project.versions, ["1.0"])
+        self.session.add(
+            models.ProjectVersion(project_id=self.project.id, version="1.1")
+        )
+        self.session.commit()
+
+        self.assertEqual(self.project.versions, ["1.1", "1.0"])
+
+    def test_refresh(self):
+        """Assert that the view is dropped when the project is refreshed."""
+        self.assertEqual(self.project.versions, ["1.0"])
+        self.session.add(
+            models.ProjectVersion(project_id=self.project.id, version="1.1")
+        )
+        self.session.flush()
+
+        self.session.refresh(self.project)
+
+        self.assertEqual(self.project.versions, ["1.1", "1.0"])
+
+
+class SetVersionSortKeyTests(DatabaseTestCase):
+    """Tests for the :func:`anitya.db.events.set_version_sort_key` listener."""
+
+    def setUp(self):
+        super().setUp()
+        self.project = models.Project(
+            name="requests",
+            homepage="https://pypi.org/requests",
+            backend="PyPI",
+            version_scheme="RPM",
+            version_prefix="v",
+        )
+        self.session.add(self.project)
+        self.session.commit()
+
+    def test_set_sort_key(self):
+        """Assert that the key is computed for a new version."""
+        version = models.ProjectVersion(project_id=self.project.id, version="v1.0")
+        self.session.add(version)
+        self.session.commit()
+
+        self.assertEqual(
+            version.sort_key,
+            RpmVersion(version="1.0").stored_sort_key,
+        )
+
+    def test_sort_key_set(self):
+        """Assert that the key set on the version is kept."""
+        version = models.ProjectVersion(
+            project=self.project, version="1.0", sort_key=b"key"
+        )
+        self.session.add(version)
+        self.session.commit()
+
+        self.assertEqual(version.sort_key, b"key")
@@ -19,10 +19,14 @@
 # of Red Hat, Inc.
 """test meta"""
 
+import unittest
+
+import mock
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
-from anitya.db import models, paginate
-from anitya.tests.base import DatabaseTestCase, create_project
+from anitya.db import meta, models, paginate, paginate_after
+from anitya.tests.base import DatabaseTestCase, count_queries, create_project
 
 
 class BaseQueryPaginateTests(DatabaseTestCase):
@@ -88,3 +92,187 @@ class BaseQueryPaginateTests(DatabaseTestCase):
         self.assertEqual(page["items"][0].name, "R2spec")
         self.assertEqual(page["items"][1].name, "geany")
         self.assertEqual(page["items"][2].name, "subsurface")
+
+    def test_total_none(self):
+        """Assert that items are not counted when not requested."""
+        create_project(self.session)
+        with count_queries() as queries:
+            page = paginate(select(models.Project), total="none")
+        self.assertIsNone(page["total_items"])
+        self.assertEqual(3, len(page["items"]))
+        self.assertEqual(1, len(queries))
+
+
+class CountItemsTests(DatabaseTestCase):
+    """Tests for the :func:`anitya.db.meta.count_items` function."""
+
+    def setUp(self):
+        super().setUp()
+        meta._count_cache.clear()
+        self.addCleanup(meta._count_cache.clear)
+
+    def test_exact(self):
+        """Assert that items are counted every time."""
+        create_project(self.session)
+        self.assertEqual(3, meta.count_items(select(models.Project)))
+        self.session.add(models.Project(name="new", homepage="https://example.com"))
+        self.session.commit()
+        self.assertEqual(4, meta.count_items(select(models.Project)))
+
+    @mock.patch.dict("anitya.config.config", {"API_COUNT_CACHE_TIMEOUT": 300})
+    def test_estimate_cached(self):
+        """Assert that estimated count is cached on database without planner estimates."""
+        create_project(self.session)
+        query = select(models.Project)
+        self.assertEqual(3, meta.count_items(query, "estimate"))
+        self.session.add(models.Project(name="new", homepage="https://example.com"))
+        self.session.commit()
+        with count_queries() as queries:
+            self.assertEqual(3, meta.count_items(query, "estimate"))
+        self.assertEqual(queries, [])
+        # Different filter is counted separately
+        self.assertEqual(
+            1,
+            meta.count_items(
+                query.filter(models.Project.name == "new"),
+                "estimate",
+            ),
+        )
+
+    @mock.patch.dict("anitya.config.config", {"API_COUNT_CACHE_TIMEOUT": 0})
+    def test_estimate_expired(self):
+        """Assert that the cached count expires."""
+        create_project(self.session)
+        query = select(models.Project)
+        self.assertEqual(3, meta.count_items(query, "estimate"))
+        self.session.add(models.Project(name="new", homepage="https://example.com"))
+        self.session.commit()
+        self.assertEqual(4, meta.count_items(query, "estimate"))
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"API_COUNT_CACHE_TIMEOUT": 300, "API_COUNT_CACHE_SIZE": 2},
+    )
+    def test_estimate_cache_size(self):
+        """Assert that the oldest cached counts are dropped."""
+        create_project(self.session)
+        for name in ("geany", "subsurface", "R2spec"):
+            meta.count_items(
+                select(models.Project).filter(models.Project.name == name),
+                "estimate",
+            )
+
+        self.assertEqual(len(meta._count_cache), 2)
+        with count_queries() as queries:
+            meta.count_items(
+                select(models.Project).filter(models.Project.name == "R2spec"),
+                "estimate",
+            )
+        self.assertEqual(queries, [])
+
+    @mock.patch.dict("anitya.config.config", {"API_COUNT_CACHE_TIMEOUT": 0})
+    def test_estimate_expired_dropped(self):
+        """Assert that the expired counts are dropped from the cache."""
+        create_project(self.session)
+        meta.count_items(select(models.Project), "estimate")
+        meta.count_items(
+            select(models.Project).filter(models.Project.name == "geany"), "estimate"
+        )
+
+        self.assertEqual(len(meta._count_cache), 1)
+
+    def test_estimate_postgresql_parameters(self):
+        """Assert that filter values are sent as parameters of the explained query."""
+        connection = mock.Mock(dialect=postgresql.psycopg2.dialect())
+        connection.exec_driver_sql.return_value.scalar.return_value = [
+            {"Plan": {"Plan Rows": 42}}
+        ]
+        query = select(models.Project).filter(
+            models.Project.name == "o'neil", models.Project.id.in_([1, 2])
+        )
+
+        with mock.patch.object(meta.db.session, "connection", return_value=connection):
+            self.assertEqual(42, meta.count_items(query, "estimate"))
+
+        statement, parameters = connection.exec_driver_sql.call_args[0]
+        self.assertTrue(statement.startswith("EXPLAIN (FORMAT JSON) SELECT"))
+        self.assertNotIn("o'neil", statement)
+        self.assertEqual(parameters, {"name_1": "o'neil", "id_1_1": 1, "id_1_2": 2})
+
+    def test_unknown_mode(self):
+        """Assert that unknown mode raises a ValueError."""
+        self.assertRaises(ValueError, meta.count_items, select(models.Project), "foo")
+
+
+class CursorTests(unittest.TestCase):
+    """Tests for the cursor encoding functions."""
+
+    def test_round_trip(self):
+        """Assert that decoded cursor contains the encoded values."""
+        cursor = meta.encode_cursor(["ąčé/+?", 42])
+        self.assertRegex(cursor, r"^[A-Za-z0-9_-]+$")
+        self.assertEqual(meta.decode_cursor(cursor, 2), ["ąčé/+?", 42])
+
+    def test_invalid(self):
+        """Assert that invalid cursors raise a ValueError."""
+        for cursor in ("!!!", "bm90IGpzb24", meta.encode_cursor({"a": 1})):
+            with self.subTest(cursor=cursor):
+                self.assertRaises(ValueError, meta.decode_cursor, cursor, 1)
+        self.assertRaises(ValueError, meta.decode_cursor, meta.encode_cursor([1]), 2)
+
+
+class PaginateAfterTests(DatabaseTestCase):
+    """Tests for the :func:`anitya.db.meta.paginate_after` function."""
+
+    columns = [models.Project.name, models.Project.ecosystem_name]
+
+    def test_pages(self):
+        """Assert that every item is returned once by following the cursors."""
+        create_project(self.session)
+        self.session.add(
+            models.Project(
+                name="geany", homepage="https://example.com", ecosystem_name="other"
+            )
+        )
+        self.session.commit()
+
+        names = []
+        after = None
+        while True:
+            page = paginate_after(
+                select(models.Project), self.columns, after=after, items_per_page=2
+            )
+            self.assertEqual(4, page["total_items"])
+            names.extend(
+                (project.name, project.ecosystem_name) for project in page["items"]
+            )
+            after = page["next_after"]
+            if after is None:
+                break
+
+        self.assertEqual(
+            names,
+            [
+                ("R2spec", "https://fedorahosted.org/r2spec/"),
+                ("geany", "https://www.geany.org/"),
+                ("geany", "other"),
+                ("subsurface", "https://subsurface-divelog.org/"),
+            ],
+        )
+
+    def test_last_page_full(self):
+        """Assert that there is no cursor after the full last page."""
+        create_project(self.session)
+        page = paginate_after(select(models.Project), self.columns, items_per_page=3)
+        self.assertEqual(3, len(page["items"]))
+        self.assertIsNone(page["next_after"])
+
+    def test_nonsense_items_per_page(self):
+        """Assert an items_per_page number less than 1 raises a ValueError."""
+        self.assertRaises(
+            ValueError,
+            paginate_after,
+            select(models.Project),
+            self.columns,
+            items_per_page=0,
+        )
@@ -34,6 +34,7 @@ import mock
 import six
 from fedora_messaging import testing as fml_testing
 from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.types import CHAR
 
@@ -41,10 +42,12 @@ from anitya.db import models
 from anitya.lib import utilities, versions
 from anitya.tests.base import (
     DatabaseTestCase,
+    count_queries,
     create_distro,
     create_flagged_project,
     create_package,
     create_project,
+    create_projects_with_versions,
 )
 
 
@@ -361,6 +364,7 @@ class ProjectTests(DatabaseTestCase):
         self.assertEqual(len(version_objects), 2)
         self.assertEqual(version_objects[0].version, version_second.version)
         self.assertEqual(version_objects[1].version, version_first.version)
+        self.assertIs(version_objects[0].context, version_objects[1].context)
 
     def test_latest_version_object_with_versions(self):
         """Test the latest_version_object property with versions."""
@@ -396,6 +400,68 @@ class ProjectTests(DatabaseTestCase):
 
         self.assertIsNone(project.latest_version_object)
 
+    def test_preload_versions(self):
+        """Assert that versions of projects are loaded by one query."""
+        projects = create_projects_with_versions(self.session, 3)
+        self.session.expire_all()
+        projects = models.Project.all(self.session)
+
+        with count_queries() as queries:
+            models.Project.preload_versions(self.session, projects, batch_size=2)
+            versions = [project.versions for project in projects]
+
+        self.assertEqual(versions, [["1.1", "1.0"]] * 3)
+        self.assertEqual(len(queries), 2)
+
+        with count_queries() as queries:
+            models.Project.preload_versions(self.session, projects)
+        self.assertEqual(queries, [])
+
+    def test_update_version_summary(self):
+        """Assert that the version summary is computed from stored versions."""
+        project = models.Project(
+            name="test",
+            homepage="https://example.com",
+            backend="custom",
+            ecosystem_name="pypi",
+            version_scheme="RPM",
+        )
+        created_on = datetime.datetime(2020, 1, 1)
+        for version in ("0.8", "1.0", "1.1rc1"):
+            models.ProjectVersion(
+                project=project, version=version, created_on=created_on
+            )
+        self.session.add(project)
+        self.session.flush()
+
+        project.update_version_summary()
+
+        self.assertEqual(project.latest_version, "1.1rc1")
+        self.assertEqual(project.latest_stable_version, "1.0")
+        self.assertEqual(project.latest_version_created_on, created_on)
+        self.assertEqual(project.versions_count, 3)
+
+    def test_update_version_summary_without_versions(self):
+        """Assert that the version summary is cleared without versions."""
+        project = models.Project(
+            name="test",
+            homepage="https://example.com",
+            backend="custom",
+            ecosystem_name="pypi",
+            latest_version="1.0",
+            latest_stable_version="1.0",
+            versions_count=1,
+        )
+        self.session.add(project)
+        self.session.flush()
+
+        project.update_version_summary()
+
+        self.assertIsNone(project.latest_version)
+        self.assertIsNone(project.latest_stable_version)
+        self.assertIsNone(project.latest_version_created_on)
+        self.assertEqual(project.versions_count, 0)
+
     def test_get_version_class(self):
         """Test get_version_class function"""
         project = models.Project(
@@ -475,6 +541,84 @@ class ProjectTests(DatabaseTestCase):
         projects = models.Project.search(self.session, "*", distro="Fedora")
         self.assertEqual(len(projects), 2)
 
+    def test_project_search_package_in_distro(self):
+        """
+        Assert that projects matching by package name are returned only when
+        the matching package is in the distro.
+        """
+        create_project(self.session)
+        create_distro(self.session)
+        self.session.add_all(
+            [
+                models.Packages(
+                    distro_name="Fedora", project_id=1, package_name="geany"
+                ),
+                models.Packages(
+                    distro_name="Debian", project_id=2, package_name="libgeany"
+                ),
+            ]
+        )
+        self.session.commit()
+
+        projects = models.Project.search(self.session, "*geany*")
+        self.assertEqual(
+            [project.name for project in projects], ["geany", "subsurface"]
+        )
+
+        projects = models.Project.search(self.session, "*geany*", distro="fedora")
+        self.assertEqual([project.name for project in projects], ["geany"])
+
+    def test_project_search_with_count(self):
+        """Assert that the page and count are retrieved by single query."""
+        create_project(self.session)
+
+        with count_queries() as queries:
+            projects, total = models.Project.search(
+                self.session, "*e*", with_count=True
+            )
+
+        self.assertEqual(
+            [project.name for project in projects], ["geany", "R2spec", "subsurface"]
+        )
+        self.assertEqual(total, 3)
+        self.assertEqual(len(queries), 1)
+
+    def test_project_search_with_count_past_last_page(self):
+        """Assert that the count is retrieved when the page is empty."""
+        create_project(self.session)
+
+        projects, total = models.Project.search(
+            self.session, "*e*", page=2, with_count=True
+        )
+
+        self.assertEqual(projects, [])
+        self.assertEqual(total, 3)
+
+    def test_project_search_extended_pattern(self):
+        """Assert that projects matching the pattern are ranked first."""
+        create_project(self.session)
+        self.session.add(
+            models.Project(name="libgeany", homepage="https://example.com/libgeany")
+        )
+        self.session.add(
+            models.Project(name="geany-plugins", homepage="https://example.com/gp")
+        )
+        self.session.commit()
+
+        projects, total = models.Project.search(
+            self.session,
+            "geany*",
+            extended_pattern="*geany*",
+            sort="name_desc",
+            with_count=True,
+        )
+
+        self.assertEqual(
+            [project.name for project in projects],
+            ["geany-plugins", "geany", "libgeany"],
+        )
+        self.assertEqual(total, 3)
+
     def test_project_get_or_create(self):
         """Test the Project.get_or_create function."""
         project = models.Project.get_or_create(
@@ -704,6 +848,83 @@ class ProjectTests(DatabaseTestCase):
         projects = models.Project.updated(self.session, count=True)
         self.assertEqual(projects, 1)
 
+    def test_project_updated_with_count(self):
+        """
+        Assert that the page and count are retrieved by single query.
+        """
+        create_project(self.session)
+        for project in self.session.query(models.Project):
+            project.check_successful = True
+            project.logs = f"Version of {project.name} retrieved correctly"
+        self.session.commit()
+
+        with count_queries() as queries:
+            projects, total = models.Project.updated(
+                self.session, log="SUBSURFACE", with_count=True
+            )
+
+        self.assertEqual([project.name for project in projects], ["subsurface"])
+        self.assertEqual(total, 1)
+        self.assertEqual(len(queries), 1)
+
+
+class ProjectSpecTests(DatabaseTestCase):
+    """Tests for the ProjectSpec snapshot."""
+
+    def setUp(self):
+        super().setUp()
+        self.project = models.Project(
+            name="geany",
+            homepage="https://www.geany.org/",
+            backend="custom",
+            version_url="https://www.geany.org/Download/Releases",
+            version_prefix="v",
+            version_filter="rc",
+            regex="DEFAULT",
+        )
+        self.session.add(self.project)
+        self.session.flush()
+        version = models.ProjectVersion(
+            project_id=self.project.id,
+            version="1.0",
+            created_on=datetime.datetime(2020, 1, 1),
+        )
+        self.session.add(version)
+        self.session.commit()
+
+    def test_from_project(self):
+        """Assert that snapshot contains fields of the project."""
+        spec = models.ProjectSpec.from_project(self.project)
+
+        self.assertEqual(spec.id, self.project.id)
+        self.assertEqual(spec.name, "geany")
+        self.assertEqual(spec.version_url, "https://www.geany.org/Download/Releases")
+        self.assertEqual(spec.version_prefix, "v")
+        self.assertEqual(spec.get_time_last_created_version(), arrow.get(2020, 1, 1))
+        self.assertEqual(spec.get_version_class(), self.project.get_version_class())
+        self.assertEqual(spec.get_version_url(), self.project.get_version_url())
+        self.assertTrue(spec.is_version_filtered("1.1rc1"))
+        self.assertEqual(repr(spec), "<ProjectSpec(geany, https://www.geany.org/)>")
+
+    def test_create_version_objects(self):
+        """Assert that version objects are created the same way as for project."""
+        spec = models.ProjectSpec.from_project(self.project)
+
+        versions = spec.create_version_objects(["v1.1", "v1.0"])
+
+        self.assertEqual([str(version) for version in versions], ["1.0", "1.1"])
+
+    def test_immutable(self):
+        """Assert that snapshot can't be changed."""
+        spec = models.ProjectSpec.from_project(self.project)
+
+        with self.assertRaises(AttributeError):
+            spec.name = "foobar"
+        with self.assertRaises(AttributeError):
+            del spec.name
+        with self.assertRaises(AttributeError):
+            spec.versions = []
+
 
 class DistroTestCase(DatabaseTestCase):
     """Tests for Distro model."""
@@ -816,6 +1037,96 @@ class ProjectVersion(DatabaseTestCase):
 
         self.assertTrue(version.pre_release)
 
+    def test_newest(self):
+        """Assert that versions are ordered by the stored sort key."""
+        project = models.Project(
+            name="test",
+            homepage="https://example.com",
+            backend="custom",
+            ecosystem_name="pypi",
+            version_scheme="RPM",
+        )
+        self.session.add(project)
+        self.session.flush()
+        for version in ("1.10", "1.9", "1.0rc1", "1.0", "0.1"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        self.session.commit()
+
+        versions = models.ProjectVersion.newest(self.session, project.id, limit=3)
+
+        self.assertEqual(
+            [version.version for version in versions], ["1.10", "1.9", "1.0"]
+        )
+        self.assertEqual(
+            [version.version for version in project.get_sorted_version_objects()],
+            [
+                version.version
+                for version in models.ProjectVersion.newest(self.session, project.id)
+            ],
+        )
+
+    def test_update_version_sort_keys(self):
+        """Assert that keys are recomputed when the version scheme changes."""
+        project = models.Project(
+            name="test",
+            homepage="https://example.com",
+            backend="custom",
+            ecosystem_name="pypi",
+            version_scheme="RPM",
+        )
+        self.session.add(project)
+        self.session.flush()
+        for version in ("1.0.0", "1.0.0-rc.1", "1.0.0-rc.10", "1.0.0-rc.2"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        self.session.commit()
+
+        project.version_scheme = "Semantic"
+
+        self.assertEqual(project.update_version_sort_keys(), 4)
+        self.assertEqual(project.update_version_sort_keys(), 0)
+        self.session.commit()
+        self.assertEqual(
+            [
+                version.version
+                for version in models.ProjectVersion.newest(self.session, project.id)
+            ],
+            ["1.0.0", "1.0.0-rc.10", "1.0.0-rc.2", "1.0.0-rc.1"],
+        )
+
+    def test_newest_without_sort_key(self):
+        """Assert that versions which weren't rebuilt yet are returned last."""
+        project = models.Project(
+            name="test",
+            homepage="https://example.com",
+            backend="custom",
+            ecosystem_name="pypi",
+            version_scheme="RPM",
+        )
+        self.session.add(project)
+        self.session.flush()
+        for version in ("1.0", "2.0", "3.0"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        self.session.commit()
+        self.session.execute(
+            update(models.ProjectVersion)
+            .where(models.ProjectVersion.version == "3.0")
+            .values(sort_key=None)
+        )
+
+        self.assertEqual(
+            [
+                version.version
+                for version in models.ProjectVersion.newest(self.session, project.id)
+            ],
+            ["2.0", "1.0", "3.0"],
+        )
+
 
 class PackageTestCase(DatabaseTestCase):
     """Tests for Package model."""
@@ -1014,6 +1325,39 @@ class ProjectFlagTestCase(DatabaseTestCase):
         self.assertEqual(flags, 2)
 
 
+class BackendRateLimitTests(DatabaseTestCase):
+    """Tests for the :class:`anitya.db.models.BackendRateLimit` class."""
+
+    def test_set(self):
+        """Assert that rate limit is created and later reset time is kept."""
+        now = arrow.utcnow()
+
+        models.BackendRateLimit.set(self.session, "GitHub", now.shift(hours=1).datetime)
+        models.BackendRateLimit.set(self.session, "GitHub", now.shift(hours=2).datetime)
+        models.BackendRateLimit.set(
+            self.session, "GitHub", now.shift(minutes=30).datetime
+        )
+
+        rate_limits = models.BackendRateLimit.active(self.session, now.datetime)
+        self.assertEqual(rate_limits, {"GitHub": now.shift(hours=2).datetime})
+
+    def test_set_existing(self):
+        """Assert that rate limit stored by other node is updated."""
+        now = arrow.utcnow()
+        self.session.add(
+            models.BackendRateLimit(
+                backend="GitHub", reset_time=now.shift(hours=1).datetime
+            )
+        )
+        self.session.commit()
+
+        models.BackendRateLimit.set(self.session, "GitHub", now.shift(hours=2).datetime)
+
+        self.assertEqual(self.session.query(models.BackendRateLimit).count(), 1)
+        rate_limits = models.BackendRateLimit.active(self.session, now.datetime)
+        self.assertEqual(rate_limits, {"GitHub": now.shift(hours=2).datetime})
+
+
 class GuidTests(unittest.TestCase):
     """Tests for the :class:`anitya.db.models.GUID` class."""
 
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Regression tests of the query plans of the case insensitive lookups.
+
+The statements executed by the lookups are recorded and explained by the
+database the tests run against. The tests fail if the plan reads any table
+by a sequential scan instead of an index.
+"""
+
+import re
+from contextlib import contextmanager
+
+from sqlalchemy_helpers import Base
+
+from anitya.db import models
+from anitya.tests.base import (
+    DatabaseTestCase,
+    count_queries,
+    create_distro,
+    create_package,
+    create_project,
+)
+
+
+def _postgresql_scans(plan):
+    """Tables read by sequential scan in the PostgreSQL JSON plan."""
+    scans = []
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            scans.append(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scans
+
+
+class QueryPlanTests(DatabaseTestCase):
+    """Assert that the case insensitive lookups use the indexes."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = self.flask_app.test_client()
+        create_distro(self.session)
+        create_project(self.session)
+        create_package(self.session)
+        # Some more rows, so the tables aren't trivial
+        for index in range(20):
+            project = models.Project(
+                name=f"project-{index}",
+                homepage=f"https://example.com/{index}",
+                backend="PyPI",
+            )
+            project.packages.append(
+                models.Packages(distro_name="Debian", package_name=f"package-{index}")
+            )
+            self.session.add(project)
+        self.session.commit()
+
+    def sequential_scans(self, statement, parameters):
+        """
+        Explain the statement and return the tables read by sequential scan.
+        """
+        connection = self.session.connection()
+        if connection.dialect.name == "postgresql":
+            # The planner prefers sequential scan of small tables, this makes
+            # it choose the index whenever it could be used
+            connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            plan = connection.exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + statement, parameters
+            ).scalar()
+            return _postgresql_scans(plan)
+
+        tables = "|".join(Base.metadata.tables)
+        scan = re.compile(rf"^SCAN ({tables})\b")
+        rows = connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        ).all()
+        return [row[3] for row in rows if scan.match(row[3])]
+
+    @contextmanager
+    def assertNoSequentialScan(self):
+        """Assert that no statement executed in the context scans a table."""
+        with count_queries(parameters=True) as statements:
+            yield
+        self.assertTrue(statements)
+        for statement, parameters in statements:
+            with self.subTest(statement=statement):
+                self.assertEqual(self.sequential_scans(statement, parameters), [])
+
+    def test_project_by_name_and_ecosystem(self):
+        """Assert the project lookup by name and ecosystem uses the index."""
+        with self.assertNoSequentialScan():
+            project = models.Project.by_name_and_ecosystem(
+                self.session, "Geany", "https://www.geany.org/"
+            )
+        self.assertEqual(project.name, "geany")
+
+    def test_project_by_distro(self):
+        """Assert the projects of distribution are found by the index."""
+        with self.assertNoSequentialScan():
+            projects = models.Project.by_distro(self.session, "fedora")
+        self.assertEqual(len(projects), 2)
+
+    def test_packages_get(self):
+        """Assert the package lookup uses the index."""
+        with self.assertNoSequentialScan():
+            package = models.Packages.get(self.session, 1, "fedora", "geany")
+        self.assertEqual(package.package_name, "geany")
+
+    def test_packages_by_package_name_distro(self):
+        """Assert the package lookup by name and distribution uses the index."""
+        with self.assertNoSequentialScan():
+            package = models.Packages.by_package_name_distro(
+                self.session, "geany", "FEDORA"
+            )
+        self.assertEqual(package.package_name, "geany")
+
+    def test_distro_by_name(self):
+        """Assert the distribution lookup uses the index."""
+        with self.assertNoSequentialScan():
+            distro = models.Distro.by_name(self.session, "fedora")
+        self.assertEqual(distro.name, "Fedora")
+
+    def test_api_by_ecosystem(self):
+        """Assert the API v1 project lookup by ecosystem uses the indexes."""
+        with self.assertNoSequentialScan():
+            output = self.app.get("/api/by_ecosystem/pypi/project-1")
+        self.assertEqual(output.status_code, 200)
+
+    def test_api_project_by_distro(self):
+        """Assert the API v1 project lookup by package uses the indexes."""
+        with self.assertNoSequentialScan():
+            output = self.app.get("/api/project/Fedora/geany")
+        self.assertEqual(output.status_code, 200)
+
+    def test_api_v2_packages_filters(self):
+        """Assert the API v2 packages filters use the indexes."""
+        for query in (
+            "distribution=fedora",
+            "name=GEANY",
+            "distribution=fedora&name=geany",
+        ):
+            with self.subTest(query=query), self.assertNoSequentialScan():
+                output = self.app.get("/api/v2/packages/?" + query)
+            self.assertEqual(output.status_code, 200)
+
+    def test_api_v2_projects_filters(self):
+        """Assert the API v2 projects filters use the indexes."""
+        for query in ("ecosystem=pypi", "name=GEANY", "ecosystem=pypi&name=project-1"):
+            with self.subTest(query=query), self.assertNoSequentialScan():
+                output = self.app.get("/api/v2/projects/?" + query)
+            self.assertEqual(output.status_code, 200)
+
+    def test_api_v2_versions_lookup(self):
+        """Assert the API v2 bulk versions lookup uses the indexes."""
+        with self.assertNoSequentialScan():
+            output = self.app.post(
+                "/api/v2/versions/lookup/",
+                json={
+                    "project_ids": [1, 2],
+                    "packages": [
+                        {"distribution": "fedora", "name": "geany"},
+                        {"distribution": "Debian", "name": "package-1"},
+                    ],
+                    "versions": True,
+                },
+            )
+        self.assertEqual(output.status_code, 200)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for the :mod:`anitya.db.search` module."""
+
+import mock
+from sqlalchemy import select
+
+from anitya.db import models, search
+from anitya.tests.base import DatabaseTestCase, create_project
+
+
+class IlikeTests(DatabaseTestCase):
+    """Tests for the :func:`anitya.db.search.ilike` function."""
+
+    def _names(self, pattern, column=models.Project.name):
+        """Names of the projects matching the pattern."""
+        query = (
+            select(models.Project.name)
+            .where(search.ilike(self.session, column, pattern))
+            .order_by(models.Project.name)
+        )
+        return self.session.scalars(query).all()
+
+    def test_shadow_table(self):
+        """Assert that the condition is evaluated on the shadow table."""
+        condition = search.ilike(self.session, models.Project.name, "%gea%")
+
+        self.assertIn("projects_search", str(condition.compile()))
+
+    def test_case_insensitive(self):
+        """Assert that the search is case insensitive."""
+        create_project(self.session)
+
+        self.assertEqual(self._names("%GEA%"), ["geany"])
+        self.assertEqual(self._names("%spec"), ["R2spec"])
+
+    def test_short_pattern(self):
+        """Assert that patterns shorter than the trigram are matched."""
+        create_project(self.session)
+
+        self.assertEqual(self._names("%r%"), ["R2spec", "subsurface"])
+        self.assertEqual(self._names("%"), ["R2spec", "geany", "subsurface"])
+
+    def test_logs(self):
+        """Assert that the logs are searched."""
+        create_project(self.session)
+        project = models.Project.get(self.session, 2)
+        project.logs = "Error: Unable to retrieve versions"
+        self.session.commit()
+
+        self.assertEqual(
+            self._names("%unable to%", models.Project.logs), ["subsurface"]
+        )
+
+    def test_sync_update_delete(self):
+        """Assert that the shadow table follows the changes of the table."""
+        create_project(self.session)
+        project = models.Project.get(self.session, 1)
+        project.name = "geany-plugins"
+        self.session.commit()
+
+        self.assertEqual(self._names("%plugins"), ["geany-plugins"])
+
+        project.name = "scite"
+        self.session.commit()
+
+        self.assertEqual(self._names("%gea%"), [])
+        self.assertEqual(self._names("%cit%"), ["scite"])
+
+        self.session.delete(project)
+        self.session.commit()
+
+        self.assertEqual(self._names("%cit%"), [])
+
+    def test_not_indexed_column(self):
+        """Assert that the column without shadow table uses ILIKE."""
+        condition = search.ilike(self.session, models.Project.homepage, "%gea%")
+
+        self.assertNotIn("projects_search", str(condition.compile()))
+
+    def test_other_database(self):
+        """Assert that ILIKE is used on other databases."""
+        with mock.patch.object(self.session.get_bind().dialect, "name", "postgresql"):
+            condition = search.ilike(self.session, models.Project.name, "%gea%")
+
+        self.assertNotIn("projects_search", str(condition.compile()))
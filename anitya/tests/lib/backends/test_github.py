@@ -45,6 +45,7 @@ class GithubBackendtests(DatabaseTestCase):
 
         create_distro(self.session)
         self.create_projects()
+        backend.token_pool.clear()
 
     def create_projects(self):
         """Create some basic projects to work with."""
@@ -521,6 +522,147 @@ class GithubBackendtests(DatabaseTestCase):
         obs = backend.GithubBackend.get_ordered_versions(project)
         self.assertEqual(obs, exp)
 
+    @mock.patch.dict("anitya.config.config", {"GITHUB_ACCESS_TOKEN": "foobar"})
+    @mock.patch("anitya.lib.backends.http_session.post")
+    def test_get_versions_batch(self, mock_post):
+        """Assert that versions of multiple projects are retrieved by single query."""
+        project = models.Project(
+            id=1, name="foo", homepage="https://foo.bar", version_url="foo/bar"
+        )
+        project_releases = models.Project(
+            id=2,
+            name="bar",
+            homepage="https://foo.bar",
+            version_url="bar/foo",
+            releases_only=True,
+            version_filter="rc",
+        )
+        project_missing = models.Project(
+            id=3, name="missing", homepage="https://foo.bar", version_url="foo/missing"
+        )
+        project_invalid = models.Project(id=4, name="invalid", homepage="foobar")
+        mock_resp = mock.MagicMock()
+        mock_resp.ok = True
+        mock_resp.headers = {"X-RateLimit-Remaining": "4000"}
+        mock_resp.json.return_value = {
+            "data": {
+                "repo0": {
+                    "refs": {
+                        "totalCount": 1,
+                        "edges": [
+                            {"node": {"name": "1.0", "target": {"commitUrl": "url"}}}
+                        ],
+                    }
+                },
+                "repo1": {
+                    "releases": {
+                        "totalCount": 2,
+                        "edges": [
+                            {
+                                "node": {
+                                    "name": "2.0",
+                                    "tag": {
+                                        "name": "2.0",
+                                        "target": {"commitUrl": "u"},
+                                    },
+                                }
+                            },
+                            {
+                                "node": {
+                                    "name": "2.1rc1",
+                                    "tag": {
+                                        "name": "2.1rc1",
+                                        "target": {"commitUrl": "u"},
+                                    },
+                                }
+                            },
+                        ],
+                    }
+                },
+                "repo2": None,
+                "rateLimit": {
+                    "limit": 5000,
+                    "remaining": 4000,
+                    "resetAt": "2026-01-01T00:00:00Z",
+                },
+            },
+            "errors": [
+                {
+                    "type": "NOT_FOUND",
+                    "path": ["repo2"],
+                    "message": "Could not resolve to a Repository",
+                }
+            ],
+        }
+        mock_post.return_value = mock_resp
+
+        results = backend.GithubBackend.get_versions_batch(
+            [project, project_releases, project_missing, project_invalid]
+        )
+
+        mock_post.assert_called_once()
+        query = mock_post.call_args.kwargs["json"]["query"]
+        self.assertIn('repo0: repository(owner: "foo", name: "bar")', query)
+        self.assertIn('repo1: repository(owner: "bar", name: "foo")', query)
+        self.assertIn('repo2: repository(owner: "foo", name: "missing")', query)
+        self.assertEqual(results[1], [{"version": "1.0", "commit_url": "url"}])
+        self.assertEqual(results[2], [{"version": "2.0", "commit_url": "u"}])
+        self.assertIsInstance(results[3], AnityaPluginException)
+        self.assertIn("NOT_FOUND", str(results[3]))
+        self.assertIsInstance(results[4], AnityaPluginException)
+        self.assertIn("incorrectly set up", str(results[4]))
+
+    @mock.patch.dict("anitya.config.config", {"GITHUB_ACCESS_TOKEN": "foobar"})
+    @mock.patch("anitya.lib.backends.http_session.post")
+    def test_get_versions_batch_ratelimit_reached(self, mock_post):
+        """Assert that rate limit is reported for every project in batch."""
+        mock_resp = mock.MagicMock()
+        mock_resp.ok = True
+        mock_resp.headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0"}
+        mock_post.return_value = mock_resp
+        projects = [
+            models.Project(id=1, name="foo", homepage="h", version_url="foo/bar"),
+            models.Project(id=2, name="bar", homepage="h", version_url="bar/foo"),
+        ]
+
+        results = backend.GithubBackend.get_versions_batch(projects)
+
+        self.assertIsInstance(results[1], RateLimitException)
+        self.assertIsInstance(results[2], RateLimitException)
+
+    @mock.patch.object(backend.GithubBackend, "get_versions_batch")
+    def test_get_versions_registered_batch(self, mock_batch):
+        """Assert that registered batch is retrieved only once."""
+        projects = [
+            models.Project(id=1, name="foo", homepage="h", version_url="foo/bar"),
+            models.Project(id=2, name="bar", homepage="h", version_url="bar/foo"),
+        ]
+        mock_batch.return_value = {
+            1: [{"version": "1.0", "commit_url": "url"}],
+            2: AnityaPluginException("Error"),
+        }
+        backend.GithubBackend.register_batch(projects)
+
+        self.assertEqual(
+            backend.GithubBackend.get_versions(projects[0]),
+            [{"version": "1.0", "commit_url": "url"}],
+        )
+        self.assertRaises(
+            AnityaPluginException, backend.GithubBackend.get_versions, projects[1]
+        )
+        mock_batch.assert_called_once_with(projects)
+        self.assertEqual(backend.GithubBackend._batches, {})
+
+    def test_clear_batches(self):
+        """Assert that registered batches are forgotten."""
+        backend.GithubBackend.register_batch(
+            [models.Project(id=1, name="foo", homepage="h", version_url="foo/bar")]
+        )
+
+        backend.GithubBackend.clear_batches()
+
+        self.assertEqual(backend.GithubBackend._batches, {})
+
 
 class JsonTests(unittest.TestCase):
     """
@@ -553,6 +695,7 @@ class JsonTests(unittest.TestCase):
     }
     rateLimit {
         limit
+        cost
         remaining
         resetAt
     }
@@ -577,6 +720,7 @@ class JsonTests(unittest.TestCase):
     }
     rateLimit {
         limit
+        cost
         remaining
         resetAt
     }
@@ -585,6 +729,78 @@ class JsonTests(unittest.TestCase):
         obs = backend.prepare_query("foo", "bar", True)
         self.assertMultiLineEqual(exp, obs)
 
+    def test_prepare_batch_query(self):
+        """Assert batch query creation"""
+        exp = """
+{
+    repo0: repository(owner: "foo", name: "bar") {
+        refs (refPrefix: "refs/tags/", orderBy: {field: TAG_COMMIT_DATE, direction: ASC}, last: 50) {
+            totalCount
+            edges {
+                node {
+                    name target { commitUrl }
+                }
+            }
+        }
+    }
+    repo1: repository(owner: "bar", name: "foo") {
+        releases (orderBy: {field: CREATED_AT, direction: ASC}, last: 50) {
+            totalCount
+            edges {
+                node {
+                    name tag { name target { commitUrl } }
+                }
+            }
+        }
+    }
+    rateLimit {
+        limit
+        cost
+        remaining
+        resetAt
+    }
+}"""  # noqa: E501
+
+        obs = backend.prepare_batch_query(
+            [("repo0", "foo", "bar", False), ("repo1", "bar", "foo", True)]
+        )
+        self.assertMultiLineEqual(exp, obs)
+
+    def test_get_alias_json(self):
+        """Assert that response for single alias is extracted."""
+        json = {
+            "data": {
+                "repo0": {"refs": {"totalCount": 0, "edges": []}},
+                "repo1": None,
+                "rateLimit": {"limit": 5000},
+            },
+            "errors": [{"type": "NOT_FOUND", "message": "BAR", "path": ["repo1"]}],
+        }
+
+        self.assertEqual(
+            backend.get_alias_json(json, "repo0"),
+            {
+                "data": {
+                    "repository": {"refs": {"totalCount": 0, "edges": []}},
+                    "rateLimit": {"limit": 5000},
+                }
+            },
+        )
+        self.assertEqual(
+            backend.get_alias_json(json, "repo1"),
+            {"errors": [{"type": "NOT_FOUND", "message": "BAR", "path": ["repo1"]}]},
+        )
+        self.assertEqual(
+            backend.get_alias_json(json, "repo2"),
+            {"errors": [{"type": "NOT_FOUND", "message": "No data returned"}]},
+        )
+
+    def test_get_alias_json_global_error(self):
+        """Assert that error without path is reported for every alias."""
+        json = {"errors": [{"type": "FOO", "message": "BAR"}]}
+
+        self.assertEqual(backend.get_alias_json(json, "repo0"), json)
+
     def test_parse_json(self):
         """Test parsing a JSON response without errors."""
         json = {
@@ -653,6 +869,204 @@ class JsonTests(unittest.TestCase):
         self.assertEqual([], obs)
 
 
+class TokenPoolTests(unittest.TestCase):
+    """Tests for the pool of GitHub access tokens."""
+
+    def setUp(self):
+        """Set up the environnment, ran before every tests."""
+        self.pool = backend.TokenPool()
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": None, "GITHUB_ACCESS_TOKENS": []},
+    )
+    def test_acquire_no_token(self):
+        """Assert that exception is raised when no token is configured."""
+        self.assertRaises(AnityaPluginException, self.pool.acquire)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": "foobar", "GITHUB_ACCESS_TOKENS": []},
+    )
+    def test_acquire_single_token(self):
+        """Assert that GITHUB_ACCESS_TOKEN is used when pool is not configured."""
+        self.assertEqual(self.pool.acquire(), "foobar")
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": "foobar", "GITHUB_ACCESS_TOKENS": ["foo", "bar"]},
+    )
+    def test_acquire_most_remaining(self):
+        """Assert that token with the most budget left is used."""
+        reset = arrow.utcnow().shift(hours=1).isoformat()
+        self.pool.update("foo", {"limit": 5000, "remaining": 10, "resetAt": reset})
+        self.pool.update("bar", {"limit": 5000, "remaining": 20, "resetAt": reset})
+
+        self.assertEqual(self.pool.acquire(), "bar")
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": None, "GITHUB_ACCESS_TOKENS": ["foo", "bar"]},
+    )
+    def test_acquire_exhausted(self):
+        """Assert that exhausted token is skipped."""
+        reset = arrow.utcnow().shift(hours=1)
+        self.pool.exhaust("foo", reset)
+
+        self.assertEqual(self.pool.acquire(), "bar")
+
+        self.pool.exhaust("bar", reset.shift(minutes=1))
+
+        with self.assertRaises(RateLimitException) as context:
+            self.pool.acquire()
+        self.assertEqual(context.exception.reset_time, reset)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": "foobar", "GITHUB_ACCESS_TOKENS": []},
+    )
+    def test_acquire_window_reset(self):
+        """Assert that budget is renewed when the window is reset."""
+        self.pool.update(
+            "foobar",
+            {
+                "limit": 5000,
+                "remaining": 0,
+                "resetAt": arrow.utcnow().shift(seconds=-1).isoformat(),
+            },
+        )
+
+        self.assertEqual(self.pool.acquire(), "foobar")
+        self.assertEqual(self.pool.metrics()[0]["remaining"], 5000)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {
+            "GITHUB_ACCESS_TOKEN": "foobar",
+            "GITHUB_ACCESS_TOKENS": [],
+            "GITHUB_PACING": True,
+            "GITHUB_PACING_MAX_WAIT": 60,
+        },
+    )
+    @mock.patch("anitya.lib.backends.github.time")
+    def test_acquire_pacing(self, mock_time):
+        """Assert that requests are spread evenly till the reset of window."""
+        mock_time.time.return_value = 1000.0
+        # 100 seconds left with budget for 10 requests
+        self.pool.update(
+            "foobar",
+            {
+                "limit": 5000,
+                "remaining": 20,
+                "cost": 2,
+                "resetAt": arrow.get(1100).isoformat(),
+            },
+        )
+
+        self.pool.acquire()
+        mock_time.sleep.assert_not_called()
+
+        self.pool.acquire()
+        mock_time.sleep.assert_called_once_with(10.0)
+        self.assertEqual(self.pool.metrics()[0]["waited"], 10.0)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {
+            "GITHUB_ACCESS_TOKEN": "foobar",
+            "GITHUB_ACCESS_TOKENS": [],
+            "GITHUB_PACING": True,
+            "GITHUB_PACING_MAX_WAIT": 5,
+        },
+    )
+    @mock.patch("anitya.lib.backends.github.time")
+    def test_acquire_pacing_max_wait(self, mock_time):
+        """Assert that exception is raised when the request would wait too long."""
+        mock_time.time.return_value = 1000.0
+        self.pool.update(
+            "foobar",
+            {
+                "limit": 5000,
+                "remaining": 10,
+                "cost": 1,
+                "resetAt": arrow.get(1100).isoformat(),
+            },
+        )
+
+        self.pool.acquire()
+
+        self.assertRaises(RateLimitException, self.pool.acquire)
+        mock_time.sleep.assert_not_called()
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": None, "GITHUB_ACCESS_TOKENS": ["token1234"]},
+    )
+    def test_metrics(self):
+        """Assert that metrics contains the budget with masked token."""
+        self.pool.update(
+            "token1234",
+            {
+                "limit": 5000,
+                "remaining": 4000,
+                "cost": 1,
+                "resetAt": "2099-01-01T00:00:00Z",
+            },
+        )
+        self.pool.acquire()
+
+        exp = [
+            {
+                "token": "...1234",
+                "limit": 5000,
+                "remaining": 4000,
+                "reset_at": "2099-01-01T00:00:00+00:00",
+                "cost": 1,
+                "requests": 1,
+                "waited": 0.0,
+            }
+        ]
+        self.assertEqual(self.pool.metrics(), exp)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"GITHUB_ACCESS_TOKEN": None, "GITHUB_ACCESS_TOKENS": ["foo", "bar"]},
+    )
+    @mock.patch("anitya.lib.backends.github.token_pool", backend.TokenPool())
+    @mock.patch("anitya.lib.backends.http_session.post")
+    def test_post_query_rotate_token(self, mock_post):
+        """Assert that next token is used when the first one is rate limited."""
+        limited = mock.Mock()
+        limited.ok = False
+        limited.status_code = 403
+        limited.headers = {"X-RateLimit-Reset": "2000000000"}
+        success = mock.Mock()
+        success.ok = True
+        success.headers = {"X-RateLimit-Remaining": "10"}
+        success.json.return_value = {
+            "data": {
+                "rateLimit": {
+                    "limit": 5000,
+                    "remaining": 10,
+                    "cost": 1,
+                    "resetAt": "2033-05-18T03:33:20Z",
+                }
+            }
+        }
+        mock_post.side_effect = [limited, success]
+
+        obs = backend.GithubBackend._post_query("query", "project")
+
+        self.assertEqual(obs, success.json.return_value)
+        tokens = [
+            call.kwargs["headers"]["Authorization"] for call in mock_post.call_args_list
+        ]
+        self.assertEqual(tokens, ["bearer foo", "bearer bar"])
+        metrics = backend.token_pool.metrics()
+        self.assertEqual(metrics[0]["remaining"], 0)
+        self.assertEqual(metrics[1]["remaining"], 10)
+
+
 if __name__ == "__main__":
     SUITE = unittest.TestLoader().loadTestsFromTestCase(GithubBackendtests)
     unittest.TextTestRunner(verbosity=2).run(SUITE)
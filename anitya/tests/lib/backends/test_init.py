@@ -24,6 +24,7 @@ Unit tests for the anitya.lib.backends module.
 
 from __future__ import absolute_import, unicode_literals
 
+import hashlib
 import re
 import unittest
 import urllib.request as urllib
@@ -31,11 +32,13 @@ from urllib.error import URLError
 
 import arrow
 import mock
+import requests
 
 import anitya
 from anitya.config import config
-from anitya.lib import backends
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib import backends, host_limiter, http_validators
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
+from anitya.lib.response_cache import ResponseCache
 from anitya.tests.base import AnityaTestCase
 
 
@@ -119,6 +122,18 @@ class BaseBackendTests(AnityaTestCase):
 
         self.assertRaises(AnityaPluginException, self.backend.call_url, url)
 
+    @mock.patch.dict("anitya.config.config", {"HOST_MAX_IN_FLIGHT": 1})
+    @mock.patch("anitya.lib.backends.host_limiter", host_limiter.HostLimiter())
+    @mock.patch("urllib.request.urlopen")
+    def test_call_ftp_url_release(self, mock_urlopen):
+        """Assert that FTP slot is released on any error."""
+        mock_urlopen.side_effect = TimeoutError()
+        url = "ftp://example.com"
+
+        self.assertRaises(TimeoutError, self.backend.call_url, url)
+
+        self.assertEqual(backends.host_limiter._hosts["example.com"].in_flight, 0)
+
     def test_expand_subdirs(self):
         """Assert expanding subdirs"""
         exp = "http://ftp.fi.muni.cz/pub/linux/fedora/linux/"
@@ -152,6 +167,89 @@ class BaseBackendTests(AnityaTestCase):
             url, headers=exp_headers, timeout=60, verify=True
         )
 
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"HOST_MAX_IN_FLIGHT": 4, "HOST_FAILURE_THRESHOLD": 1},
+    )
+    @mock.patch("anitya.lib.backends.host_limiter", host_limiter.HostLimiter())
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_call_url_host_unavailable(self, mock_http_session):
+        """Assert that host with open circuit isn't called."""
+        mock_http_session.get.side_effect = requests.exceptions.ConnectTimeout()
+        url = "https://www.example.com/"
+
+        self.assertRaises(
+            requests.exceptions.ConnectTimeout, self.backend.call_url, url
+        )
+        self.assertRaises(HostUnavailableException, self.backend.call_url, url)
+
+        mock_http_session.get.assert_called_once()
+
+    @mock.patch.dict("anitya.config.config", {"HOST_MAX_IN_FLIGHT": 4})
+    @mock.patch("anitya.lib.backends.host_limiter", host_limiter.HostLimiter())
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_call_url_throttled(self, mock_http_session):
+        """Assert that Retry-After of throttled response is respected."""
+        mock_http_session.get.return_value.status_code = 429
+        mock_http_session.get.return_value.headers = {"Retry-After": "3600"}
+        url = "https://www.example.com/"
+
+        self.backend.call_url(url)
+
+        self.assertRaises(HostUnavailableException, self.backend.call_url, url)
+        mock_http_session.get.assert_called_once()
+
+    @mock.patch("anitya.lib.backends.response_cache", ResponseCache())
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_call_url_response_cache(self, mock_http_session):
+        """Assert that response is shared when the cache is enabled."""
+        mock_http_session.get.return_value.status_code = 200
+        url = "https://www.example.com/"
+        backends.response_cache.start(10)
+
+        resp = self.backend.call_url(url)
+
+        self.assertIs(self.backend.call_url(url), resp)
+        mock_http_session.get.assert_called_once_with(
+            url, headers=self.headers, timeout=60, verify=True
+        )
+
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_call_url_http_validators(self, mock_http_session):
+        """Assert that validators are replayed and recorded in tracked check."""
+        mock_http_session.get.return_value.status_code = 200
+        mock_http_session.get.return_value.headers = {"ETag": '"def"'}
+        mock_http_session.get.return_value.content = b""
+        url = "https://www.example.com/"
+        time = arrow.utcnow()
+        exp_headers = self.headers.copy()
+        exp_headers["If-modified-since"] = (
+            time.format("ddd, DD MMM YYYY HH:mm:ss") + " GMT"
+        )
+        exp_headers["If-None-Match"] = '"abc"'
+
+        with http_validators.track({url: {"etag": '"abc"'}}) as scope:
+            self.backend.call_url(url, last_change=time)
+
+        mock_http_session.get.assert_called_once_with(
+            url, headers=exp_headers, timeout=60, verify=True
+        )
+        exp = {url: {"etag": '"def"', "digest": hashlib.sha256(b"").hexdigest()}}
+        self.assertEqual(scope.result(), exp)
+
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_call_url_http_validators_unconditional(self, mock_http_session):
+        """Assert that validators are not used without last change."""
+        url = "https://www.example.com/"
+
+        with http_validators.track({url: {"etag": '"abc"'}}) as scope:
+            self.backend.call_url(url)
+
+        mock_http_session.get.assert_called_once_with(
+            url, headers=self.headers, timeout=60, verify=True
+        )
+        self.assertEqual(scope.result(), {})
+
 
 class GetVersionsByRegexTests(unittest.TestCase):
     """
@@ -170,6 +268,23 @@ class GetVersionsByRegexTests(unittest.TestCase):
 
         self.assertEqual(versions, [])
 
+    @mock.patch("anitya.lib.backends.BaseBackend.call_url")
+    def test_get_versions_by_regex_host_unavailable(self, mock_call_url):
+        """Assert that unavailable host isn't reported as plugin error."""
+        mock_call_url.side_effect = HostUnavailableException(
+            "example.com", "2018-08-24T09:36:15Z"
+        )
+        mock_project = mock.Mock()
+        mock_project.get_time_last_created_version = mock.MagicMock(return_value=None)
+
+        self.assertRaises(
+            HostUnavailableException,
+            backends.get_versions_by_regex,
+            "url",
+            "regex",
+            mock_project,
+        )
+
     @mock.patch("anitya.lib.backends.BaseBackend.call_url")
     def test_get_versions_by_regex_string_response(self, mock_call_url):
         """Assert that string response is handled correctly."""
@@ -27,7 +27,7 @@ import mock
 
 import anitya.lib.backends.pypi as backend
 from anitya.db import models
-from anitya.lib.exceptions import AnityaPluginException
+from anitya.lib.exceptions import AnityaPluginException, HostUnavailableException
 from anitya.tests.base import DatabaseTestCase, create_distro
 
 BACKEND = "PyPI"
@@ -166,6 +166,24 @@ class PypiBackendtests(DatabaseTestCase):
             m_call.assert_called_with(exp_url, last_change=None)
             self.assertEqual(versions, [])
 
+    def test_pypi_get_versions_host_unavailable(self):
+        """Assert that unavailable host isn't reported as plugin error."""
+        project = models.Project(
+            name="repo_manager",
+            homepage="https://pypi.org/project/repo_manager/",
+            backend=BACKEND,
+        )
+        self.session.add(project)
+        self.session.commit()
+
+        with mock.patch("anitya.lib.backends.BaseBackend.call_url") as m_call:
+            m_call.side_effect = HostUnavailableException(
+                "pypi.org", "2018-08-24T09:36:15Z"
+            )
+            self.assertRaises(
+                HostUnavailableException, backend.PypiBackend.get_versions, project
+            )
+
     def test_pypi_check_feed(self):
         """Test the check_feed method of the pypi backend."""
         generator = backend.PypiBackend.check_feed()
@@ -92,3 +92,27 @@ class RateLimitExceptionTests(unittest.TestCase):
         e = exceptions.RateLimitException(time)
 
         self.assertEqual(exp, str(e))
+
+
+class HostUnavailableExceptionTests(unittest.TestCase):
+    """Tests for :class:`exceptions.HostUnavailableException`."""
+
+    def test_attributes(self):
+        """Assert the properties return valid values."""
+        time = "2018-08-24T09:36:15Z"
+        e = exceptions.HostUnavailableException("ftp.gnu.org", time)
+
+        self.assertEqual(e.host, "ftp.gnu.org")
+        self.assertEqual(arrow.get(time), e.reset_time)
+        self.assertIsInstance(e, exceptions.RateLimitException)
+
+    def test_str(self):
+        """Assert the __str__ method provides a human-readable value."""
+        time = "2018-08-24T09:36:15Z"
+        exp = (
+            'Host "ftp.gnu.org" is unavailable. '
+            'Will be called again in "2018-08-24T09:36:15+00:00".'
+        )
+        e = exceptions.HostUnavailableException("ftp.gnu.org", time)
+
+        self.assertEqual(exp, str(e))
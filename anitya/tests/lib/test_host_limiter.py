@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for :mod:`anitya.lib.host_limiter`."""
+
+import unittest
+
+import arrow
+import mock
+
+from anitya.lib import host_limiter
+from anitya.lib.exceptions import HostUnavailableException
+
+HOST = "ftp.gnu.org"
+
+
+class ParseRetryAfterTests(unittest.TestCase):
+    """Tests for :func:`host_limiter.parse_retry_after`."""
+
+    def test_seconds(self):
+        """Assert that number of seconds is parsed."""
+        self.assertEqual(host_limiter.parse_retry_after("120"), 120.0)
+
+    @mock.patch("anitya.lib.host_limiter.time")
+    def test_date(self, mock_time):
+        """Assert that HTTP date is converted to number of seconds."""
+        mock_time.time.return_value = arrow.get("2015-10-21T07:27:00Z").timestamp()
+
+        obs = host_limiter.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT")
+
+        self.assertEqual(obs, 60.0)
+
+    def test_invalid(self):
+        """Assert that None is returned for missing or invalid value."""
+        self.assertIsNone(host_limiter.parse_retry_after(None))
+        self.assertIsNone(host_limiter.parse_retry_after("soon"))
+
+
+@mock.patch.dict(
+    "anitya.config.config",
+    {
+        "HOST_MAX_IN_FLIGHT": 4,
+        "HOST_BACKOFF_MAX": 300,
+        "HOST_FAILURE_THRESHOLD": 2,
+        "HOST_CIRCUIT_TIMEOUT": 300,
+    },
+)
+@mock.patch("anitya.lib.host_limiter.time")
+class HostLimiterTests(unittest.TestCase):
+    """Tests for :class:`host_limiter.HostLimiter`."""
+
+    def setUp(self):
+        """Set up the environnment, ran before every tests."""
+        self.limiter = host_limiter.HostLimiter()
+
+    def test_disabled(self, mock_time):
+        """Assert that nothing is tracked when the limiter is disabled."""
+        with mock.patch.dict("anitya.config.config", {"HOST_MAX_IN_FLIGHT": 0}):
+            self.limiter.acquire(HOST)
+            self.limiter.release(HOST, failed=True)
+
+        self.assertEqual(self.limiter.metrics(), {})
+
+    def test_success(self, mock_time):
+        """Assert that successful requests keep the circuit closed."""
+        mock_time.time.return_value = 1000.0
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=200)
+
+        exp = {
+            HOST: {
+                "circuit": "closed",
+                "window": 4.0,
+                "failures": 0,
+                "requests": 1,
+                "throttled": 0,
+                "rejected": 0,
+            }
+        }
+        self.assertEqual(self.limiter.metrics(), exp)
+
+    def test_throttle_retry_after(self, mock_time):
+        """Assert that throttled host isn't called till Retry-After passes."""
+        mock_time.time.return_value = 1000.0
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=429, retry_after="60")
+
+        with self.assertRaises(HostUnavailableException) as context:
+            self.limiter.acquire(HOST)
+        self.assertEqual(context.exception.reset_time, arrow.get(1060))
+        self.assertEqual(self.limiter.metrics()[HOST]["window"], 2.0)
+
+        mock_time.time.return_value = 1060.0
+        self.limiter.acquire(HOST)
+
+    def test_throttle_backoff(self, mock_time):
+        """Assert that backoff is doubled on every throttled response."""
+        mock_time.time.return_value = 1000.0
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=503)
+        mock_time.time.return_value = 1001.0
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=503)
+
+        with self.assertRaises(HostUnavailableException) as context:
+            self.limiter.acquire(HOST)
+        self.assertEqual(context.exception.reset_time, arrow.get(1003))
+        self.assertEqual(self.limiter.metrics()[HOST]["window"], 1.0)
+
+    def test_additive_increase(self, mock_time):
+        """Assert that window grows with every successful response."""
+        mock_time.time.return_value = 1000.0
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=429, retry_after="0")
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=429, retry_after="0")
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=200)
+
+        self.assertEqual(self.limiter.metrics()[HOST]["window"], 2.0)
+
+    def test_circuit_open(self, mock_time):
+        """Assert that consecutive failures open the circuit."""
+        mock_time.time.return_value = 1000.0
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, failed=True)
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=500)
+
+        with self.assertRaises(HostUnavailableException) as context:
+            self.limiter.acquire(HOST)
+        self.assertEqual(context.exception.reset_time, arrow.get(1300))
+        self.assertEqual(self.limiter.metrics()[HOST]["circuit"], "open")
+        self.assertEqual(self.limiter.metrics()[HOST]["rejected"], 1)
+
+    def test_circuit_success_resets_failures(self, mock_time):
+        """Assert that only consecutive failures open the circuit."""
+        mock_time.time.return_value = 1000.0
+
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, failed=True)
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, status_code=404)
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, failed=True)
+
+        self.assertEqual(self.limiter.metrics()[HOST]["circuit"], "closed")
+
+    def test_circuit_half_open(self, mock_time):
+        """Assert that only one probe is let through half-open circuit."""
+        mock_time.time.return_value = 1000.0
+        for _ in range(2):
+            self.limiter.acquire(HOST)
+            self.limiter.release(HOST, failed=True)
+
+        mock_time.time.return_value = 1300.0
+        self.limiter.acquire(HOST)
+        self.assertEqual(self.limiter.metrics()[HOST]["circuit"], "half-open")
+        self.assertRaises(HostUnavailableException, self.limiter.acquire, HOST)
+
+        self.limiter.release(HOST, status_code=200)
+
+        self.assertEqual(self.limiter.metrics()[HOST]["circuit"], "closed")
+        self.limiter.acquire(HOST)
+        self.limiter.acquire(HOST)
+
+    def test_circuit_half_open_failure(self, mock_time):
+        """Assert that failed probe opens the circuit again."""
+        mock_time.time.return_value = 1000.0
+        for _ in range(2):
+            self.limiter.acquire(HOST)
+            self.limiter.release(HOST, failed=True)
+
+        mock_time.time.return_value = 1300.0
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST, failed=True)
+
+        with self.assertRaises(HostUnavailableException) as context:
+            self.limiter.acquire(HOST)
+        self.assertEqual(context.exception.reset_time, arrow.get(1600))
+
+    def test_hosts_are_independent(self, mock_time):
+        """Assert that open circuit of one host doesn't affect others."""
+        mock_time.time.return_value = 1000.0
+        for _ in range(2):
+            self.limiter.acquire(HOST)
+            self.limiter.release(HOST, failed=True)
+
+        self.limiter.acquire("download.gnome.org")
+
+    def test_clear(self, mock_time):
+        """Assert that state of every host is forgotten."""
+        mock_time.time.return_value = 1000.0
+        self.limiter.acquire(HOST)
+        self.limiter.release(HOST)
+
+        self.limiter.clear()
+
+        self.assertEqual(self.limiter.metrics(), {})
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for :mod:`anitya.lib.http_validators`."""
+
+import hashlib
+import unittest
+
+import mock
+
+from anitya.lib import http_validators
+
+URL = "https://registry.npmjs.org/foo"
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+BODY = b'{"versions": {}}'
+DIGEST = hashlib.sha256(BODY).hexdigest()
+
+
+def response(status_code=200, headers=None, content=BODY):
+    """Create mocked response."""
+    resp = mock.Mock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    resp.content = content
+    resp.url = URL
+    return resp
+
+
+class HttpValidatorsTests(unittest.TestCase):
+    """Tests for :mod:`anitya.lib.http_validators`."""
+
+    def test_apply_outside_scope(self):
+        """Assert that headers are not changed when the check is not tracked."""
+        headers = {}
+
+        http_validators.apply(URL, headers)
+        http_validators.record(URL, response(headers={"ETag": '"abc"'}))
+
+        self.assertEqual(headers, {})
+
+    def test_apply(self):
+        """Assert that stored validators are added to headers."""
+        stored = {URL: {"etag": '"abc"', "last_modified": LAST_MODIFIED}}
+        headers = {"If-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+
+        with http_validators.track(stored):
+            http_validators.apply(URL, headers)
+
+        exp = {"If-None-Match": '"abc"', "If-modified-since": LAST_MODIFIED}
+        self.assertEqual(headers, exp)
+
+    def test_apply_unknown_url(self):
+        """Assert that headers are not changed for URL without validators."""
+        headers = {}
+
+        with http_validators.track({URL: {"etag": '"abc"'}}):
+            http_validators.apply("https://example.com", headers)
+
+        self.assertEqual(headers, {})
+
+    def test_record(self):
+        """Assert that validators of full response are recorded."""
+        with http_validators.track({URL: {"etag": '"abc"'}}) as scope:
+            http_validators.apply(URL, {})
+            http_validators.record(
+                URL, response(headers={"ETag": '"def"', "Last-Modified": LAST_MODIFIED})
+            )
+
+        exp = {URL: {"etag": '"def"', "last_modified": LAST_MODIFIED, "digest": DIGEST}}
+        self.assertEqual(scope.result(), exp)
+        self.assertFalse(scope.is_not_modified())
+
+    def test_record_not_modified(self):
+        """Assert that stored validators are kept on not modified response."""
+        with http_validators.track({URL: {"etag": '"abc"'}}) as scope:
+            http_validators.apply(URL, {})
+            http_validators.record(URL, response(304))
+
+        self.assertEqual(scope.result(), {URL: {"etag": '"abc"'}})
+        self.assertTrue(scope.is_not_modified())
+
+    def test_record_same_digest(self):
+        """Assert that response with the same body is replaced by not modified."""
+        with http_validators.track({URL: {"digest": DIGEST}}) as scope:
+            http_validators.apply(URL, {})
+            resp = http_validators.record(URL, response(headers={"ETag": '"abc"'}))
+
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp.text, "")
+        self.assertEqual(resp.headers, {"ETag": '"abc"'})
+        self.assertEqual(scope.result(), {URL: {"etag": '"abc"', "digest": DIGEST}})
+        self.assertTrue(scope.is_not_modified())
+
+    def test_record_different_digest(self):
+        """Assert that response with different body is returned."""
+        orig = response(content=b"{}")
+
+        with http_validators.track({URL: {"digest": DIGEST}}) as scope:
+            http_validators.apply(URL, {})
+            resp = http_validators.record(URL, orig)
+
+        self.assertIs(resp, orig)
+        self.assertFalse(scope.is_not_modified())
+
+    def test_is_not_modified_nothing_requested(self):
+        """Assert that check without any request is not considered as not modified."""
+        with http_validators.track({}) as scope:
+            pass
+
+        self.assertFalse(scope.is_not_modified())
+
+    def test_result_drops_unused(self):
+        """Assert that validators of URLs not requested anymore are dropped."""
+        with http_validators.track({URL: {"etag": '"abc"'}}) as scope:
+            http_validators.apply("https://example.com", {})
+            http_validators.record("https://example.com", response())
+
+        self.assertEqual(list(scope.result()), ["https://example.com"])
+
+    def test_suspended(self):
+        """Assert that validators are not used in suspended scope."""
+        headers = {}
+
+        with http_validators.track({URL: {"etag": '"abc"'}}) as scope:
+            with http_validators.suspended():
+                http_validators.apply(URL, headers)
+
+        self.assertEqual(headers, {})
+        self.assertEqual(scope.requested, [])
+
+    def test_track_nested(self):
+        """Assert that the previous scope is restored."""
+        with http_validators.track({}) as outer:
+            with http_validators.track({}):
+                pass
+            http_validators.apply(URL, {})
+
+        self.assertEqual(outer.requested, [URL])
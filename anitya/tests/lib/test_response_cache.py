@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for :mod:`anitya.lib.response_cache`."""
+
+import threading
+import unittest
+
+import mock
+
+from anitya.lib.response_cache import ResponseCache
+
+URL = "https://ftp.gnu.org/gnu/"
+HEADERS = {"If-modified-since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+
+
+def response(status_code=200):
+    """Create mocked response with given status code."""
+    resp = mock.Mock()
+    resp.status_code = status_code
+    return resp
+
+
+class ResponseCacheTests(unittest.TestCase):
+    """Tests for :class:`anitya.lib.response_cache.ResponseCache`."""
+
+    def setUp(self):
+        """Set up the environnment, ran before every tests."""
+        self.cache = ResponseCache()
+        self.cache.start(2)
+
+    def test_disabled(self):
+        """Assert that cache is disabled till the run is started."""
+        self.assertFalse(ResponseCache().enabled())
+        self.assertTrue(self.cache.enabled())
+
+        self.cache.stop()
+
+        self.assertFalse(self.cache.enabled())
+
+    def test_fetch_hit(self):
+        """Assert that response is fetched only once."""
+        resp = response()
+        fetch = mock.Mock(return_value=resp)
+
+        self.assertIs(self.cache.fetch(URL, False, HEADERS, fetch), resp)
+        self.assertIs(self.cache.fetch(URL, False, HEADERS.copy(), fetch), resp)
+
+        fetch.assert_called_once_with()
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["hits"], 1)
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["hit_rate"], 0.5)
+
+    def test_fetch_insecure(self):
+        """Assert that secure and insecure requests are not shared."""
+        fetch = mock.Mock(side_effect=[response(), response()])
+
+        self.cache.fetch(URL, False, HEADERS, fetch)
+        self.cache.fetch(URL, True, HEADERS, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_fetch_headers(self):
+        """Assert that requests with different varying headers are not shared."""
+        fetch = mock.Mock(side_effect=lambda: response())
+        self.cache.start(10)
+
+        self.cache.fetch(URL, False, {}, fetch)
+        self.cache.fetch(URL, False, HEADERS, fetch)
+        self.cache.fetch(URL, False, {"If-None-Match": '"abc"'}, fetch)
+        self.cache.fetch(URL, False, {"Authorization": "token abc"}, fetch)
+        self.cache.fetch(URL, False, {"accept": "application/json"}, fetch)
+        self.cache.fetch(URL, False, {"User-Agent": "Anitya"}, fetch)
+
+        self.assertEqual(fetch.call_count, 5)
+
+    def test_fetch_not_modified(self):
+        """Assert that response which isn't full isn't cached."""
+        fetch = mock.Mock(side_effect=[response(304), response(200)])
+
+        self.assertEqual(self.cache.fetch(URL, False, HEADERS, fetch).status_code, 304)
+        self.assertEqual(self.cache.fetch(URL, False, {}, fetch).status_code, 200)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_fetch_ftp(self):
+        """Assert that FTP content is cached."""
+        fetch = mock.Mock(return_value="debian\r\n")
+
+        self.cache.fetch("ftp://ftp.debian.org/", False, HEADERS, fetch)
+        obs = self.cache.fetch("ftp://ftp.debian.org/", False, HEADERS, fetch)
+
+        self.assertEqual(obs, "debian\r\n")
+        fetch.assert_called_once_with()
+
+    def test_fetch_exception(self):
+        """Assert that failed request isn't cached."""
+        fetch = mock.Mock(side_effect=[ValueError("error"), response()])
+
+        self.assertRaises(ValueError, self.cache.fetch, URL, False, HEADERS, fetch)
+        self.cache.fetch(URL, False, HEADERS, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_fetch_lru(self):
+        """Assert that least recently used response is evicted."""
+        fetch = mock.Mock(side_effect=lambda: response())
+
+        self.cache.fetch("url1", False, HEADERS, fetch)
+        self.cache.fetch("url2", False, HEADERS, fetch)
+        # Mark url1 as recently used
+        self.cache.fetch("url1", False, HEADERS, fetch)
+        self.cache.fetch("url3", False, HEADERS, fetch)
+        self.cache.fetch("url1", False, HEADERS, fetch)
+        self.cache.fetch("url2", False, HEADERS, fetch)
+
+        self.assertEqual(fetch.call_count, 4)
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["size"], 2)
+        self.assertEqual(metrics["evictions"], 2)
+
+    def test_fetch_coalesced(self):
+        """Assert that concurrent requests of the same URL are sent only once."""
+        started = threading.Event()
+        release = threading.Event()
+        resp = response(304)
+
+        def fetch():
+            started.set()
+            release.wait(5)
+            return resp
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(self.cache.fetch(URL, False, HEADERS, fetch))
+        )
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(
+            target=lambda: results.append(self.cache.fetch(URL, False, HEADERS, fetch))
+        )
+        follower.start()
+        while self.cache.metrics()["coalesced"] == 0:
+            follower.join(0.01)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(results, [resp, resp])
+        metrics = self.cache.metrics()
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["coalesced"], 1)
+
+    def test_start(self):
+        """Assert that new run starts with empty cache and counters."""
+        fetch = mock.Mock(side_effect=lambda: response())
+        self.cache.fetch(URL, False, HEADERS, fetch)
+
+        self.cache.start(10)
+        self.cache.fetch(URL, False, HEADERS, fetch)
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(self.cache.metrics()["misses"], 1)
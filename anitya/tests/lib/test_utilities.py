@@ -19,6 +19,7 @@
 # of Red Hat, Inc.
 """Tests for the :mod:`anitya.lib.utilities` module."""
 
+import hashlib
 import unittest
 
 import anitya_schema
@@ -28,7 +29,7 @@ from fedora_messaging import testing as fml_testing
 from sqlalchemy.exc import SQLAlchemyError
 
 from anitya.db import models
-from anitya.lib import exceptions, plugins, utilities
+from anitya.lib import exceptions, http_validators, plugins, utilities
 from anitya.lib.exceptions import AnityaException, ProjectExists
 from anitya.tests.base import (
     DatabaseTestCase,
@@ -170,6 +171,84 @@ class EditProjectTests(DatabaseTestCase):
         self.assertTrue(project_objs[0].releases_only)
         self.assertTrue(project_objs[0].archived)
 
+    def test_edit_project_latest_version(self):
+        """Assert that latest version is recomputed when version scheme changes."""
+        create_distro(self.session)
+        create_project(self.session)
+        project = self.session.query(models.Project).filter_by(name="geany").one()
+        for version in ("1.0", "1.0.0b1"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        project.version_scheme = "RPM"
+        project.latest_version = "1.0.0b1"
+        self.session.commit()
+
+        with fml_testing.mock_sends(anitya_schema.ProjectEdited):
+            utilities.edit_project(
+                self.session,
+                project=project,
+                name=project.name,
+                homepage=project.homepage,
+                backend=project.backend,
+                version_scheme="Python (PEP 440)",
+                version_pattern=None,
+                version_url=None,
+                version_prefix=None,
+                pre_release_filter=None,
+                version_filter=None,
+                regex=None,
+                insecure=False,
+                user_id="noreply@fedoraproject.org",
+                releases_only=False,
+            )
+
+        self.assertEqual(project.latest_version, "1.0")
+        self.assertEqual(
+            [
+                version.version
+                for version in models.ProjectVersion.newest(self.session, project.id)
+            ],
+            ["1.0", "1.0.0b1"],
+        )
+
+    def test_edit_project_latest_stable_version(self):
+        """Assert that latest stable version is recomputed when filter changes."""
+        create_distro(self.session)
+        create_project(self.session)
+        project = self.session.query(models.Project).filter_by(name="geany").one()
+        for version in ("1.0", "1.1-beta"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        project.latest_version = "1.1-beta"
+        project.latest_stable_version = "1.1-beta"
+        project.versions_count = 2
+        self.session.commit()
+
+        with fml_testing.mock_sends(anitya_schema.ProjectEdited):
+            utilities.edit_project(
+                self.session,
+                project=project,
+                name=project.name,
+                homepage=project.homepage,
+                backend=project.backend,
+                version_scheme=project.version_scheme,
+                version_pattern=None,
+                version_url=project.version_url,
+                version_prefix=None,
+                pre_release_filter="beta",
+                version_filter=None,
+                regex=project.regex,
+                insecure=False,
+                user_id="noreply@fedoraproject.org",
+                releases_only=False,
+            )
+
+        self.assertEqual(project.latest_version, "1.1-beta")
+        self.assertEqual(project.latest_stable_version, "1.0")
+        self.assertEqual(project.versions_count, 2)
+
     def test_edit_project_creating_duplicate(self):
         """
         Assert that attempting to edit a project and creating a duplicate fails
@@ -268,6 +347,52 @@ class EditProjectTests(DatabaseTestCase):
 
         mock_check.assert_called_with(project_objs[0], mock.ANY)
 
+    @mock.patch("anitya.lib.utilities.publish_message", mock.Mock())
+    @mock.patch("anitya.lib.backends.http_session")
+    def test_edit_project_regex_unchanged_page(self, mock_http_session):
+        """
+        Assert that page which wasn't modified is parsed again with the new regex.
+        """
+        page = "foo-1.0.tar bar-2.0.tar"
+        mock_http_session.get.return_value = mock.Mock(
+            status_code=200, headers={"ETag": '"abc"'}, content=page.encode(), text=page
+        )
+        project = models.Project(
+            name="foo",
+            homepage="https://example.com/foo",
+            backend="custom",
+            version_url="https://example.com/releases",
+            regex=r"foo-([0-9.]+)\.tar",
+        )
+        self.session.add(project)
+        self.session.commit()
+        utilities.check_project_release(project, self.session)
+        utilities.check_project_release(project, self.session)
+        self.assertEqual(project.logs, "No new version found")
+        self.assertTrue(project.http_validators)
+
+        utilities.edit_project(
+            self.session,
+            project=project,
+            name=project.name,
+            homepage=project.homepage,
+            backend=project.backend,
+            version_scheme=project.version_scheme,
+            version_pattern=None,
+            version_url=project.version_url,
+            version_prefix=None,
+            pre_release_filter=None,
+            version_filter=None,
+            regex=r"(?:foo|bar)-([0-9.]+)\.tar",
+            insecure=False,
+            user_id="noreply@fedoraproject.org",
+            releases_only=False,
+            check_release=True,
+        )
+
+        self.assertEqual(project.versions, ["2.0", "1.0"])
+        self.assertEqual(project.logs, "Version retrieved correctly")
+
     def test_edit_dry_run(self):
         """Test the edit_project function dry_run parameter."""
         create_distro(self.session)
@@ -362,6 +487,130 @@ class CheckProjectReleaseTests(DatabaseTestCase):
         versions = utilities.check_project_release(project, self.session, test=True)
         self.assertEqual(versions, ["1.0.0", "0.9.9", "0.9.8"])
 
+    def test_check_project_release_http_validators(self):
+        """Assert that validators are stored only by successful check."""
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+            )
+        url = "https://registry.npmjs.org/pypi_and_npm"
+        resp = mock.Mock(status_code=200, headers={"ETag": '"abc"'}, content=b"")
+
+        def get_versions(project):
+            http_validators.apply(url, {})
+            http_validators.record(url, resp)
+            return ["1.0.0"]
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=get_versions),
+        ):
+            with fml_testing.mock_sends(
+                anitya_schema.ProjectVersionUpdated,
+                anitya_schema.ProjectVersionUpdatedV2,
+            ):
+                utilities.check_project_release(project, self.session)
+
+        self.session.refresh(project)
+        self.assertEqual(project.http_validators[url]["etag"], '"abc"')
+
+        resp.headers = {"ETag": '"def"'}
+
+        def get_versions_error(project):
+            get_versions(project)
+            raise exceptions.AnityaPluginException("")
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=get_versions_error),
+        ):
+            self.assertRaises(
+                exceptions.AnityaPluginException,
+                utilities.check_project_release,
+                project,
+                self.session,
+            )
+
+        self.session.refresh(project)
+        self.assertEqual(project.http_validators[url]["etag"], '"abc"')
+
+    def test_check_project_release_test_http_validators(self):
+        """Assert that validators aren't replayed nor stored by test check."""
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+            )
+        url = "https://registry.npmjs.org/pypi_and_npm"
+        stored = {url: {"etag": '"abc"', "digest": hashlib.sha256(b"{}").hexdigest()}}
+        project.http_validators = stored
+        self.session.commit()
+        headers = {}
+
+        def get_versions(project):
+            http_validators.apply(url, headers)
+            resp = http_validators.record(
+                url, mock.Mock(status_code=200, headers={}, content=b"{}")
+            )
+            self.assertEqual(resp.status_code, 200)
+            return ["1.0.0"]
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=get_versions),
+        ):
+            versions = utilities.check_project_release(project, self.session, test=True)
+
+        self.assertEqual(versions, ["1.0.0"])
+        self.assertEqual(headers, {})
+        self.session.expire_all()
+        project = self.session.get(models.Project, project.id)
+        self.assertEqual(project.http_validators, stored)
+
+    @mock.patch("anitya.lib.utilities._store_versions")
+    def test_check_project_release_not_modified(self, mock_store_versions):
+        """Assert that versions are not processed when the page is not modified."""
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+            )
+        url = "https://registry.npmjs.org/pypi_and_npm"
+        project.http_validators = {url: {"digest": hashlib.sha256(b"{}").hexdigest()}}
+        project.error_counter = 2
+        self.session.commit()
+
+        def get_versions(project):
+            http_validators.apply(url, {})
+            resp = http_validators.record(
+                url, mock.Mock(status_code=200, headers={}, content=b"{}")
+            )
+            self.assertEqual(resp.status_code, 304)
+            return []
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=get_versions),
+        ):
+            with fml_testing.mock_sends():
+                utilities.check_project_release(project, self.session)
+
+        mock_store_versions.assert_not_called()
+        self.session.refresh(project)
+        self.assertEqual(project.logs, "No new version found")
+        self.assertTrue(project.check_successful)
+        self.assertEqual(project.error_counter, 0)
+
     @mock.patch(
         "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
         mock.Mock(side_effect=exceptions.AnityaPluginException("")),
@@ -429,6 +678,48 @@ class CheckProjectReleaseTests(DatabaseTestCase):
         versions = project.get_sorted_version_objects()
         self.assertEqual(len(versions), 3)
         self.assertEqual(versions[0].version, "1.0.0")
+        self.assertEqual(project.latest_stable_version, "1.0.0")
+        self.assertEqual(project.latest_version_created_on, versions[0].created_on)
+        self.assertEqual(project.versions_count, 3)
+        self.assertEqual(
+            [version.version for version in versions],
+            [
+                version.version
+                for version in models.ProjectVersion.newest(self.session, project.id)
+            ],
+        )
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.1.0rc1", "1.0.0", "0.9.9"],
+    )
+    def test_check_project_release_version_summary(self, mock_method):
+        """Assert that the version summary is updated only by the new versions."""
+        project = models.Project(
+            name="pypi_and_npm",
+            homepage="https://example.com/not-a-real-npmjs-project",
+            backend="npmjs",
+            version_scheme="RPM",
+            latest_version="0.9.9",
+            latest_stable_version="0.9.9",
+            versions_count=1,
+        )
+        self.session.add(project)
+        self.session.add(models.ProjectVersion(project=project, version="0.9.9"))
+        self.session.commit()
+
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            utilities.check_project_release(project, self.session)
+
+        self.assertEqual(project.latest_version, "1.1.0rc1")
+        self.assertEqual(project.latest_stable_version, "1.0.0")
+        self.assertEqual(
+            project.latest_version_created_on,
+            project.latest_version_object.created_on,
+        )
+        self.assertEqual(project.versions_count, 3)
 
     @mock.patch(
         "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
@@ -671,6 +962,348 @@ class CheckProjectReleaseTests(DatabaseTestCase):
         self.assertEqual(versions[0].version, "1.0.0")
         self.assertEqual(versions[1].version, "0.9.9")
 
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.0", "1.1", "0.9"],
+    )
+    def test_check_project_release_equal_version(self, mock_method):
+        """
+        Assert that version equal to the stored one by the version scheme
+        is not stored again and the latest version is compared only with
+        new versions.
+        """
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+                version_scheme="Python (PEP 440)",
+            )
+        for version in ("1.0.0", "0.9.0"):
+            self.session.add(
+                models.ProjectVersion(project_id=project.id, version=version)
+            )
+        project.latest_version = "1.0.0"
+        self.session.commit()
+
+        result = utilities.check_project_release(project, self.session, test=True)
+
+        self.assertEqual(result, ["1.1"])
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.0.0", "0.9.9"],
+    )
+    def test_check_project_release_latest_version_not_set(self, mock_method):
+        """
+        Assert that the stored versions are compared when the project doesn't
+        have the latest version yet.
+        """
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+                version_scheme="RPM",
+            )
+        version = models.ProjectVersion(project_id=project.id, version="2.0.0")
+        self.session.add(version)
+        self.session.commit()
+
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            utilities.check_project_release(project, self.session)
+
+        self.assertEqual(project.latest_version, "2.0.0")
+        self.assertEqual(len(project.versions_obj), 3)
+
+
+class CheckProjectSpecTests(DatabaseTestCase):
+    """Tests for the :func:`anitya.lib.utilities.check_project_spec` function."""
+
+    def setUp(self):
+        super().setUp()
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            self.project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+                version_scheme="RPM",
+            )
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.0.0", "0.9.9"],
+    )
+    def test_check_project_spec(self, mock_method):
+        """Assert that versions are retrieved using snapshot and stored in project."""
+        spec = models.ProjectSpec.from_project(self.project)
+
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            utilities.check_project_spec(spec, self.session)
+
+        mock_method.assert_called_once_with(spec)
+        self.assertEqual(self.project.versions, ["1.0.0", "0.9.9"])
+        self.assertEqual(self.project.latest_version, "1.0.0")
+        self.assertTrue(self.project.check_successful)
+        self.assertIsNotNone(self.project.next_check)
+
+    def test_check_project_spec_archived(self):
+        """Assert that archived project is not checked."""
+        self.project.archived = True
+        self.session.add(self.project)
+        self.session.commit()
+        spec = models.ProjectSpec.from_project(self.project)
+
+        self.assertRaises(
+            AnityaException, utilities.check_project_spec, spec, self.session
+        )
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        mock.Mock(side_effect=exceptions.AnityaPluginException("Error")),
+    )
+    def test_check_project_spec_plugin_exception(self):
+        """Assert that error is stored in the project."""
+        spec = models.ProjectSpec.from_project(self.project)
+
+        self.assertRaises(
+            exceptions.AnityaPluginException,
+            utilities.check_project_spec,
+            spec,
+            self.session,
+        )
+
+        self.assertEqual(self.project.error_counter, 1)
+        self.assertEqual(self.project.logs, "Error")
+        self.assertFalse(self.project.check_successful)
+
+    def test_check_project_spec_ratelimit_exception(self):
+        """Assert that project is rescheduled to reset time on rate limit."""
+        spec = models.ProjectSpec.from_project(self.project)
+        reset_time = arrow.utcnow().shift(hours=1)
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=exceptions.RateLimitException(str(reset_time))),
+        ):
+            self.assertRaises(
+                exceptions.RateLimitException,
+                utilities.check_project_spec,
+                spec,
+                self.session,
+            )
+
+        self.assertEqual(self.project.error_counter, 0)
+        self.assertEqual(arrow.get(self.project.next_check), reset_time)
+        self.assertFalse(self.project.check_successful)
+
+
+class ResultSinkTests(DatabaseTestCase):
+    """Tests for the :class:`anitya.lib.utilities.ResultSink` class."""
+
+    def setUp(self):
+        super().setUp()
+        with fml_testing.mock_sends(anitya_schema.ProjectCreated):
+            self.project = utilities.create_project(
+                self.session,
+                name="pypi_and_npm",
+                homepage="https://example.com/not-a-real-npmjs-project",
+                backend="npmjs",
+                user_id="noreply@fedoraproject.org",
+                version_scheme="RPM",
+            )
+        self.sink = utilities.ResultSink(self.session, batch_size=2, interval=3600)
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.0.0", "0.9.9"],
+    )
+    def test_check_project_release(self, mock_method):
+        """Assert that result is written and messages sent only on flush."""
+        utilities.check_project_release(self.project, self.session, sink=self.sink)
+
+        self.assertEqual(len(self.sink), 1)
+        self.session.refresh(self.project)
+        self.assertEqual(self.project.versions, [])
+        self.assertIsNone(self.project.latest_version)
+
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            self.sink.flush()
+
+        self.assertEqual(len(self.sink), 0)
+        self.session.refresh(self.project)
+        self.assertEqual(self.project.versions, ["1.0.0", "0.9.9"])
+        self.assertEqual(self.project.latest_version, "1.0.0")
+        self.assertEqual(self.project.latest_stable_version, "1.0.0")
+        self.assertIsNotNone(self.project.latest_version_created_on)
+        self.assertEqual(self.project.versions_count, 2)
+        self.assertTrue(all(version.sort_key for version in self.project.versions_obj))
+        self.assertEqual(self.project.logs, "Version retrieved correctly")
+        self.assertTrue(self.project.check_successful)
+        self.assertIsNotNone(self.project.next_check)
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions", return_value=["1.0.0"]
+    )
+    def test_check_project_release_no_new_version(self, mock_method):
+        """Assert that only the project is updated when no version is found."""
+        version = models.ProjectVersion(version="1.0.0", project_id=self.project.id)
+        self.session.add(version)
+        self.session.commit()
+
+        utilities.check_project_release(self.project, self.session, sink=self.sink)
+        with fml_testing.mock_sends():
+            self.sink.flush()
+
+        self.session.refresh(self.project)
+        self.assertEqual(self.project.versions, ["1.0.0"])
+        self.assertEqual(self.project.logs, "No new version found")
+        self.assertIsNotNone(self.project.last_check)
+
+    def test_check_project_release_http_validators(self):
+        """Assert that validators are written by the sink."""
+        url = "https://registry.npmjs.org/pypi_and_npm"
+
+        def get_versions(project):
+            http_validators.apply(url, {})
+            http_validators.record(
+                url, mock.Mock(status_code=200, headers={"ETag": '"abc"'}, content=b"")
+            )
+            return ["1.0.0"]
+
+        with mock.patch(
+            "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+            mock.Mock(side_effect=get_versions),
+        ):
+            utilities.check_project_release(self.project, self.session, sink=self.sink)
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            self.sink.flush()
+
+        self.session.refresh(self.project)
+        self.assertEqual(self.project.http_validators[url]["etag"], '"abc"')
+
+    def test_add_batch_full(self):
+        """Assert that batch is written when it's full, messages keep order."""
+        project2 = models.Project(
+            name="foobar", homepage="https://foo.bar", backend="npmjs"
+        )
+        self.session.add(project2)
+        self.session.commit()
+        self.project.logs = "first"
+        project2.logs = "second"
+        messages = [
+            dict(topic="first", project=None),
+            dict(topic="second", project=None),
+        ]
+
+        with mock.patch("anitya.lib.utilities.publish_message") as mock_publish:
+            self.sink.add(self.project, [], messages[:1])
+            self.sink.flush_if_ready()
+            mock_publish.assert_not_called()
+            self.sink.add(project2, [], messages[1:])
+            mock_publish.assert_not_called()
+            self.sink.flush_if_ready()
+
+        self.assertEqual(
+            mock_publish.call_args_list,
+            [mock.call(**messages[0]), mock.call(**messages[1])],
+        )
+        self.session.expire_all()
+        self.assertEqual(self.session.get(models.Project, project2.id).logs, "second")
+        self.assertEqual(len(self.sink), 0)
+
+    def test_add_interval_elapsed(self):
+        """Assert that batch is written when interval elapsed."""
+        self.sink.interval = 0
+        self.project.logs = "Version retrieved correctly"
+
+        self.sink.add(self.project, [], [])
+        self.assertEqual(len(self.sink), 1)
+        self.sink.flush_if_ready()
+
+        self.assertEqual(len(self.sink), 0)
+
+    @mock.patch(
+        "anitya.lib.backends.npmjs.NpmjsBackend.get_versions",
+        return_value=["1.0.0", "0.9.9"],
+    )
+    def test_check_project_release_flush(self, mock_method):
+        """Assert that new versions are written when check fills the batch."""
+        self.sink.batch_size = 1
+
+        with fml_testing.mock_sends(
+            anitya_schema.ProjectVersionUpdated, anitya_schema.ProjectVersionUpdatedV2
+        ):
+            utilities.check_project_release(self.project, self.session, sink=self.sink)
+
+        self.assertEqual(len(self.sink), 0)
+        self.session.expire_all()
+        project = self.session.get(models.Project, self.project.id)
+        self.assertEqual(project.versions, ["1.0.0", "0.9.9"])
+        self.assertEqual(project.latest_version, "1.0.0")
+        self.assertEqual(project.versions_count, 2)
+
+    def test_flush_error_one_by_one(self):
+        """Assert that results are written one by one when batch fails."""
+        project2 = models.Project(
+            name="foobar", homepage="https://foo.bar", backend="npmjs"
+        )
+        self.session.add(project2)
+        self.session.commit()
+        self.project.logs = "first"
+        project2.logs = "second"
+        version = {
+            "project_id": project2.id,
+            "version": "1.0.0",
+            "commit_url": None,
+            "created_on": None,
+            "sort_key": None,
+        }
+        # The duplicate version fails the batch and the second result
+        broken = [models.ProjectVersion(**version), models.ProjectVersion(**version)]
+        self.sink.add(self.project, [], [dict(topic="first", project=None)])
+        self.sink.add(project2, broken, [dict(topic="second", project=None)])
+        self.session.rollback()
+
+        with mock.patch("anitya.lib.utilities.publish_message") as mock_publish:
+            self.sink.flush()
+
+        mock_publish.assert_called_once_with(topic="first", project=None)
+        self.assertEqual(len(self.sink), 0)
+        self.session.expire_all()
+        self.assertEqual(
+            self.session.get(models.Project, self.project.id).logs, "first"
+        )
+        project2 = self.session.get(models.Project, project2.id)
+        self.assertNotEqual(project2.logs, "second")
+        self.assertEqual(project2.versions, [])
+
+    def test_flush_error(self):
+        """Assert that messages aren't sent when write failed."""
+        self.sink.add(self.project, [], [dict(topic="first", project=None)])
+
+        with mock.patch.object(
+            self.session, "commit", side_effect=SQLAlchemyError("error")
+        ), mock.patch("anitya.lib.utilities.publish_message") as mock_publish:
+            self.sink.flush()
+
+        mock_publish.assert_not_called()
+        self.assertEqual(len(self.sink), 0)
+
 
 class MapProjectTests(DatabaseTestCase):
     """Tests for the :func:`anitya.lib.utilities.map_project` function."""
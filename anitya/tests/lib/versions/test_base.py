@@ -49,8 +49,12 @@ class VersionTests(unittest.TestCase):
     def test_str_parse_error(self):
         """Assert __str__ calls parse"""
         version = base.Version(version="v1.0.0")
-        version.parse = mock.Mock(side_effect=exceptions.InvalidVersion("boop"))
-        self.assertEqual("v1.0.0", str(version))
+        with mock.patch.object(
+            base.Version,
+            "parse",
+            side_effect=exceptions.InvalidVersion("boop"),
+        ):
+            self.assertEqual("v1.0.0", str(version))
 
     def test_parse_no_v(self):
         """Assert parsing a version sans leading 'v' works."""
@@ -195,24 +199,28 @@ class VersionTests(unittest.TestCase):
     def test_lt_one_unparsable(self):
         """Assert unparsable versions sort lower than parsable ones."""
         unparsable_version = base.Version(version="blarg")
-        unparsable_version.parse = mock.Mock(
-            side_effect=exceptions.InvalidVersion("blarg")
-        )
         new_version = base.Version(version="v1.0.0")
-        self.assertTrue(unparsable_version < new_version)
-        self.assertFalse(new_version < unparsable_version)
+        original_parse = base.Version.parse
+
+        def parse(version):
+            if version is unparsable_version:
+                raise exceptions.InvalidVersion("blarg")
+            return original_parse(version)
+
+        with mock.patch.object(base.Version, "parse", autospec=True, side_effect=parse):
+            self.assertTrue(unparsable_version < new_version)
+            self.assertFalse(new_version < unparsable_version)
 
     def test_lt_both_unparsable(self):
         """Assert unparsable versions resort to string sorting."""
         alphabetically_lower = base.Version(version="arg")
-        alphabetically_lower.parse = mock.Mock(
-            side_effect=exceptions.InvalidVersion("arg")
-        )
         alphabetically_higher = base.Version(version="blarg")
-        alphabetically_higher.parse = mock.Mock(
-            side_effect=exceptions.InvalidVersion("blarg")
-        )
-        self.assertTrue(alphabetically_lower < alphabetically_higher)
+        with mock.patch.object(
+            base.Version,
+            "parse",
+            side_effect=exceptions.InvalidVersion("arg"),
+        ):
+            self.assertTrue(alphabetically_lower < alphabetically_higher)
 
     def test_le(self):
         """Assert Version supports <= comparison."""
@@ -261,6 +269,31 @@ class VersionTests(unittest.TestCase):
         """Assert unparsable versions that are the same string are equal."""
         v1 = base.Version(version="arg")
         v2 = base.Version(version="arg")
-        v1.parse = mock.Mock(side_effect=exceptions.InvalidVersion("arg"))
-        v2.parse = mock.Mock(side_effect=exceptions.InvalidVersion("arg"))
-        self.assertEqual(v1, v2)
+        with mock.patch.object(
+            base.Version,
+            "parse",
+            side_effect=exceptions.InvalidVersion("arg"),
+        ):
+            self.assertEqual(v1, v2)
+
+    def test_no_dict(self):
+        """Assert that version objects don't have __dict__."""
+        version = base.Version(version="1.0.0")
+        self.assertFalse(hasattr(version, "__dict__"))
+
+    def test_context_shared(self):
+        """Assert that versions with the same settings share the context."""
+        v1 = base.Version(version="1.0.0", prefix="release-;rel", pattern="yyyy")
+        v2 = base.Version(version="1.0.1", prefix="release-;rel", pattern="yyyy")
+        self.assertIs(v1.context, v2.context)
+        self.assertEqual(v1.prefixes, ("rel", "release-"))
+        self.assertEqual(v1.pattern, "YYYY")
+
+    def test_context_provided(self):
+        """Assert that provided context is used instead of the settings."""
+        context = base.VersionContext(prefix="rel", pre_release_filter="rc;beta")
+        version = base.Version(version="rel1.0rc1", prefix="other", context=context)
+        self.assertIs(version.context, context)
+        self.assertEqual(version.pre_release_filters, ("rc", "beta"))
+        self.assertEqual(version.parse(), "1.0rc1")
+        self.assertTrue(version.prerelease())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for the :mod:`anitya.lib.versions.key_encoding` module."""
+
+import unittest
+
+from anitya.lib.versions.key_encoding import encode_key
+
+
+class EncodeKeyTests(unittest.TestCase):
+    """Tests for the :func:`anitya.lib.versions.key_encoding.encode_key` function."""
+
+    def assertOrderKept(self, keys):
+        """Assert that encoded keys are sorted the same way as the keys."""
+        self.assertEqual(sorted(keys), keys)
+        encoded = [encode_key(key) for key in keys]
+        self.assertEqual(sorted(encoded), encoded)
+        self.assertEqual(len(set(encoded)), len(encoded))
+
+    def test_numbers(self):
+        """Assert that numbers are ordered by value, not by length of digits."""
+        self.assertOrderKept([(0,), (1,), (9,), (10,), (255,), (256,), (10**40,)])
+
+    def test_booleans(self):
+        """Assert that booleans are ordered as numbers."""
+        self.assertOrderKept([(False,), (True,)])
+
+    def test_strings(self):
+        """Assert that strings are ordered by code points."""
+        self.assertOrderKept(
+            [("",), ("a",), ("a\x00",), ("a\x00b",), ("ab",), ("b",), ("é",)]
+        )
+
+    def test_tuples(self):
+        """Assert that shorter tuple is lower than the longer one."""
+        self.assertOrderKept(
+            [
+                (1,),
+                (1, (0, "a")),
+                (1, (0, "a"), (1, 2)),
+                (1, (0, "b")),
+                (1, (1, 1)),
+                (1, (1, 1), (0,)),
+                (2,),
+            ]
+        )
+
+    def test_none(self):
+        """Assert that None is lower than any value."""
+        self.assertLess(encode_key((None,)), encode_key((0,)))
+        self.assertLess(encode_key((None,)), encode_key(("",)))
+        self.assertLess(encode_key((1, None)), encode_key((1, 0)))
+
+    def test_negative_number(self):
+        """Assert that negative numbers are refused."""
+        self.assertRaises(ValueError, encode_key, (-1,))
+
+    def test_unsupported_type(self):
+        """Assert that unsupported values are refused."""
+        self.assertRaises(ValueError, encode_key, (1.5,))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""Tests for the :mod:`anitya.lib.versions.parse_cache` module."""
+
+import unittest
+
+import mock
+
+from anitya.lib.versions import python, rpm
+from anitya.lib.versions.parse_cache import ParseCache, parse_cache
+
+
+class ParseCacheTests(unittest.TestCase):
+    """Tests for the :class:`anitya.lib.versions.parse_cache.ParseCache` class."""
+
+    def setUp(self):
+        self.cache = ParseCache()
+
+    def test_get(self):
+        """Assert that result is computed only once."""
+        compute = mock.Mock(return_value="1.0")
+
+        self.assertEqual(self.cache.get(("RPM", "v1.0"), compute), "1.0")
+        self.assertEqual(self.cache.get(("RPM", "v1.0"), compute), "1.0")
+
+        compute.assert_called_once_with()
+        self.assertEqual(
+            self.cache.metrics(),
+            {"size": 1, "hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5},
+        )
+
+    def test_get_none(self):
+        """Assert that None result is cached too."""
+        compute = mock.Mock(return_value=None)
+
+        self.assertIsNone(self.cache.get(("RPM", "v1.0"), compute))
+        self.assertIsNone(self.cache.get(("RPM", "v1.0"), compute))
+
+        compute.assert_called_once_with()
+
+    @mock.patch.dict("anitya.config.config", {"VERSION_PARSE_CACHE_SIZE": 2})
+    def test_get_evict(self):
+        """Assert that least recently used result is evicted."""
+        self.cache.get("a", lambda: 1)
+        self.cache.get("b", lambda: 2)
+        self.cache.get("a", lambda: 1)
+        self.cache.get("c", lambda: 3)
+
+        self.assertEqual(self.cache.get("a", lambda: 4), 1)
+        self.assertEqual(self.cache.get("b", lambda: 5), 5)
+        self.assertEqual(self.cache.metrics()["evictions"], 2)
+
+    @mock.patch.dict("anitya.config.config", {"VERSION_PARSE_CACHE_SIZE": 0})
+    def test_get_disabled(self):
+        """Assert that nothing is cached when cache is disabled."""
+        compute = mock.Mock(return_value="1.0")
+
+        self.cache.get("a", compute)
+        self.cache.get("a", compute)
+
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(self.cache.metrics()["size"], 0)
+
+    def test_metrics_empty(self):
+        """Assert that hit rate is 0 when nothing was requested."""
+        self.assertEqual(self.cache.metrics()["hit_rate"], 0.0)
+
+    def test_clear(self):
+        """Assert that clear drops results and counters."""
+        self.cache.get("a", lambda: 1)
+        self.cache.get("a", lambda: 1)
+
+        self.cache.clear()
+
+        self.assertEqual(
+            self.cache.metrics(),
+            {"size": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0},
+        )
+
+
+class VersionParseCacheTests(unittest.TestCase):
+    """Tests for the versions using the shared parse cache."""
+
+    def setUp(self):
+        parse_cache.clear()
+
+    def test_shared_between_versions(self):
+        """Assert that the same version string is parsed only once."""
+        with mock.patch.object(
+            python.PythonVersion,
+            "get_version_object",
+            autospec=True,
+            side_effect=python.PythonVersion.get_version_object,
+        ) as mock_parse:
+            first = python.PythonVersion(version="v1.0.0")
+            second = python.PythonVersion(version="v1.0.0")
+
+        mock_parse.assert_called_once_with(first)
+        self.assertIs(first.version_object, second.version_object)
+
+    def test_key_contains_prefix(self):
+        """Assert that versions with different prefixes are not mixed."""
+        first = rpm.RpmVersion(version="release-1.0rc1")
+        second = rpm.RpmVersion(version="release-1.0rc1", prefix="release-")
+
+        self.assertEqual(first._split_rc(), ("release-1.0", "rc", "1"))
+        self.assertEqual(second._split_rc(), ("1.0", "rc", "1"))
+
+    def test_key_contains_scheme(self):
+        """Assert that versions of different schemes are not mixed."""
+        python.PythonVersion(version="not-a-version").sort_key
+        version = rpm.RpmVersion(version="not-a-version")
+
+        self.assertEqual(version.sort_key[0], 1)
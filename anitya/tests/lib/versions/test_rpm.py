@@ -60,8 +60,12 @@ class RpmVersionTests(unittest.TestCase):
     def test_str_parse_error(self):
         """Assert __str__ calls parse"""
         version = rpm.RpmVersion(version="v1.0.0")
-        version.parse = mock.Mock(side_effect=exceptions.InvalidVersion("boop"))
-        self.assertEqual("v1.0.0", str(version))
+        with mock.patch.object(
+            rpm.RpmVersion,
+            "parse",
+            side_effect=exceptions.InvalidVersion("boop"),
+        ):
+            self.assertEqual("v1.0.0", str(version))
 
     def test_parse_no_v(self):
         """Assert parsing a version sans leading 'v' works."""
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Parity tests of :attr:`anitya.lib.versions.base.Version.sort_key`
+with the comparison operators of every version scheme.
+"""
+
+import random
+import unittest
+from operator import attrgetter
+
+import mock
+
+from anitya.lib.versions import base, calver, python, rpm, semver
+from anitya.lib.versions.parse_cache import parse_cache
+
+GENERIC_VERSIONS = [
+    "1.0.0",
+    "v1.0.0",
+    "1.0.1",
+    "1.10",
+    "1.9",
+    "2.0-beta",
+    "release-2.0",
+    "0.1",
+    "a",
+    "v",
+]
+
+PYTHON_VERSIONS = [
+    "1.0",
+    "1.0.0",
+    "v1.0.1",
+    "1.0.1a1",
+    "1.0.1b2",
+    "1.0.1rc1",
+    "1.0.1.post1",
+    "1.0.1.dev3",
+    "1!0.5",
+    "2.0",
+    "10.0",
+    "not-a-version",
+    "also-not-a-version",
+]
+
+RPM_VERSIONS = [
+    "1.0",
+    "1.0.0",
+    "v1.0.1",
+    "1.0.1rc1",
+    "1.0.1-rc2",
+    "1.0.1.rc10",
+    "1.0.1rc",
+    "1.0.1RC3",
+    "1.0.1beta1",
+    "1.0.1alpha",
+    "1.0.1pre2",
+    "1.0.1dev",
+    "1.0.1",
+    "1.0.1a",
+    "1.0.1_1",
+    "1.1",
+    "1.01",
+    "1.10",
+    "2",
+    "2.0a",
+    "20200101",
+    "abc",
+]
+
+SEMANTIC_VERSIONS = [
+    "1.0.0",
+    "v1.0.1",
+    "1.0.1-alpha",
+    "1.0.1-alpha.1",
+    "1.0.1-alpha.beta",
+    "1.0.1-beta",
+    "1.0.1-beta.2",
+    "1.0.1-beta.11",
+    "1.0.1-rc.1",
+    "1.0.1+build.5",
+    "1.1.0",
+    "1.10.0",
+    "2.0.0",
+]
+
+CALENDAR_VERSIONS = [
+    "2020.01.1",
+    "2020.01.2",
+    "2020.02.1",
+    "2020.11.0",
+    "2021.01.0",
+    "2021.01.0-rc1",
+    "2021.01.0-rc2",
+    "2021.01.0-beta",
+    "2021.01.0-beta3",
+    "v2021.01.1",
+    "2019.12",
+    "2019",
+    "not-a-version",
+]
+
+
+class SortKeyParityMixin:
+    """Common tests of the sort key parity with comparison operators."""
+
+    version_class = None
+    versions = []
+    #: Versions which are not comparable by the comparison operators
+    incomparable = []
+    pattern = None
+
+    def setUp(self):
+        parse_cache.clear()
+
+    def _versions(self, versions):
+        return [
+            self.version_class(version=version, prefix="release-", pattern=self.pattern)
+            for version in versions
+        ]
+
+    def test_pairwise(self):
+        """Assert that keys are ordered the same way as versions."""
+        versions = self._versions(self.versions)
+        for version in versions:
+            for other in versions:
+                with self.subTest(version=version.version, other=other.version):
+                    self.assertEqual(version < other, version.sort_key < other.sort_key)
+
+    def test_sorted(self):
+        """Assert that sorting by key gives the same order as sorting by comparison."""
+        shuffled = list(self.versions)
+        for seed in range(10):
+            random.Random(seed).shuffle(shuffled)
+            versions = self._versions(shuffled)
+            with self.subTest(seed=seed):
+                self.assertEqual(
+                    [version.version for version in sorted(versions)],
+                    [
+                        version.version
+                        for version in sorted(versions, key=attrgetter("sort_key"))
+                    ],
+                )
+
+    def test_incomparable_at_bottom(self):
+        """Assert that incomparable versions are sorted to bottom in stable order."""
+        if not self.incomparable:
+            return
+        versions = self._versions(self.incomparable + self.versions)
+        sorted_versions = sorted(versions, key=attrgetter("sort_key"))
+        self.assertEqual(
+            [version.version for version in sorted_versions[: len(self.incomparable)]],
+            self.incomparable,
+        )
+
+    def test_stored_sort_key_pairwise(self):
+        """Assert that stored keys keep the order of keys, ties could be broken."""
+        versions = self._versions(self.versions)
+        for version in versions:
+            for other in versions:
+                lower = version.sort_key < other.sort_key
+                if lower and other.sort_key < version.sort_key:
+                    # Versions which can't be parsed are not ordered
+                    continue
+                with self.subTest(version=version.version, other=other.version):
+                    if lower:
+                        self.assertLess(version.stored_sort_key, other.stored_sort_key)
+                    elif other.sort_key < version.sort_key:
+                        self.assertGreater(
+                            version.stored_sort_key, other.stored_sort_key
+                        )
+
+    def test_stored_sort_key_incomparable_at_bottom(self):
+        """Assert that incomparable versions have the lowest stored keys."""
+        if not self.incomparable:
+            return
+        versions = self._versions(self.incomparable + self.versions)
+        sorted_versions = sorted(versions, key=attrgetter("stored_sort_key"))
+        self.assertEqual(
+            {version.version for version in sorted_versions[: len(self.incomparable)]},
+            set(self.incomparable),
+        )
+
+    def test_sort_key_computed_once(self):
+        """Assert that the key is computed only once."""
+        version = self._versions(self.versions[:1])[0]
+        with mock.patch.object(
+            self.version_class,
+            "get_sort_key",
+            autospec=True,
+            side_effect=self.version_class.get_sort_key,
+        ) as mock_get_sort_key:
+            self.assertEqual(version.sort_key, version.sort_key)
+        mock_get_sort_key.assert_called_once_with(version)
+
+
+class GenericSortKeyTests(SortKeyParityMixin, unittest.TestCase):
+    """Tests for the :meth:`anitya.lib.versions.base.Version.get_sort_key` method."""
+
+    version_class = base.Version
+    versions = GENERIC_VERSIONS
+
+
+class PythonSortKeyTests(SortKeyParityMixin, unittest.TestCase):
+    """Tests for the :meth:`anitya.lib.versions.python.PythonVersion.get_sort_key` method."""
+
+    version_class = python.PythonVersion
+    versions = PYTHON_VERSIONS
+
+
+class RpmSortKeyTests(SortKeyParityMixin, unittest.TestCase):
+    """Tests for the :meth:`anitya.lib.versions.rpm.RpmVersion.get_sort_key` method."""
+
+    version_class = rpm.RpmVersion
+    versions = RPM_VERSIONS
+    incomparable = ["", "release-"]
+
+    def test_sorted_rpm_label(self):
+        """Assert that the keys compared by labelCompare give the same order."""
+        with mock.patch.object(rpm, "_get_label_key", rpm._RpmLabel), mock.patch.dict(
+            "anitya.config.config", {"VERSION_PARSE_CACHE_SIZE": 0}
+        ):
+            self.test_pairwise()
+            self.test_sorted()
+
+
+class SemanticSortKeyTests(SortKeyParityMixin, unittest.TestCase):
+    """Tests for the :meth:`anitya.lib.versions.semver.SemanticVersion.get_sort_key` method."""
+
+    version_class = semver.SemanticVersion
+    versions = SEMANTIC_VERSIONS
+    incomparable = ["1.0", "not-a-version"]
+
+
+class CalendarSortKeyTests(SortKeyParityMixin, unittest.TestCase):
+    """Tests for the :meth:`anitya.lib.versions.calver.CalendarVersion.get_sort_key` method."""
+
+    version_class = calver.CalendarVersion
+    versions = CALENDAR_VERSIONS
+    pattern = "YYYY.0M.MICRO-MODIFIER"
+
+    def test_sorted_without_pattern(self):
+        """Assert that versions without pattern are sorted the same way."""
+        self.pattern = None
+        self.test_sorted()
@@ -23,8 +23,12 @@
 Anitya tests for check service.
 """
 
+import asyncio
 import unittest
+from collections import Counter
 from datetime import timedelta, timezone
+from threading import Lock, current_thread
+from time import sleep
 from unittest import mock
 
 import anitya_schema
@@ -34,7 +38,8 @@ from sqlalchemy import select
 
 from anitya.check_service import Checker
 from anitya.db import models
-from anitya.lib import exceptions
+from anitya.lib import exceptions, plugins
+from anitya.lib.response_cache import response_cache
 from anitya.tests.base import DatabaseTestCase
 
 
@@ -108,6 +113,34 @@ class CheckerTests(DatabaseTestCase):
         self.assertEqual(self.checker.error_counter, 0)
         self.assertEqual(self.checker.blacklist_dict, {})
 
+    @mock.patch(
+        "anitya.lib.utilities.check_project_release",
+        mock.Mock(
+            side_effect=exceptions.HostUnavailableException(
+                "ftp.gnu.org", "2100-01-01T00:00:00Z"
+            )
+        ),
+    )
+    def test_update_project_host_unavailable(self):
+        """
+        Assert that unavailable host doesn't blacklist the whole backend.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GNU project",
+            homepage="www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+
+        self.checker.update_project(project.id)
+
+        self.assertEqual(self.checker.ratelimit_counter, 1)
+        self.assertEqual(self.checker.error_counter, 0)
+        self.assertEqual(self.checker.blacklist_dict, {})
+        self.assertEqual(self.checker.ratelimit_queue, {})
+
     @mock.patch(
         "anitya.lib.utilities.check_project_release",
         mock.Mock(side_effect=exceptions.AnityaException("")),
@@ -183,6 +216,29 @@ class CheckerTests(DatabaseTestCase):
         self.assertEqual(self.checker.success_counter, 1)
         self.assertEqual(self.checker.error_counter, 0)
 
+    @mock.patch.dict("anitya.config.config", {"CHECK_PIPELINE": True})
+    @mock.patch("anitya.lib.utilities.check_project_spec")
+    def test_update_project_pipeline(self, mock_check_project_spec):
+        """
+        Assert that project snapshot is checked in pipeline mode.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+
+        self.checker.update_project(project.id)
+
+        mock_check_project_spec.assert_called_once()
+        spec = mock_check_project_spec.call_args.args[0]
+        self.assertIsInstance(spec, models.ProjectSpec)
+        self.assertEqual(spec.id, project.id)
+        self.assertEqual(self.checker.success_counter, 1)
+
     @mock.patch(
         "anitya.lib.utilities.check_project_release",
         mock.Mock(side_effect=exceptions.AnityaException("")),
@@ -325,6 +381,30 @@ class CheckerTests(DatabaseTestCase):
         self.assertEqual(self.checker.error_counter, 0)
         self.assertEqual(self.checker.ratelimit_queue["GitHub"][0], project.id)
 
+    @mock.patch.dict("anitya.config.config", {"CHECK_DISTRIBUTED": True})
+    def test_blacklist_project_distributed(self):
+        """
+        Assert that rate limit is shared in database in distributed mode.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+        reset_time = arrow.get(project.next_check + timedelta(hours=1))
+
+        self.checker.blacklist_project(project, reset_time)
+
+        self.assertEqual(self.checker.ratelimit_counter, 1)
+        self.assertEqual(self.checker.ratelimit_queue, {})
+        rate_limits = models.BackendRateLimit.active(
+            self.session, arrow.utcnow().datetime
+        )
+        self.assertEqual(rate_limits, {"GitHub": reset_time.datetime})
+
     def test_run(self):
         """
         Assert that `db.Run` is created at the end of run with success.
@@ -455,6 +535,518 @@ class CheckerTests(DatabaseTestCase):
         self.assertEqual(run_objects[0].total_count, 2)
         self.assertEqual(run_objects[0].error_count, 2)
 
+    @mock.patch.dict("anitya.config.config", {"CHECK_ENGINE": "asyncio"})
+    def test_run_asyncio(self):
+        """
+        Assert that `db.Run` is created at the end of run with asyncio engine.
+        """
+        for index in range(3):
+            project = models.Project(
+                name=f"Foobar{index}",
+                backend="GitHub",
+                homepage=f"https://www.fakeproject{index}.com",
+                next_check=arrow.utcnow().datetime,
+            )
+            self.session.add(project)
+        self.session.commit()
+
+        def increment(project_id):
+            with self.checker.success_counter_lock:
+                self.checker.success_counter += 1
+
+        self.checker.update_project = increment
+
+        self.checker.run()
+
+        run_objects = self.session.scalars(select(models.Run)).all()
+
+        self.assertEqual(len(run_objects), 1)
+        self.assertEqual(run_objects[0].total_count, 3)
+        self.assertEqual(run_objects[0].error_count, 0)
+        self.assertEqual(run_objects[0].success_count, 3)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {
+            "CHECK_ENGINE": "asyncio",
+            "CHECK_HOST_CONCURRENCY": 1,
+            "CHECK_BACKEND_CONCURRENCY": {"GitHub": 2},
+        },
+    )
+    def test_run_asyncio_limits(self):
+        """
+        Assert that asyncio engine respects host and backend limits.
+        """
+        projects = [
+            ("Foobar", "custom", "https://example.com/foobar"),
+            ("Foobar2", "custom", "https://example.com/foobar2"),
+            ("Foobar3", "GitHub", "https://github.com/fake/foobar3"),
+            ("Foobar4", "GitHub", "https://github.com/fake/foobar4"),
+            ("Foobar5", "GitHub", "https://gitlab.com/fake/foobar5"),
+        ]
+        for name, backend, homepage in projects:
+            project = models.Project(
+                name=name,
+                backend=backend,
+                homepage=homepage,
+                next_check=arrow.utcnow().datetime,
+            )
+            self.session.add(project)
+        self.session.commit()
+
+        hosts = {
+            project_id: (backend, host)
+            for project_id, backend, host in self.checker.get_project_hosts(
+                self.checker.construct_queue(arrow.utcnow().datetime)
+            )
+        }
+        running = {"hosts": Counter(), "backends": Counter()}
+        peaks = {"hosts": Counter(), "backends": Counter()}
+        lock = Lock()
+
+        def check(project_id):
+            backend, host = hosts[project_id]
+            with lock:
+                running["hosts"][host] += 1
+                running["backends"][backend] += 1
+                peaks["hosts"][host] = max(peaks["hosts"][host], running["hosts"][host])
+                peaks["backends"][backend] = max(
+                    peaks["backends"][backend], running["backends"][backend]
+                )
+            sleep(0.05)
+            with lock:
+                running["hosts"][host] -= 1
+                running["backends"][backend] -= 1
+                self.checker.success_counter += 1
+
+        self.checker.update_project = check
+
+        self.checker.run()
+
+        self.assertEqual(self.checker.success_counter, 5)
+        self.assertEqual(peaks["hosts"]["example.com"], 1)
+        self.assertEqual(peaks["hosts"]["github.com"], 1)
+        self.assertLessEqual(peaks["backends"]["GitHub"], 2)
+
+    @mock.patch.dict(
+        "anitya.config.config", {"CHECK_ENGINE": "asyncio", "CHECK_TIMEOUT": 0.01}
+    )
+    def test_run_asyncio_timeout(self):
+        """
+        Assert that error counter is incremented when check takes too long.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="https://www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+
+        def wait(project_id):
+            sleep(0.1)
+
+        self.checker.update_project = wait
+
+        self.checker.run()
+
+        run_objects = self.session.scalars(select(models.Run)).all()
+
+        self.assertEqual(len(run_objects), 1)
+        self.assertEqual(run_objects[0].total_count, 1)
+        self.assertEqual(run_objects[0].error_count, 1)
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {
+            "CHECK_ENGINE": "asyncio",
+            "CHECK_TIMEOUT": 0.05,
+            "CHECK_ASYNC_CONCURRENCY": 1,
+        },
+    )
+    def test_run_asyncio_timeout_thread_start(self):
+        """
+        Assert that timeout is counted from the start of the check in thread,
+        so check waiting for the thread of timed out check isn't cancelled.
+        """
+        for name in ("Foobar", "Foobar2"):
+            project = models.Project(
+                name=name,
+                backend="GitHub",
+                homepage="https://www.fakeproject.com",
+                next_check=arrow.utcnow().datetime,
+            )
+            self.session.add(project)
+        self.session.commit()
+        calls = []
+
+        def check(project_id):
+            calls.append(project_id)
+            if len(calls) == 1:
+                sleep(0.2)
+            else:
+                self.checker.success_counter += 1
+
+        self.checker.update_project = check
+
+        self.checker.run()
+
+        run_objects = self.session.scalars(select(models.Run)).all()
+        self.assertEqual(len(run_objects), 1)
+        self.assertEqual(run_objects[0].total_count, 2)
+        self.assertEqual(run_objects[0].error_count, 1)
+        self.assertEqual(run_objects[0].success_count, 1)
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_ENGINE": "asyncio"})
+    def test_run_asyncio_exception(self):
+        """
+        Assert that exception in check is logged and doesn't stop the run.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="https://www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+
+        self.checker.update_project = mock.Mock(side_effect=Exception("Crash"))
+
+        with mock.patch("anitya.check_service._log") as mock_log:
+            self.checker.run()
+
+        mock_log.exception.assert_called_once()
+        run_objects = self.session.scalars(select(models.Run)).all()
+        self.assertEqual(len(run_objects), 1)
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_ENGINE": "asyncio"})
+    def test_run_asyncio_queue_thread(self):
+        """
+        Assert that the queue is read and hosts are resolved outside
+        of the event loop thread.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="https://www.fakeproject.com",
+        )
+        self.session.add(project)
+        self.session.commit()
+        threads = []
+
+        def queue():
+            threads.append(current_thread())
+            yield project.id
+
+        get_project_hosts = self.checker.get_project_hosts
+
+        def hosts(project_ids):
+            threads.append(current_thread())
+            return get_project_hosts(project_ids)
+
+        self.checker.update_project = mock.Mock()
+
+        with mock.patch.object(self.checker, "get_project_hosts", side_effect=hosts):
+            count = asyncio.run(self.checker.run_asyncio(queue()))
+
+        self.assertEqual(count, 1)
+        self.checker.update_project.assert_called_once_with(project.id)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(current_thread(), threads)
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_WRITE_BATCH": 10})
+    def test_run_write_batch(self):
+        """
+        Assert that results collected in sink are written at the end of run.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=arrow.utcnow().datetime,
+        )
+        self.session.add(project)
+        self.session.commit()
+        checker = Checker()
+        checker.flask_app = self.flask_app
+
+        def update_project(project_id):
+            checker.success_counter = checker.success_counter + 1
+
+        checker.update_project = update_project
+        checker.sink.flush = mock.Mock()
+
+        checker.run()
+
+        checker.sink.flush.assert_called_once_with()
+
+    @mock.patch("anitya.check_service.GithubBackend.register_batch")
+    def test_batch_github(self, mock_register_batch):
+        """
+        Assert that GitHub projects are grouped to batches.
+        """
+        projects = []
+        for name, backend in [
+            ("Foobar", "GitHub"),
+            ("Foobar2", "PyPI"),
+            ("Foobar3", "GitHub"),
+            ("Foobar4", "GitHub"),
+        ]:
+            project = models.Project(
+                name=name,
+                backend=backend,
+                homepage=f"https://github.com/fake/{name}",
+            )
+            self.session.add(project)
+            projects.append(project)
+        self.session.commit()
+        ids = [project.id for project in projects]
+
+        result = list(self.checker.batch_github(ids, 2))
+
+        self.assertEqual(result, [ids[1], ids[0], ids[2], ids[3]])
+        self.assertEqual(mock_register_batch.call_count, 2)
+        batch = mock_register_batch.call_args_list[0].args[0]
+        self.assertEqual([spec.id for spec in batch], [ids[0], ids[2]])
+        self.assertEqual(batch[0].homepage, "https://github.com/fake/Foobar")
+        batch = mock_register_batch.call_args_list[1].args[0]
+        self.assertEqual([spec.id for spec in batch], [ids[3]])
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_GITHUB_BATCH": 10})
+    @mock.patch("anitya.check_service.GithubBackend.clear_batches")
+    def test_check_queue_github_batch(self, mock_clear_batches):
+        """
+        Assert that GitHub batches are cleared after the queue is checked.
+        """
+        checked = []
+        self.checker.update_project = checked.append
+
+        with mock.patch.object(
+            self.checker, "batch_github", return_value=iter([1, 2])
+        ) as mock_batch_github:
+            count = self.checker.check_queue([2, 1])
+
+        mock_batch_github.assert_called_once_with([2, 1], 10)
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(checked), [1, 2])
+        mock_clear_batches.assert_called_once_with()
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_RESPONSE_CACHE_SIZE": 10})
+    def test_check_queue_response_cache(self):
+        """
+        Assert that response cache is enabled only while the queue is checked.
+        """
+        enabled = []
+
+        def update_project(project_id):
+            enabled.append(response_cache.enabled())
+
+        self.checker.update_project = update_project
+
+        count = self.checker.check_queue([1, 2])
+
+        self.assertEqual(count, 2)
+        self.assertEqual(enabled, [True, True])
+        self.assertFalse(response_cache.enabled())
+
+    def test_get_project_hosts(self):
+        """
+        Assert that host is obtained from version URL or homepage.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="custom",
+            homepage="https://www.fakeproject.com",
+            version_url="https://download.fakeproject.com/releases",
+        )
+        self.session.add(project)
+        project2 = models.Project(
+            name="Foobar2",
+            backend="GitHub",
+            homepage="https://github.com/fake/foobar2",
+            version_url="fake/foobar2",
+        )
+        self.session.add(project2)
+        project3 = models.Project(
+            name="Foobar3",
+            backend="custom",
+            homepage="www.fakeproject.com",
+        )
+        self.session.add(project3)
+        self.session.commit()
+
+        result = self.checker.get_project_hosts([project3.id, project2.id, project.id])
+
+        self.assertEqual(
+            result,
+            [
+                (project3.id, "custom", None),
+                (project2.id, "GitHub", "github.com"),
+                (project.id, "custom", "download.fakeproject.com"),
+            ],
+        )
+
+    @mock.patch.dict(
+        "anitya.config.config",
+        {"CHECK_DISTRIBUTED": True, "CHECK_LEASE_BATCH": 2, "CHECK_NODE_ID": "node"},
+    )
+    def test_run_distributed(self):
+        """
+        Assert that projects are leased in batches and released after check
+        in distributed mode.
+        """
+        for i in range(5):
+            project = models.Project(
+                name=f"Foobar{i}",
+                backend="GitHub",
+                homepage=f"www.fakeproject{i}.com",
+                next_check=arrow.utcnow().datetime - timedelta(hours=1),
+            )
+            self.session.add(project)
+        self.session.commit()
+        checker = Checker()
+        checker.flask_app = self.flask_app
+        batches = []
+
+        def update_project(project_id):
+            project = self.session.get(models.Project, project_id)
+            batches.append((project_id, project.lease_owner))
+            project.next_check = arrow.utcnow().datetime + timedelta(hours=1)
+            self.session.add(project)
+            self.session.commit()
+            checker.success_counter = checker.success_counter + 1
+
+        checker.update_project = update_project
+
+        checker.run()
+
+        self.assertEqual(len(batches), 5)
+        self.assertEqual({owner for _, owner in batches}, {"node"})
+        projects = self.session.scalars(select(models.Project)).all()
+        for project in projects:
+            self.assertIsNone(project.lease_owner)
+            self.assertIsNone(project.lease_expiry)
+        run_objects = self.session.scalars(select(models.Run)).all()
+        self.assertEqual(len(run_objects), 1)
+        self.assertEqual(run_objects[0].total_count, 5)
+        self.assertEqual(run_objects[0].success_count, 5)
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_DISTRIBUTED": True})
+    def test_run_distributed_nothing_to_check(self):
+        """
+        Assert that `db.Run` is not created when nothing was leased.
+        """
+        self.checker.run()
+
+        run_objects = self.session.scalars(select(models.Run)).all()
+        self.assertEqual(len(run_objects), 0)
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_LEASE_BATCH": 10})
+    def test_lease_projects(self):
+        """
+        Assert that only projects ready for check and not leased by other
+        node are leased.
+        """
+        time = arrow.utcnow().datetime
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=time - timedelta(hours=1),
+        )
+        self.session.add(project)
+        project_leased = models.Project(
+            name="Foobar2",
+            backend="GitHub",
+            homepage="www.fakeproject2.com",
+            next_check=time - timedelta(hours=1),
+            lease_owner="other",
+            lease_expiry=time + timedelta(hours=1),
+        )
+        self.session.add(project_leased)
+        project_expired = models.Project(
+            name="Foobar3",
+            backend="GitHub",
+            homepage="www.fakeproject3.com",
+            next_check=time - timedelta(hours=2),
+            lease_owner="other",
+            lease_expiry=time - timedelta(hours=1),
+        )
+        self.session.add(project_expired)
+        project_not_ready = models.Project(
+            name="Foobar4",
+            backend="GitHub",
+            homepage="www.fakeproject4.com",
+            next_check=time + timedelta(hours=1),
+        )
+        self.session.add(project_not_ready)
+        self.session.commit()
+
+        result = self.checker.lease_projects(time)
+
+        self.assertEqual(result, [project_expired.id, project.id])
+        self.session.refresh(project)
+        self.assertEqual(project.lease_owner, self.checker.node_id)
+        self.assertIsNotNone(project.lease_expiry)
+        self.session.refresh(project_leased)
+        self.assertEqual(project_leased.lease_owner, "other")
+
+    def test_lease_projects_blacklisted_backend(self):
+        """
+        Assert that projects of backend rate limited by other node are not leased.
+        """
+        time = arrow.utcnow().datetime
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=time - timedelta(hours=1),
+        )
+        self.session.add(project)
+        self.session.commit()
+        reset_time = time + timedelta(hours=1)
+        models.BackendRateLimit.set(self.session, "GitHub", reset_time)
+
+        result = self.checker.lease_projects(time)
+
+        self.assertEqual(result, [])
+        self.assertEqual(self.checker.blacklist_dict, {"GitHub": reset_time})
+
+    def test_release_projects(self):
+        """
+        Assert that lease is released only for rescheduled projects.
+        """
+        time = arrow.utcnow().datetime
+        project = models.Project(
+            name="Foobar",
+            backend="GitHub",
+            homepage="www.fakeproject.com",
+            next_check=time + timedelta(hours=1),
+            lease_owner=self.checker.node_id,
+            lease_expiry=time + timedelta(hours=1),
+        )
+        self.session.add(project)
+        project_not_checked = models.Project(
+            name="Foobar2",
+            backend="GitHub",
+            homepage="www.fakeproject2.com",
+            next_check=time - timedelta(hours=1),
+            lease_owner=self.checker.node_id,
+            lease_expiry=time + timedelta(hours=1),
+        )
+        self.session.add(project_not_checked)
+        self.session.commit()
+
+        self.checker.release_projects([project.id, project_not_checked.id], time)
+
+        self.session.refresh(project)
+        self.assertIsNone(project.lease_owner)
+        self.assertIsNone(project.lease_expiry)
+        self.session.refresh(project_not_checked)
+        self.assertEqual(project_not_checked.lease_owner, self.checker.node_id)
+
     def test_clear_counters(self):
         """
         Assert that counters are cleared.
@@ -541,6 +1133,311 @@ class CheckerTests(DatabaseTestCase):
         self.assertEqual(queue[0], project.id)
         self.assertEqual(queue[1], project2.id)
 
+    @mock.patch("anitya.check_service.QUEUE_PAGE_SIZE", 2)
+    def test_construct_queue_pages(self):
+        """
+        Assert that every project is in the queue when it is fetched in pages.
+        """
+        time = arrow.utcnow().datetime
+        project_ids = []
+        for name in ["Foobar", "Foobar", "Barfoo", "Foobar2", "Foobar3"]:
+            project = models.Project(
+                name=name,
+                backend="GitHub" if name != "Foobar3" else "PyPI",
+                homepage=f"www.{len(project_ids)}.com",
+                next_check=time,
+            )
+            self.session.add(project)
+            self.session.commit()
+            project_ids.append(project.id)
+
+        self.checker.blacklist_dict = {"PyPI": time + timedelta(hours=2)}
+
+        queue = self.checker.construct_queue(time + timedelta(hours=1))
+
+        self.assertEqual(
+            queue, [project_ids[2], project_ids[0], project_ids[1], project_ids[3]]
+        )
+
+    @mock.patch("anitya.check_service.QUEUE_PAGE_SIZE", 1)
+    def test_stream_queue(self):
+        """
+        Assert that queue is streamed and projects rescheduled by checks
+        aren't skipped.
+        """
+        time = arrow.utcnow().datetime
+        for i in range(3):
+            project = models.Project(
+                name=f"Foobar{i}",
+                backend="GitHub",
+                homepage=f"www.fakeproject{i}.com",
+                next_check=time,
+            )
+            self.session.add(project)
+        self.session.commit()
+
+        queue = self.checker.stream_queue(time + timedelta(hours=1))
+        result = []
+        for project_id in queue:
+            result.append(project_id)
+            # Reschedule project like check would do
+            project = self.session.get(models.Project, project_id)
+            project.next_check = time + timedelta(hours=2)
+            self.session.add(project)
+            self.session.commit()
+
+        self.assertEqual(result, [1, 2, 3])
+
+    def test_construct_queue_feeds(self):
+        """
+        Assert that projects with release announced in feed are on the start
+        of the queue.
+        """
+        time = arrow.utcnow().datetime
+        project = models.Project(
+            name="Barfoo",
+            backend="PyPI",
+            homepage="www.fakeproject.com",
+            next_check=time,
+        )
+        self.session.add(project)
+        project2 = models.Project(
+            name="Foobar",
+            backend="PyPI",
+            homepage="www.fakeproject2.com",
+            next_check=time + timedelta(hours=2),
+        )
+        self.session.add(project2)
+        self.session.commit()
+        self.checker.feed_pending = [project2.id]
+
+        queue = self.checker.construct_queue(time + timedelta(hours=1))
+
+        self.assertEqual(queue, [project2.id, project.id])
+        self.assertEqual(self.checker.feed_pending, [])
+
+    def test_stream_queue_feeds_pending(self):
+        """
+        Assert that projects found by feed poller are taken while the queue
+        is streamed.
+        """
+        time = arrow.utcnow().datetime
+        projects = []
+        for name in ("Barfoo", "Foobar", "Foobaz"):
+            project = models.Project(
+                name=name,
+                backend="PyPI",
+                homepage=f"www.{name}.com",
+                next_check=time,
+            )
+            self.session.add(project)
+            projects.append(project)
+        self.session.commit()
+        barfoo, foobar, foobaz = projects
+
+        queue = []
+        for project_id in self.checker.stream_queue(time + timedelta(hours=1)):
+            queue.append(project_id)
+            if project_id == barfoo.id:
+                self.checker.feed_pending.append(foobaz.id)
+
+        self.assertEqual(queue, [barfoo.id, foobaz.id, foobar.id])
+
+    def test_add_feed_projects(self):
+        """
+        Assert that feeds of backends that aren't rate limited are polled.
+        """
+        self.checker.blacklist_dict = {"GitHub": arrow.utcnow().datetime}
+        self.checker.feed_pending = [1]
+
+        with mock.patch.object(
+            self.checker, "poll_feeds", return_value=[2, 3]
+        ) as mock_poll_feeds:
+            self.checker.add_feed_projects()
+
+        mock_poll_feeds.assert_called_once_with(frozenset(["GitHub"]))
+        self.assertEqual(self.checker.feed_pending, [1, 2, 3])
+
+    def test_add_feed_projects_exception(self):
+        """
+        Assert that failed poll is logged and doesn't stop the poller.
+        """
+        error = ValueError("Error")
+
+        with mock.patch.object(
+            self.checker, "poll_feeds", side_effect=error
+        ), mock.patch("anitya.check_service._log") as mock_log:
+            self.checker.add_feed_projects()
+
+        mock_log.exception.assert_called_once_with(error)
+        self.assertEqual(self.checker.feed_pending, [])
+
+    @mock.patch.dict("anitya.config.config", {"CHECK_FEEDS": True})
+    @mock.patch("anitya.check_service.FEED_POLL_INTERVAL", 0)
+    def test_start_feed_poller(self):
+        """
+        Assert that feeds are polled in thread till the poller is stopped.
+        """
+        polls = []
+
+        def add_feed_projects():
+            polls.append(1)
+            if len(polls) == 2:
+                self.checker.feed_stop.set()
+
+        with mock.patch.object(
+            self.checker, "add_feed_projects", side_effect=add_feed_projects
+        ):
+            self.checker.start_feed_poller()
+            self.checker.feed_thread.join(5)
+
+        self.assertEqual(len(polls), 2)
+        self.assertFalse(self.checker.feed_thread.is_alive())
+        self.checker.stop_feed_poller()
+        self.assertIsNone(self.checker.feed_thread)
+
+    @mock.patch.dict(
+        "anitya.config.config", {"CHECK_FEEDS": True, "CHECK_DISTRIBUTED": True}
+    )
+    def test_start_feed_poller_distributed(self):
+        """
+        Assert that feeds are not polled in distributed mode.
+        """
+        self.checker.start_feed_poller()
+
+        self.assertIsNone(self.checker.feed_thread)
+
+    def test_poll_feeds(self):
+        """
+        Assert that feed entries are resolved to existing projects.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="PyPI",
+            homepage="www.fakeproject.com",
+            latest_version="1.0",
+        )
+        self.session.add(project)
+        project2 = models.Project(
+            name="barfoo",
+            backend="PyPI",
+            homepage="www.fakeproject2.com",
+            latest_version="1.0",
+        )
+        self.session.add(project2)
+        project3 = models.Project(
+            name="foobar",
+            backend="npmjs",
+            homepage="www.fakeproject3.com",
+        )
+        self.session.add(project3)
+        self.session.commit()
+        entries = [
+            ("foobar", "https://pypi.org/project/foobar/", "PyPI", "1.1"),
+            ("Barfoo", "https://pypi.org/project/Barfoo/", "PyPI", "1.0"),
+            ("unknown", "https://pypi.org/project/unknown/", "PyPI", "1.0"),
+        ]
+        pypi = plugins.get_plugin("PyPI")
+        hackage = plugins.get_plugin("Hackage")
+
+        with mock.patch.object(
+            plugins.BACKEND_PLUGINS, "get_plugins", return_value=[pypi, hackage]
+        ), mock.patch.object(pypi, "check_feed", return_value=iter(entries)):
+            result = self.checker.poll_feeds()
+
+        self.assertEqual(result, [project.id])
+        self.assertEqual(self.checker.feed_unsupported, {"Hackage"})
+
+        # Entries that were already seen are skipped
+        with mock.patch.object(
+            plugins.BACKEND_PLUGINS, "get_plugins", return_value=[pypi]
+        ), mock.patch.object(pypi, "check_feed", return_value=iter(entries)):
+            result = self.checker.poll_feeds()
+
+        self.assertEqual(result, [])
+
+    def test_poll_feeds_blacklisted_and_error(self):
+        """
+        Assert that feeds of blacklisted backends are skipped and errors are logged.
+        """
+        pypi = plugins.get_plugin("PyPI")
+        npmjs = plugins.get_plugin("npmjs")
+
+        with mock.patch.object(
+            plugins.BACKEND_PLUGINS, "get_plugins", return_value=[pypi, npmjs]
+        ), mock.patch.object(pypi, "check_feed") as mock_pypi, mock.patch.object(
+            npmjs,
+            "check_feed",
+            side_effect=exceptions.AnityaPluginException("Error"),
+        ), mock.patch(
+            "anitya.check_service._log"
+        ) as mock_log:
+            result = self.checker.poll_feeds(frozenset(["PyPI"]))
+
+        self.assertEqual(result, [])
+        mock_pypi.assert_not_called()
+        mock_log.info.assert_called_once_with("Feed of %s failed: %s", "npmjs", "Error")
+
+    def test_poll_feeds_malformed(self):
+        """
+        Assert that malformed feed and entries are skipped.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="npmjs",
+            homepage="www.fakeproject.com",
+            latest_version="1.0",
+        )
+        self.session.add(project)
+        self.session.commit()
+        pypi = plugins.get_plugin("PyPI")
+        npmjs = plugins.get_plugin("npmjs")
+        entries = [
+            ("foobar", "1.1"),
+            ("foobar", "https://www.npmjs.com/package/foobar", "npmjs", "1.1"),
+        ]
+
+        with mock.patch.object(
+            plugins.BACKEND_PLUGINS, "get_plugins", return_value=[pypi, npmjs]
+        ), mock.patch.object(
+            pypi, "check_feed", side_effect=KeyError("title")
+        ), mock.patch.object(
+            npmjs, "check_feed", return_value=iter(entries)
+        ):
+            result = self.checker.poll_feeds()
+
+        self.assertEqual(result, [project.id])
+
+    def test_get_feed_index(self):
+        """
+        Assert that index is built only after TTL expired.
+        """
+        project = models.Project(
+            name="Foobar",
+            backend="PyPI",
+            homepage="www.fakeproject.com",
+            latest_version="1.0",
+        )
+        self.session.add(project)
+        self.session.commit()
+        self.checker.feed_seen["PyPI"] = {("foobar", "1.0")}
+
+        index = self.checker.get_feed_index("PyPI")
+
+        self.assertEqual(index, {"foobar": [(project.id, "1.0")]})
+        self.assertNotIn("PyPI", self.checker.feed_seen)
+
+        project.name = "Barfoo"
+        self.session.add(project)
+        self.session.commit()
+
+        self.assertEqual(self.checker.get_feed_index("PyPI"), index)
+
+        self.checker.feed_index_time["PyPI"] = arrow.utcnow().shift(hours=-2)
+        self.assertEqual(
+            self.checker.get_feed_index("PyPI"), {"barfoo": [(project.id, "1.0")]}
+        )
+
     def test_construct_queue_archived(self):
         """
         Assert that archived project is not added to queue.
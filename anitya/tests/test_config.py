@@ -153,9 +153,33 @@ class LoadTests(unittest.TestCase):
             "SESSION_PROTECTION": "strong",
             "DEFAULT_REGEX": "a*b*",
             "GITHUB_ACCESS_TOKEN": "foobar",
+            "GITHUB_ACCESS_TOKENS": [],
+            "GITHUB_PACING": False,
+            "GITHUB_PACING_MAX_WAIT": 60,
             "CRON_POOL": 10,
             "CHECK_TIMEOUT": 600,
+            "CHECK_ENGINE": "threads",
+            "CHECK_ASYNC_CONCURRENCY": 100,
+            "CHECK_HOST_CONCURRENCY": 4,
+            "CHECK_BACKEND_CONCURRENCY": {},
+            "CHECK_GITHUB_BATCH": 0,
+            "CHECK_FEEDS": False,
+            "CHECK_DISTRIBUTED": False,
+            "CHECK_LEASE_BATCH": 100,
+            "CHECK_LEASE_TIME": 900,
+            "CHECK_NODE_ID": "",
+            "CHECK_PIPELINE": False,
+            "CHECK_WRITE_BATCH": 0,
+            "CHECK_WRITE_INTERVAL": 10,
             "CHECK_ERROR_THRESHOLD": 100,
+            "CHECK_RESPONSE_CACHE_SIZE": 0,
+            "HOST_MAX_IN_FLIGHT": 0,
+            "HOST_BACKOFF_MAX": 300,
+            "HOST_FAILURE_THRESHOLD": 5,
+            "HOST_CIRCUIT_TIMEOUT": 300,
+            "VERSION_PARSE_CACHE_SIZE": 50000,
+            "API_COUNT_CACHE_TIMEOUT": 300,
+            "API_COUNT_CACHE_SIZE": 1000,
             "DISTRO_MAPPING_LINKS": {
                 "AlmaLinux": "https://git.almalinux.org/rpms/%s",
                 "Fedora": "https://src.fedoraproject.org/rpms/%s",
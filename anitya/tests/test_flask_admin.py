@@ -710,6 +710,8 @@ class DeleteProjectVersionTests(DatabaseTestCase):
                 1, len(self.session.execute(select(models.ProjectVersion)).all())
             )
             self.assertEqual(self.project.latest_version, "1.0.0")
+            self.assertEqual(self.project.latest_stable_version, "1.0.0")
+            self.assertEqual(self.project.versions_count, 1)
 
     def test_admin_post_latest_version_parsed(self):
         """
@@ -852,6 +854,8 @@ class DeleteProjectVersionsTests(DatabaseTestCase):
                 0, len(self.session.execute(select(models.ProjectVersion)).all())
             )
             self.assertEqual(self.project.latest_version, None)
+            self.assertEqual(self.project.latest_stable_version, None)
+            self.assertEqual(self.project.versions_count, 0)
 
     def test_admin_post_multiple_versions(self):
         """
@@ -27,16 +27,19 @@ import json
 import unittest
 
 import anitya_schema
+import mock
 from fedora_messaging import testing as fml_testing
 
 from anitya.db import models
 from anitya.lib.backends import REGEX
 from anitya.tests.base import (
     DatabaseTestCase,
+    count_queries,
     create_distro,
     create_ecosystem_projects,
     create_package,
     create_project,
+    create_projects_with_versions,
 )
 
 
@@ -211,6 +214,74 @@ class AnityaWebAPItests(DatabaseTestCase):
         )
         self.assertEqual(output.data, exp)
 
+    def test_api_projects_queries(self):
+        """Assert the number of queries doesn't depend on number of projects."""
+        create_projects_with_versions(self.session, 250)
+
+        with count_queries() as queries:
+            output = self.app.get("/api/projects")
+
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+        self.assertEqual(data["total"], 250)
+        self.assertEqual(data["projects"][0]["versions"], ["1.1", "1.0"])
+        # Projects and their versions
+        self.assertLessEqual(len(queries), 2)
+
+    def assertStreamedJson(self, url, expected):
+        """Assert the streamed output is the same as the JSON of expected object."""
+        with self.flask_app.test_request_context():
+            exp = self.flask_app.json.response(expected).get_data()
+        output = self.app.get(url)
+        self.assertEqual(output.status_code, 200)
+        self.assertTrue(output.is_streamed)
+        self.assertEqual(output.mimetype, "application/json")
+        self.assertEqual(output.get_data(), exp)
+
+    @mock.patch("anitya.api.STREAM_BATCH_SIZE", 2)
+    def test_api_projects_streamed(self):
+        """Assert the streamed projects are the same as the JSON of the list."""
+        create_project(self.session)
+        create_projects_with_versions(self.session, 3)
+        project = models.Project.get(self.session, 1)
+        project.name = "geány\n"
+        self.session.commit()
+
+        projects = [project.__json__() for project in models.Project.all(self.session)]
+        names = [project["name"] for project in projects]
+        self.assertEqual(projects[1]["versions"], ["1.1", "1.0"])
+
+        for compact in (None, False):
+            with self.subTest(compact=compact), mock.patch.object(
+                self.flask_app.json, "compact", compact
+            ):
+                self.assertStreamedJson(
+                    "/api/projects", {"projects": projects, "total": 6}
+                )
+                self.assertStreamedJson(
+                    "/api/projects/names", {"projects": names, "total": 6}
+                )
+                self.assertStreamedJson(
+                    "/api/projects/names?pattern=foo", {"projects": [], "total": 0}
+                )
+
+    @mock.patch("anitya.api.STREAM_BATCH_SIZE", 2)
+    def test_api_packages_wiki_list_streamed(self):
+        """Assert the streamed packages are sent in batches."""
+        create_projects_with_versions(self.session, 5)
+
+        with count_queries() as queries:
+            output = self.app.get("/api/packages/wiki/")
+            self.assertTrue(output.is_streamed)
+            data = output.get_data()
+
+        exp = "\n".join(
+            f"* project-{index:04d} None None" for index in range(5)
+        ).encode()
+        self.assertEqual(data, exp)
+        # Projects and their packages for each batch
+        self.assertLessEqual(len(queries), 4)
+
     def test_api_projects_names(self):
         """Test the api_projects_names function of the API."""
         create_distro(self.session)
@@ -36,7 +36,12 @@ from fedora_messaging import testing as fml_testing
 from anitya.db import models
 from anitya.lib import exceptions
 
-from .base import DatabaseTestCase, create_project
+from .base import (
+    DatabaseTestCase,
+    count_queries,
+    create_project,
+    create_projects_with_versions,
+)
 
 
 # Py3 compatibility: UTF-8 decoding and JSON decoding may be separate steps
@@ -70,6 +75,21 @@ class PackagesResourceGetTests(DatabaseTestCase):
             data, {"page": 1, "items_per_page": 25, "total_items": 0, "items": []}
         )
 
+    def test_packages_queries(self):
+        """Assert the number of queries doesn't depend on number of packages."""
+        create_projects_with_versions(self.session, 250)
+
+        with count_queries() as queries:
+            output = self.app.get("/api/v2/packages/?items_per_page=250")
+
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+        self.assertEqual(len(data["items"]), 250)
+        self.assertEqual(data["items"][0]["stable_version"], "1.1")
+        self.assertEqual(data["items"][0]["version"], "1.1")
+        # Count and page of packages with projects
+        self.assertLessEqual(len(queries), 2)
+
     def test_authenticated(self):
         """Assert the API works when authenticated."""
         output = self.app.get(
@@ -90,6 +110,7 @@ class PackagesResourceGetTests(DatabaseTestCase):
             homepage="https://pypi.io/project/requests",
             backend="PyPI",
             latest_version="1",
+            latest_stable_version="1",
         )
         fedora_package = models.Packages(
             distro_name="Fedora", project=project, package_name="python-requests"
@@ -451,6 +472,64 @@ class PackagesResourceGetTests(DatabaseTestCase):
             {"message": {"page": "Not a valid integer."}},
         )
 
+    def test_list_packages_after(self):
+        """Assert all packages are listed by following the cursors."""
+        project = models.Project(
+            name="requests",
+            homepage="https://pypi.io/project/requests",
+            backend="PyPI",
+        )
+        self.session.add(project)
+        for distro in ("Fedora", "Debian", "jcline linux"):
+            self.session.add(
+                models.Packages(
+                    distro_name=distro, project=project, package_name="python-requests"
+                )
+            )
+        self.session.commit()
+
+        distros = []
+        after = ""
+        while after is not None:
+            output = self.app.get("/api/v2/packages/?items_per_page=2&after=" + after)
+            self.assertEqual(output.status_code, 200)
+            data = _read_json(output)
+            self.assertNotIn("page", data)
+            self.assertEqual(data["total_items"], 3)
+            self.assertEqual(data["items_per_page"], 2)
+            distros.extend(item["distribution"] for item in data["items"])
+            after = data["next_after"]
+
+        self.assertEqual(distros, ["Fedora", "Debian", "jcline linux"])
+
+    def test_list_packages_after_invalid(self):
+        """Assert an invalid cursor results in an error."""
+        output = self.app.get("/api/v2/packages/?after=invalid")
+        self.assertEqual(output.status_code, 400)
+        data = _read_json(output)
+
+        self.assertEqual(data, {"message": {"after": "Cursor is not valid."}})
+
+    def test_list_packages_total_none(self):
+        """Assert total is not returned when not requested."""
+        output = self.app.get("/api/v2/packages/?total=none")
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+
+        self.assertEqual(
+            data, {"page": 1, "items_per_page": 25, "total_items": None, "items": []}
+        )
+
+    def test_list_packages_total_invalid(self):
+        """Assert an unknown total mode results in an error."""
+        output = self.app.get("/api/v2/packages/?total=some")
+        self.assertEqual(output.status_code, 400)
+        data = _read_json(output)
+
+        self.assertEqual(
+            data, {"message": {"total": "Must be one of: exact, estimate, none."}}
+        )
+
 
 class PackagesResourcePostTests(DatabaseTestCase):
     """PackagesResourcePostTests"""
@@ -726,6 +805,20 @@ class ProjectsResourceGetTests(DatabaseTestCase):
             data, {"page": 1, "items_per_page": 25, "total_items": 0, "items": []}
         )
 
+    def test_projects_queries(self):
+        """Assert the number of queries doesn't depend on number of projects."""
+        create_projects_with_versions(self.session, 250)
+
+        with count_queries() as queries:
+            output = self.app.get("/api/v2/projects/?items_per_page=250")
+
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+        self.assertEqual(len(data["items"]), 250)
+        self.assertEqual(data["items"][0]["versions"], ["1.1", "1.0"])
+        # Count, page of projects and their versions
+        self.assertLessEqual(len(queries), 3)
+
     def test_authenticated(self):
         """Assert the API works when authenticated."""
         output = self.app.get(
@@ -1111,6 +1204,56 @@ class ProjectsResourceGetTests(DatabaseTestCase):
             {"message": {"page": "Not a valid integer."}},
         )
 
+    def test_list_projects_after(self):
+        """Assert all projects are listed by following the cursors."""
+        create_project(self.session)
+
+        names = []
+        after = ""
+        while after is not None:
+            output = self.app.get(
+                "/api/v2/projects/?items_per_page=1&total=estimate&after=" + after
+            )
+            self.assertEqual(output.status_code, 200)
+            data = _read_json(output)
+            self.assertNotIn("page", data)
+            self.assertEqual(data["total_items"], 3)
+            names.extend(item["name"] for item in data["items"])
+            after = data["next_after"]
+
+        self.assertEqual(names, ["R2spec", "geany", "subsurface"])
+
+    def test_list_projects_after_filtered(self):
+        """Assert the cursor pagination keeps the filters."""
+        create_project(self.session)
+
+        output = self.app.get("/api/v2/projects/?name=geany&after=")
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+
+        self.assertEqual(data["total_items"], 1)
+        self.assertEqual([item["name"] for item in data["items"]], ["geany"])
+        self.assertIsNone(data["next_after"])
+
+    def test_list_projects_after_invalid(self):
+        """Assert an invalid cursor results in an error."""
+        output = self.app.get("/api/v2/projects/?after=WzFd")
+        self.assertEqual(output.status_code, 400)
+        data = _read_json(output)
+
+        self.assertEqual(data, {"message": {"after": "Cursor is not valid."}})
+
+    def test_list_projects_total_none(self):
+        """Assert total is not returned when not requested."""
+        create_project(self.session)
+
+        output = self.app.get("/api/v2/projects/?total=none")
+        self.assertEqual(output.status_code, 200)
+        data = _read_json(output)
+
+        self.assertIsNone(data["total_items"])
+        self.assertEqual(len(data["items"]), 3)
+
 
 class ProjectsResourcePostTests(DatabaseTestCase):
     """ProjectsResourcePostTests"""
@@ -1938,3 +2081,212 @@ class VersionsResourcePostTests(DatabaseTestCase):
 
         mock_check.assert_called_once_with(mock.ANY, mock.ANY, test=True)
         self.assertEqual(output.status_code, 500)
+
+
+class VersionsLookupResourcePostTests(DatabaseTestCase):
+    """Tests for ``api/v2/versions/lookup/`` API endpoint - POST method."""
+
+    def setUp(self):
+        super().setUp()
+        self.app = self.flask_app.test_client()
+
+    def _post(self, data):
+        """Post the lookup and return the status code and decoded response."""
+        output = self.app.post("/api/v2/versions/lookup/", json=data)
+        return output.status_code, _read_json(output)
+
+    def test_empty(self):
+        """Assert that nothing is returned when nothing is requested."""
+        status, data = self._post({})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            data,
+            {
+                "projects": [],
+                "packages": [],
+                "not_found": {"project_ids": [], "packages": []},
+            },
+        )
+
+    def test_lookup(self):
+        """Assert that projects are returned for ids and packages."""
+        create_projects_with_versions(self.session, 3)
+        created_on = datetime.datetime(2026, 3, 31, 14, 30)
+        project = models.Project.get(self.session, 2)
+        project.latest_version_created_on = created_on
+        self.session.commit()
+
+        with count_queries() as queries:
+            status, data = self._post(
+                {
+                    "project_ids": [2, 404, 2],
+                    "packages": [
+                        {"distribution": "fedora", "name": "project-0000"},
+                        {"distribution": "Debian", "name": "project-0000"},
+                    ],
+                    "versions": True,
+                }
+            )
+
+        self.assertEqual(status, 200)
+        exp_project = {
+            "id": 2,
+            "name": "project-0001",
+            "ecosystem": "https://example.com/project-0001",
+            "latest_version": "1.1",
+            "stable_version": "1.1",
+            "latest_version_created_on": "2026-03-31T14:30:00",
+            "versions": ["1.1", "1.0"],
+            "stable_versions": ["1.1", "1.0"],
+        }
+        self.assertEqual(data["projects"], [exp_project])
+        self.assertEqual(
+            data["packages"],
+            [
+                {
+                    "distribution": "Fedora",
+                    "name": "project-0000",
+                    "project": {
+                        **exp_project,
+                        "id": 1,
+                        "name": "project-0000",
+                        "ecosystem": "https://example.com/project-0000",
+                        "latest_version_created_on": None,
+                    },
+                }
+            ],
+        )
+        self.assertEqual(
+            data["not_found"],
+            {
+                "project_ids": [404],
+                "packages": [{"distribution": "Debian", "name": "project-0000"}],
+            },
+        )
+        # Packages, projects and their versions
+        self.assertEqual(len(queries), 3)
+
+    def test_lookup_packages_other_distro(self):
+        """Assert that only the requested distribution packages are returned."""
+        create_projects_with_versions(self.session, 3)
+        self.session.add(models.Distro("Debian"))
+        self.session.add(
+            models.Packages(
+                distro_name="Debian", project_id=3, package_name="project-0001"
+            )
+        )
+        self.session.commit()
+
+        status, data = self._post(
+            {
+                "packages": [
+                    {"distribution": "Fedora", "name": "project-0000"},
+                    {"distribution": "Debian", "name": "project-0001"},
+                ]
+            }
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            [
+                (package["distribution"], package["name"], package["project"]["id"])
+                for package in data["packages"]
+            ],
+            [("Fedora", "project-0000", 1), ("Debian", "project-0001", 3)],
+        )
+
+    def test_lookup_packages_case_insensitive(self):
+        """
+        Assert that package name is case insensitive and the same package
+        is returned once.
+        """
+        create_projects_with_versions(self.session, 1)
+
+        status, data = self._post(
+            {
+                "packages": [
+                    {"distribution": "fedora", "name": "Project-0000"},
+                    {"distribution": "FEDORA", "name": "project-0000"},
+                    {"distribution": "Debian", "name": "Project-0000"},
+                    {"distribution": "debian", "name": "project-0000"},
+                ]
+            }
+        )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            data["packages"],
+            [
+                {
+                    "distribution": "Fedora",
+                    "name": "project-0000",
+                    "project": {
+                        "id": 1,
+                        "name": "project-0000",
+                        "ecosystem": "https://example.com/project-0000",
+                        "latest_version": "1.1",
+                        "stable_version": "1.1",
+                        "latest_version_created_on": None,
+                    },
+                }
+            ],
+        )
+        self.assertEqual(
+            data["not_found"]["packages"],
+            [{"distribution": "Debian", "name": "Project-0000"}],
+        )
+
+    def test_queries_many_items(self):
+        """Assert that the number of queries doesn't depend on number of items."""
+        create_projects_with_versions(self.session, 100)
+        projects = self.session.query(models.Project).all()
+
+        with count_queries() as queries:
+            status, data = self._post(
+                {
+                    "project_ids": [project.id for project in projects],
+                    "packages": [
+                        {"distribution": "Fedora", "name": project.name}
+                        for project in projects
+                    ],
+                }
+            )
+
+        self.assertEqual(status, 200)
+        self.assertEqual(len(data["projects"]), len(projects))
+        self.assertEqual(len(data["packages"]), len(projects))
+        # Versions aren't loaded by default
+        self.assertEqual(len(queries), 2)
+
+    def test_invalid_project_ids(self):
+        """Assert that project ids must be integers."""
+        status, data = self._post({"project_ids": [1, "2"]})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(
+            data, {"message": {"project_ids": "Project ids must be integers."}}
+        )
+
+    def test_invalid_packages(self):
+        """Assert that packages must have distribution and name."""
+        status, data = self._post({"packages": [{"name": "project-0000"}]})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(
+            data,
+            {
+                "message": {
+                    "packages": "Packages must be objects with distribution and name."
+                }
+            },
+        )
+
+    def test_too_many_items(self):
+        """Assert that at most 250 items could be requested."""
+        status, data = self._post({"project_ids": list(range(251))})
+
+        self.assertEqual(status, 400)
+        self.assertEqual(
+            data, {"message": {"project_ids": "Maximum of 250 items is allowed."}}
+        )
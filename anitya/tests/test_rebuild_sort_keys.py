@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+anitya tests for the script rebuilding stored sort keys.
+"""
+
+import mock
+import pytest
+
+from anitya import rebuild_sort_keys
+from anitya.db import models
+from anitya.tests.base import DatabaseTestCase
+
+
+class RebuildSortKeysTests(DatabaseTestCase):
+    """Rebuild sort keys script tests."""
+
+    @pytest.fixture(autouse=True)
+    def capsys(self, capsys):
+        """Use capsys fixture as part of this class."""
+        self.capsys = capsys
+
+    def setUp(self):
+        super().setUp()
+        for name in ("first", "second", "third"):
+            project = models.Project(
+                name=name,
+                homepage=f"https://example.com/{name}",
+                backend="custom",
+                version_scheme="RPM",
+            )
+            self.session.add(project)
+            self.session.flush()
+            for version in ("1.0", "1.10", "1.9"):
+                self.session.add(
+                    models.ProjectVersion(
+                        project_id=project.id, version=version, sort_key=b"stale"
+                    )
+                )
+        self.session.commit()
+
+    def test_rebuild(self):
+        """Assert that keys of every project are recomputed in batches."""
+        updated = rebuild_sort_keys.rebuild(self.session, batch_size=2)
+
+        self.assertEqual(updated, 9)
+        for project in self.session.query(models.Project):
+            self.assertEqual(
+                [
+                    version.version
+                    for version in models.ProjectVersion.newest(
+                        self.session, project.id
+                    )
+                ],
+                ["1.10", "1.9", "1.0"],
+            )
+            self.assertEqual(project.latest_version, "1.10")
+            self.assertEqual(project.latest_stable_version, "1.10")
+            self.assertEqual(project.versions_count, 3)
+        self.assertEqual(rebuild_sort_keys.rebuild(self.session, batch_size=2), 0)
+
+    @mock.patch("sys.argv", ["rebuild_sort_keys", "--batch-size", "1"])
+    def test_main(self):
+        """Assert that the script reports the number of updated keys."""
+        rebuild_sort_keys.main()
+
+        out, _ = self.capsys.readouterr()
+
+        self.assertEqual(out, "Sort keys of 9 versions were updated\n")
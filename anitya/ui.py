@@ -146,8 +146,9 @@ def project_name(project_name):
     except ValueError:
         page = 1
 
-    projects = models.Project.search(db.session, pattern=project_name, page=page)
-    projects_count = models.Project.search(db.session, pattern=project_name, count=True)
+    projects, projects_count = models.Project.search(
+        db.session, pattern=project_name, page=page, with_count=True
+    )
 
     if projects_count == 1:
         return project(projects[0].id)
@@ -219,11 +220,8 @@ def projects_updated(status="updated"):
             "was retrieved correctly"
         )
 
-    projects = models.Project.updated(
-        db.session, status=status, name=name, log=log, page=page
-    )
-    projects_count = models.Project.updated(
-        db.session, status=status, name=name, log=log, count=True
+    projects, projects_count = models.Project.updated(
+        db.session, status=status, name=name, log=log, page=page, with_count=True
     )
 
     total_page = int(ceil(projects_count / float(50)))
@@ -377,23 +375,19 @@ def projects_search(pattern=None):
     except ValueError:
         page = 1
 
-    projects = models.Project.search(db.session, pattern=pattern, page=page, sort=sort)
-
+    extended_pattern = None
     if str(exact).lower() not in ["1", "true"]:
-        # Extends the search
-        for proj in models.Project.search(
-            db.session, pattern=get_extended_pattern(pattern), page=page, sort=sort
-        ):
-            if proj not in projects:
-                projects.append(proj)
-        projects_count = models.Project.search(
-            db.session, pattern=get_extended_pattern(pattern), count=True
-        )
-        projects = models.Project.sort_projects(projects, sort)
-    else:
-        projects_count = models.Project.search(
-            db.session, pattern=pattern, count=True, sort=sort
-        )
+        # Extends the search, exact matches are ranked first
+        extended_pattern = get_extended_pattern(pattern)
+
+    projects, projects_count = models.Project.search(
+        db.session,
+        pattern=pattern,
+        extended_pattern=extended_pattern,
+        page=page,
+        sort=sort,
+        with_count=True,
+    )
 
     if projects_count == 1 and projects[0].name == pattern.replace("*", ""):
         flask.flash("Only one result matching with an exact match, redirecting")
@@ -429,30 +423,19 @@ def distro_projects_search(distroname, pattern=None):
     except ValueError:
         page = 1
 
-    projects = models.Project.search(
-        db.session, pattern=pattern, distro=distroname, page=page
-    )
-
+    extended_pattern = None
     if str(exact).lower() not in ["1", "true"]:
-        # Extends the search
-        for proj in models.Project.search(
-            db.session,
-            pattern=get_extended_pattern(pattern),
-            distro=distroname,
-            page=page,
-        ):
-            if proj not in projects:
-                projects.append(proj)
-        projects_count = models.Project.search(
-            db.session,
-            pattern=get_extended_pattern(pattern),
-            distro=distroname,
-            count=True,
-        )
-    else:
-        projects_count = models.Project.search(
-            db.session, pattern=pattern, distro=distroname, count=True
-        )
+        # Extends the search, exact matches are ranked first
+        extended_pattern = get_extended_pattern(pattern)
+
+    projects, projects_count = models.Project.search(
+        db.session,
+        pattern=pattern,
+        extended_pattern=extended_pattern,
+        distro=distroname,
+        page=page,
+        with_count=True,
+    )
 
     if projects_count == 1 and projects[0].name == pattern.replace("*", ""):
         flask.flash("Only one result matching with an exact match, redirecting")
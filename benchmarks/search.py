@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# This file is part of the Anitya project.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+"""
+Compare the indexed project search with the search by unindexed ``ILIKE``.
+
+The benchmark fills an empty database with generated projects, their packages
+and check logs, then measures the time of retrieving the first page of search
+results and their count, as done by the search page and the updates page.
+
+The unindexed search is the implementation used before the search indexes
+were added: union of the projects matching by name and by package name
+and a separate count query.
+
+Usage::
+
+    python benchmarks/search.py --projects 50000
+    python benchmarks/search.py --db-uri postgresql://anitya@localhost/bench
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from sqlalchemy_helpers import Base
+
+from anitya.db import models
+
+WORDS = (
+    "lib",
+    "python",
+    "geany",
+    "gtk",
+    "perl",
+    "rust",
+    "ruby",
+    "qt",
+    "node",
+    "tools",
+    "utils",
+    "server",
+    "client",
+    "plugin",
+)
+
+
+def populate(session, count):
+    """Add generated projects with a package and check logs."""
+    session.add(models.Distro("Fedora"))
+    for index in range(count):
+        name = "-".join(
+            (WORDS[index % len(WORDS)], WORDS[index // len(WORDS) % len(WORDS)])
+        )
+        name = f"{name}{index}"
+        session.add(
+            models.Project(
+                name=name,
+                homepage=f"https://example.com/{name}",
+                backend="custom",
+                ecosystem_name=f"https://example.com/{name}",
+                check_successful=index % 10 != 0,
+                logs=(
+                    "Version retrieved correctly"
+                    if index % 10
+                    else f"Error: No versions found for {name} at example.com"
+                ),
+                packages=[
+                    models.Packages(distro_name="Fedora", package_name=f"pkg-{name}")
+                ],
+            )
+        )
+        if index % 1000 == 999:
+            session.flush()
+    session.commit()
+
+
+def unindexed_search(session, pattern, extended_pattern):
+    """Page and count of the search by the previous implementation."""
+
+    def query(pattern):
+        pattern = pattern.replace("_", r"\_").replace("*", "%")
+        query1 = session.query(models.Project).filter(
+            models.Project.name.ilike(pattern)
+        )
+        query2 = (
+            session.query(models.Project)
+            .filter(models.Project.id == models.Packages.project_id)
+            .filter(models.Packages.package_name.ilike(pattern))
+        )
+        return (
+            query1.distinct()
+            .union(query2.distinct())
+            .order_by(sa.func.lower(models.Project.name))
+        )
+
+    projects = query(pattern).limit(models.DEFAULT_PAGE_LIMIT).all()
+    for project in query(extended_pattern).limit(models.DEFAULT_PAGE_LIMIT):
+        if project not in projects:
+            projects.append(project)
+    return projects, query(extended_pattern).count()
+
+
+def indexed_search(session, pattern, extended_pattern):
+    """Page and count of the search by the indexed implementation."""
+    return models.Project.search(
+        session,
+        pattern,
+        extended_pattern=extended_pattern,
+        page=1,
+        with_count=True,
+    )
+
+
+def unindexed_updated(session, log):
+    """Page and count of the failed projects filtered by log, unindexed."""
+
+    def query():
+        return (
+            session.query(models.Project)
+            .filter(models.Project.check_successful.is_(False))
+            .filter(models.Project.logs.ilike(f"%{log}%"))
+        )
+
+    return query().limit(models.DEFAULT_PAGE_LIMIT).all(), query().count()
+
+
+def indexed_updated(session, log):
+    """Page and count of the failed projects filtered by log, indexed."""
+    query = (
+        session.query(models.Project)
+        .filter(models.Project.check_successful.is_(False))
+        .filter(models.search.ilike(session, models.Project.logs, f"%{log}%"))
+    )
+    return models._paginate_query_with_count(query, 1)
+
+
+def measure(function, repeat, *args):
+    """Median duration of the function call in milliseconds and its result."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+def main():
+    """
+    Run the benchmark and print the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--db-uri",
+        default=None,
+        help="Empty database to use, temporary SQLite database by default.",
+    )
+    parser.add_argument(
+        "--projects", type=int, default=20000, help="Number of generated projects."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Number of measured runs of each case."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_uri = args.db_uri or "sqlite:///" + os.path.join(directory, "bench.sqlite")
+        engine = sa.create_engine(db_uri)
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            populate(session, args.projects)
+            if engine.dialect.name == "postgresql":
+                session.execute(sa.text("ANALYZE"))
+                session.commit()
+
+            print(f"{engine.dialect.name}, {args.projects} projects")
+            print(f"{'case':<36}{'unindexed':>12}{'indexed':>12}")
+            cases = [
+                (
+                    "search geany",
+                    unindexed_search,
+                    indexed_search,
+                    ("geany", "*geany*"),
+                ),
+                (
+                    "search server-",
+                    unindexed_search,
+                    indexed_search,
+                    ("server-*", "*server-*"),
+                ),
+                (
+                    "search missing",
+                    unindexed_search,
+                    indexed_search,
+                    ("nomatch", "*nomatch*"),
+                ),
+                (
+                    "updates log 'for python-rust'",
+                    unindexed_updated,
+                    indexed_updated,
+                    ("for python-rust",),
+                ),
+                (
+                    "updates log 'versions found for'",
+                    unindexed_updated,
+                    indexed_updated,
+                    ("versions found for",),
+                ),
+            ]
+            for label, unindexed, indexed, case_args in cases:
+                old, (_, old_count) = measure(
+                    unindexed, args.repeat, session, *case_args
+                )
+                new, (_, new_count) = measure(indexed, args.repeat, session, *case_args)
+                if old_count != new_count:
+                    raise RuntimeError(
+                        f"{label}: counts differ {old_count} != {new_count}"
+                    )
+                print(f"{label:<36}{old:>10.1f}ms{new:>10.1f}ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()